@@ -1,23 +1,39 @@
 __all__ = []
 
 from .atom import *
+from .atom_array import *
 from .bond import *
+from .cache import *
+from .geometry import *
+from .hbonds import *
 from .job import *
 from .molecule import *
+from .parallel import *
 from .periodic_table import *
 from .results import *
 from .sc import *
+from .scan import *
+from .sections import *
 from .settings import *
 from .thermo import *
 from .utils import *
+from .xyz import *
 
 __all__ += atom.__all__
+__all__ += atom_array.__all__
 __all__ += bond.__all__
+__all__ += cache.__all__
+__all__ += geometry.__all__
+__all__ += hbonds.__all__
 __all__ += job.__all__
 __all__ += molecule.__all__
+__all__ += parallel.__all__
 __all__ += periodic_table.__all__
 __all__ += results.__all__
 __all__ += sc.__all__
+__all__ += scan.__all__
+__all__ += sections.__all__
 __all__ += settings.__all__
 __all__ += thermo.__all__
-__all__ += utils.__all__
\ No newline at end of file
+__all__ += utils.__all__
+__all__ += xyz.__all__
\ No newline at end of file
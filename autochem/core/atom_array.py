@@ -0,0 +1,212 @@
+from .atom import Atom
+from .periodic_table import PeriodicTable as PT
+
+import numpy as np
+
+__all__ = ['AtomArray', 'AtomView']
+
+
+class AtomArray:
+    """
+    Structure-of-arrays storage for the atoms of large systems. Rather than
+    one |Atom| object per atom, each holding its own lists, every property is
+    held in a NumPy array with one element per atom:
+
+    * ``symbols`` -- atomic symbols
+    * ``atnums`` -- atomic numbers
+    * ``coords`` -- (N, 3) array of coordinates in angstroms
+    * ``index`` -- position of each atom in the system, starting from 1
+    * ``mol`` -- molecule each atom belongs to, -1 if not yet assigned
+    * ``number`` -- position of each atom in its fragment, 0 if not assigned
+    * ``fragment`` -- fragment name of each atom, i.e. water_1
+
+    Bonded neighbours are stored in compressed sparse row format, in
+    ``neighbour_starts`` and ``neighbours``.
+
+    ``atoms`` holds one |AtomView| per atom. These behave like |Atom|
+    instances, so existing code using atom.x, atom.mol, atom.connected_atoms
+    and so on works unchanged, but read and write the arrays directly.
+
+        >>> arr = AtomArray(['O', 'H', 'H'], [[0, 0, 0], [0.76, 0.59, 0], [-0.76, 0.59, 0]])
+        >>> arr.atoms[1]
+        Atom: H      0.76000    0.59000    0.00000 Index: 2 Mol: None
+    """
+
+    def __init__(self, symbols, coords):
+        self.symbols = np.array(symbols, dtype='<U3').reshape(-1)
+        self.atnums = PT.get_atnums(self.symbols)
+        self.coords = np.array(coords, dtype=np.float64).reshape(-1, 3)
+        if len(self.coords) != len(self.symbols):
+            raise ValueError(
+                'AtomArray: number of symbols and coordinates do not match')
+        num_atoms = len(self.symbols)
+        self.index = np.arange(1, num_atoms + 1)
+        self.mol = np.full(num_atoms, -1, dtype=np.int64)
+        self.number = np.zeros(num_atoms, dtype=np.int64)
+        self.fragment = np.full(num_atoms, None, dtype=object)
+        self.neighbour_starts = np.zeros(num_atoms + 1, dtype=np.int64)
+        self.neighbours = np.empty(0, dtype=np.int64)
+        # per-atom lists that are rarely used (h_bonded_to, bonds), created
+        # only when asked for
+        self.lists = {}
+        self.atoms = [AtomView(self, i) for i in range(num_atoms)]
+
+    def __repr__(self):
+        return f'AtomArray of {len(self)} atoms'
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __iter__(self):
+        return iter(self.atoms)
+
+    @classmethod
+    def from_atoms(cls, atoms):
+        """
+        Creates an |AtomArray| from a list of |Atom| objects, keeping any
+        indices, molecules and fragments already assigned
+        """
+        arr = cls([atom.symbol for atom in atoms],
+                  [atom.coords for atom in atoms])
+        for i, atom in enumerate(atoms):
+            if hasattr(atom, 'index'):
+                arr.index[i] = atom.index
+            if atom.mol is not None:
+                arr.mol[i] = atom.mol
+            if hasattr(atom, 'number'):
+                arr.number[i] = atom.number
+            arr.fragment[i] = atom.fragment
+        return arr
+
+    def set_neighbours(self, rows, cols):
+        """
+        Stores the bonded pairs (i, j) found by `bonded_pairs` or
+        |CellList|, replacing any neighbours stored previously
+        """
+        i = np.concatenate([rows, cols]).astype(np.int64)
+        j = np.concatenate([cols, rows]).astype(np.int64)
+        order = np.lexsort((j, i))
+        self.neighbours = j[order]
+        self.neighbour_starts = np.searchsorted(i[order],
+                                                np.arange(len(self) + 1))
+
+    def neighbours_of(self, i):
+        """Returns an array of the positions of atoms bonded to atom i"""
+        return self.neighbours[self.neighbour_starts[i]:self.
+                               neighbour_starts[i + 1]]
+
+
+class AtomView(Atom):
+    """
+    An |Atom| stored in an |AtomArray|. Instances hold only a reference to
+    the array and a position in it, and every attribute of |Atom| reads from
+    and writes to the arrays. Created by |AtomArray|, not directly.
+
+    Note that ``connected_atoms`` is a read-only tuple; neighbours are set
+    for the whole array at once with `AtomArray.set_neighbours`. Setting an
+    attribute not stored in the array raises AttributeError, rather than
+    giving the view a ``__dict__`` of its own.
+    """
+
+    __slots__ = ('_array', '_i')
+
+    def __init__(self, array, i):
+        self._array = array
+        self._i = i
+
+    def __setattr__(self, name, value):
+        if name not in AtomView.__slots__ and not isinstance(
+                getattr(AtomView, name, None), property):
+            raise AttributeError(
+                f"{name!r} is not stored in an AtomArray, so cannot be set on an AtomView")
+        object.__setattr__(self, name, value)
+
+    @property
+    def symbol(self):
+        return str(self._array.symbols[self._i])
+
+    @symbol.setter
+    def symbol(self, symbol):
+        self._array.symbols[self._i] = symbol
+        self._array.atnums[self._i] = PT.get_atnum(self)
+
+    @property
+    def atnum(self):
+        return int(self._array.atnums[self._i])
+
+    @atnum.setter
+    def atnum(self, atnum):
+        self._array.atnums[self._i] = atnum
+        self._array.symbols[self._i] = PT.get_symbol(self)
+
+    @property
+    def mass(self):
+        return float(PT.masses[self._array.atnums[self._i]])
+
+    @property
+    def coords(self):
+        return self._array.coords[self._i].tolist()
+
+    @coords.setter
+    def coords(self, coords):
+        self._array.coords[self._i] = coords
+
+    @property
+    def x(self):
+        return float(self._array.coords[self._i, 0])
+
+    @property
+    def y(self):
+        return float(self._array.coords[self._i, 1])
+
+    @property
+    def z(self):
+        return float(self._array.coords[self._i, 2])
+
+    @property
+    def index(self):
+        return int(self._array.index[self._i])
+
+    @index.setter
+    def index(self, index):
+        self._array.index[self._i] = index
+
+    @property
+    def mol(self):
+        mol = self._array.mol[self._i]
+        return None if mol < 0 else int(mol)
+
+    @mol.setter
+    def mol(self, mol):
+        self._array.mol[self._i] = -1 if mol is None else mol
+
+    @property
+    def number(self):
+        number = self._array.number[self._i]
+        if number == 0:
+            raise AttributeError('number has not been assigned')
+        return int(number)
+
+    @number.setter
+    def number(self, number):
+        self._array.number[self._i] = number
+
+    @property
+    def fragment(self):
+        return self._array.fragment[self._i]
+
+    @fragment.setter
+    def fragment(self, fragment):
+        self._array.fragment[self._i] = fragment
+
+    @property
+    def connected_atoms(self):
+        return tuple(self._array.atoms[j] for j in self._array.neighbours_of(self._i))
+
+    @property
+    def h_bonded_to(self):
+        return self._array.lists.setdefault(('h_bonded_to', self._i), [])
+
+    @property
+    def bonds(self):
+        return self._array.lists.setdefault(('bonds', self._i), [])
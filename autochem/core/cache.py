@@ -0,0 +1,130 @@
+from functools import partial
+import json
+import os
+import sqlite3
+
+__all__ = ['ResultsCache']
+
+
+class ResultsCache:
+    """
+    Persistent store of the values parsed from output files, kept in an
+    SQLite database so that reports over a directory tree only need to parse
+    files that are new or have changed since the last run:
+
+        >>> cache = ResultsCache('.autochem_cache.sqlite')
+        >>> results, failures = harvest(logs, energy_data, cache=cache)
+
+    Values are stored for each file and each kind of data, i.e. energies or
+    thermochemistry at a given temperature, along with the size and
+    modification time of the file when it was parsed. A stored value is only
+    used if the file has the same size and modification time; otherwise the
+    file is parsed again and the new value replaces the old. Values must be
+    serialisable as JSON, so tuples are returned as lists. The offsets of
+    sections of a log found by a |SectionIndex| are stored in the same way.
+
+    Files that could not be parsed are not stored, so are tried again on the
+    next run. Increase `VERSION` whenever the values returned for a file
+    change, to discard databases written by older versions.
+    """
+
+    VERSION = 2
+    FILENAME = '.autochem_cache.sqlite'
+    BATCH = 500  # files looked up per query, below SQLite's limit of 999 parameters
+
+    def __init__(self, path=FILENAME):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'file TEXT, kind TEXT, size INTEGER, mtime INTEGER, '
+                'version INTEGER, value TEXT, PRIMARY KEY (file, kind))')
+
+    def __repr__(self):
+        return f'ResultsCache: {self.path}'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def kind_of(func):
+        """
+        Name under which values returned by `func` are stored, including any
+        arguments fixed with functools.partial, i.e.
+        hessian_thermo_data(mult='1', temp='298.15')
+        """
+        if isinstance(func, partial):
+            args = [repr(arg) for arg in func.args]
+            args += [f'{k}={v!r}' for k, v in sorted(func.keywords.items())]
+            return f"{ResultsCache.kind_of(func.func)}({', '.join(args)})"
+        return f'{func.__module__}.{func.__qualname__}'
+
+    @staticmethod
+    def stamp(file):
+        """Returns the size and modification time of a file, in nanoseconds"""
+        stat = os.stat(file)
+        return stat.st_size, stat.st_mtime_ns
+
+    def lookup(self, files, kind):
+        """
+        Returns {file: value} for every file in `files` with an up-to-date
+        value of `kind` stored, and {file: (size, mtime)} for the rest, which
+        need parsing. Files that cannot be read have a stamp of None.
+        """
+        stored = {}
+        paths = list({os.path.abspath(file) for file in files})
+        for start in range(0, len(paths), self.BATCH):
+            batch = paths[start:start + self.BATCH]
+            for file, size, mtime, version, value in self.connection.execute(
+                    'SELECT file, size, mtime, version, value FROM results '
+                    f"WHERE kind = ? AND file IN ({', '.join('?' * len(batch))})",
+                    (kind, *batch)):
+                stored[file] = (size, mtime, version, value)
+        found = {}
+        missing = {}
+        for file in files:
+            try:
+                current = self.stamp(file)
+            except OSError:
+                missing[file] = None
+                continue
+            entry = stored.get(os.path.abspath(file))
+            if entry is not None and entry[:3] == current + (self.VERSION, ):
+                found[file] = json.loads(entry[3])
+            else:
+                missing[file] = current
+        return found, missing
+
+    def store(self, values, kind, stamps):
+        """
+        Stores (file, value) pairs of `kind`, replacing any stored before.
+        `stamps` gives the size and modification time of each file from
+        before it was parsed, as returned by `lookup`, so that a file
+        written to while being parsed is parsed again next time. A value of
+        None is stored too, as files with nothing to report do not need to
+        be parsed again either.
+        """
+        rows = []
+        for file, value in values:
+            stamp = stamps.get(file)
+            if stamp is None:
+                continue
+            size, mtime = stamp
+            rows.append((os.path.abspath(file), kind, size, mtime,
+                         self.VERSION, json.dumps(value)))
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                rows)
+
+    def clear(self):
+        """Removes every stored value"""
+        with self.connection:
+            self.connection.execute('DELETE FROM results')
@@ -0,0 +1,272 @@
+from .periodic_table import PeriodicTable as PT
+
+import numpy as np
+
+__all__ = [
+    "CellList",
+    "DisjointSet",
+    "bonded_pairs",
+    "connected_components",
+    "coordinate_array",
+    "distance_matrix",
+    "neighbour_lists",
+    "pairs_within",
+    "vdw_radii",
+]
+
+
+def coordinate_array(atoms):
+    """
+    Returns an (N, 3) array of cartesian coordinates, in angstroms, for the
+    list of |Atom| objects passed in.
+    """
+    xyz = np.empty((len(atoms), 3), dtype=np.float64)
+    for i, atom in enumerate(atoms):
+        xyz[i] = atom.coords
+    return xyz
+
+
+def vdw_radii(atoms):
+    """
+    Returns an array of van der Waals radii, one for each |Atom| passed in.
+    """
+    return PT.vdw_radii[[atom.atnum for atom in atoms]]
+
+
+def distance_matrix(xyz):
+    """
+    Creates an N x N matrix of interatomic distances from an (N, 3) array
+    of coordinates.
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    diff = xyz[:, None, :] - xyz[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1))
+
+
+def bonded_pairs(xyz, radii, chunk_size=256):
+    """
+    Finds every pair of atoms closer together than the sum of their van der
+    Waals radii. Returns two arrays of indices, (i, j), with i < j, sorted by i
+    and then by j.
+
+    Distances and cutoffs are evaluated in blocks of `chunk_size` rows, and
+    only against atoms further down the list, so the full N x N matrix is
+    never held in memory.
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    radii = np.asarray(radii, dtype=np.float64)
+    rows = []
+    cols = []
+    for start in range(0, len(xyz), chunk_size):
+        stop = min(start + chunk_size, len(xyz))
+        diff = xyz[start:stop, None, :] - xyz[None, start:, :]
+        dists = np.sqrt((diff ** 2).sum(axis=-1))
+        cutoffs = radii[start:stop, None] + radii[None, start:]
+        i, j = np.nonzero(dists < cutoffs)
+        i += start
+        j += start
+        upper = j > i
+        rows.append(i[upper])
+        cols.append(j[upper])
+    if not rows:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def pairs_within(xyz, cutoff, chunk_size=256):
+    """
+    Finds every pair of atoms separated by less than `cutoff` angstroms.
+    Returns two arrays of indices, (i, j), with i < j, sorted by i and then by j.
+    """
+    return bonded_pairs(xyz, np.full(len(xyz), cutoff / 2), chunk_size)
+
+
+def neighbour_lists(num_atoms, rows, cols):
+    """
+    Converts the pairs returned by `bonded_pairs` into a list of neighbours
+    for every atom, in ascending order of atom position.
+    """
+    i = np.concatenate([rows, cols])
+    j = np.concatenate([cols, rows])
+    order = np.lexsort((j, i))
+    i = i[order]
+    j = j[order]
+    bounds = np.searchsorted(i, np.arange(num_atoms + 1))
+    return [j[bounds[k]:bounds[k + 1]].tolist() for k in range(num_atoms)]
+
+
+def connected_components(num_atoms, rows, cols):
+    """
+    Labels every atom with the connected component, or molecule, that it
+    belongs to, given the bonded pairs (i, j) returned by `bonded_pairs`.
+    Labels are numbered from zero in order of the first atom of each
+    component, so the labelling is the same however the pairs are ordered.
+    """
+    components = DisjointSet(num_atoms)
+    for i, j in zip(np.asarray(rows).tolist(), np.asarray(cols).tolist()):
+        components.union(i, j)
+    return components.labels()
+
+
+class DisjointSet:
+    """
+    Union-find structure over the integers 0 to `size` - 1. Sets are merged
+    with `union`, and `find` returns the smallest member of a set, using path
+    compression so that repeated lookups are effectively constant time.
+    """
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def __len__(self):
+        return len(self.parent)
+
+    def find(self, item):
+        """Returns the smallest member of the set containing `item`"""
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first, second):
+        """Merges the sets containing `first` and `second`"""
+        first = self.find(first)
+        second = self.find(second)
+        if first < second:
+            self.parent[second] = first
+        elif second < first:
+            self.parent[first] = second
+
+    def labels(self):
+        """
+        Returns a list giving the set of every member, with sets numbered from
+        zero in order of their smallest member
+        """
+        numbers = {}
+        labels = []
+        for item in range(len(self.parent)):
+            root = self.find(item)
+            if root not in numbers:
+                numbers[root] = len(numbers)
+            labels.append(numbers[root])
+        return labels
+
+
+class CellList:
+    """
+    Spatial index for neighbour searching in large systems. Atoms are binned
+    into a uniform grid of cubic cells of width `cell_size`, so that every
+    atom within `cell_size` of another lies in the same cell or one of the 26
+    cells surrounding it. Only these pairs of cells are searched, so the cost
+    of finding neighbours scales linearly with the number of atoms, rather
+    than with the square.
+
+    Pairs are returned in the same format as `bonded_pairs` and `pairs_within`,
+    so the two can be used interchangeably:
+
+        >>> cells = CellList(xyz, cell_size=3.0)
+        >>> i, j = cells.bonded_pairs(radii) # same as bonded_pairs(xyz, radii)
+    """
+
+    # half of the 27 cells around a cell, so each pair of cells is only visited once
+    OFFSETS = [(0, 0, 0)] + [
+        (x, y, z)
+        for x in (-1, 0, 1)
+        for y in (-1, 0, 1)
+        for z in (-1, 0, 1)
+        if (x, y, z) > (0, 0, 0)
+    ]
+
+    def __init__(self, xyz, cell_size):
+        self.xyz = np.asarray(xyz, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        if len(self.xyz) == 0 or self.cell_size <= 0:
+            self.cells = np.zeros((len(self.xyz), 3), dtype=np.int64)
+            self.shape = np.ones(3, dtype=np.int64)
+        else:
+            origin = self.xyz.min(axis=0)
+            self.cells = np.floor(
+                (self.xyz - origin) / self.cell_size).astype(np.int64)
+            self.shape = self.cells.max(axis=0) + 1
+        keys = self._keys(self.cells)
+        # atoms sorted by cell, with the start and size of each occupied cell
+        self.order = np.argsort(keys, kind="stable")
+        self.keys, self.starts, self.counts = np.unique(keys[self.order],
+                                                        return_index=True,
+                                                        return_counts=True)
+        self.occupied = self.cells[self.order][self.starts]
+
+    def __repr__(self):
+        return (f"CellList of {len(self.xyz)} atoms in {len(self.keys)} cells"
+                f" of width {self.cell_size:.2f} Å")
+
+    def _keys(self, cells):
+        """Converts (x, y, z) cell positions into a single integer key"""
+        return (cells[:, 0] * self.shape[1] + cells[:, 1]) * self.shape[2] \
+            + cells[:, 2]
+
+    def candidate_pairs(self):
+        """
+        Generator yielding arrays of atom indices, (i, j), for every pair of
+        atoms in neighbouring cells. Each pair is yielded once, one block of
+        pairs per cell offset.
+        """
+        for offset in CellList.OFFSETS:
+            other = self.occupied + np.array(offset)
+            inside = np.all((other >= 0) & (other < self.shape), axis=1)
+            first = np.nonzero(inside)[0]
+            keys = self._keys(other[inside])
+            second = np.searchsorted(self.keys, keys)
+            second[second == len(self.keys)] = 0
+            found = self.keys[second] == keys
+            first = first[found]
+            second = second[found]
+            if len(first) == 0:
+                continue
+            # expand every pair of cells into all pairs of atoms between them
+            num_first = self.counts[first]
+            num_second = self.counts[second]
+            sizes = num_first * num_second
+            block = np.repeat(np.arange(len(first)), sizes)
+            local = np.arange(sizes.sum()) - np.repeat(
+                np.cumsum(sizes) - sizes, sizes)
+            pos_i = self.starts[first][block] + local // num_second[block]
+            pos_j = self.starts[second][block] + local % num_second[block]
+            if offset == (0, 0, 0):
+                keep = pos_i < pos_j
+                pos_i = pos_i[keep]
+                pos_j = pos_j[keep]
+            yield self.order[pos_i], self.order[pos_j]
+
+    def bonded_pairs(self, radii):
+        """
+        Finds every pair of atoms closer together than the sum of their van
+        der Waals radii, as in `bonded_pairs`. The sum of any two radii must not
+        exceed `cell_size`.
+        """
+        radii = np.asarray(radii, dtype=np.float64)
+        rows = []
+        cols = []
+        for i, j in self.candidate_pairs():
+            diff = self.xyz[i] - self.xyz[j]
+            dists = np.sqrt((diff ** 2).sum(axis=-1))
+            close = dists < radii[i] + radii[j]
+            i = i[close]
+            j = j[close]
+            rows.append(np.minimum(i, j))
+            cols.append(np.maximum(i, j))
+        if not rows:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        order = np.lexsort((cols, rows))
+        return rows[order], cols[order]
+
+    def pairs_within(self, cutoff):
+        """
+        Finds every pair of atoms separated by less than `cutoff` angstroms,
+        as in `pairs_within`. `cutoff` must not exceed `cell_size`.
+        """
+        return self.bonded_pairs(np.full(len(self.xyz), cutoff / 2))
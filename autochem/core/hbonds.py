@@ -0,0 +1,218 @@
+from .geometry import CellList, pairs_within
+
+import numpy as np
+
+__all__ = ['HydrogenBonds']
+
+
+class HydrogenBonds:
+    """
+    Finds hydrogen bonds between fragments for one or many sets of
+    coordinates of the same system, such as the frames of an MD trajectory.
+
+    Everything that depends only on the bonding of the system is worked out
+    once, when created: which fragment each atom belongs to, the first atom
+    each atom is bonded to, and whether each atom can take part in a hydrogen
+    bond. For every set of coordinates, candidate pairs of atoms are then
+    found and checked for distance and angle with array operations.
+
+    A bond between atom1 and atom2 is found when:
+
+    * the atoms are in different fragments, with different symbols, and
+      less than `distance` Å apart
+    * the angle between atom1, atom2 and the first atom bonded to atom2 is
+      between 145° and 225°
+    * the atoms are O, F, H or N, with hydrogens bonded to carbon excluded,
+      unless they are the C2-H proton of an imidazolium ring
+
+        >>> mol = Molecule(atoms=traj[0].atoms())
+        >>> hbonds = HydrogenBonds.from_molecule(mol)
+        >>> tables = list(hbonds.trajectory(traj))
+        >>> lifetimes = HydrogenBonds.lifetimes(tables)
+
+    Each table is a NumPy structured array with one row per hydrogen bond and
+    the fields atom1 and atom2 (positions of the atoms in the system),
+    distance (Å) and angle (°).
+    """
+
+    H_BONDERS = ('O', 'F', 'H', 'N')
+
+    # classification of each atom
+    REJECT = 0
+    VALID = 1
+    IMIDAZOLIUM_H = 2
+
+    TABLE = np.dtype([('atom1', np.int64), ('atom2', np.int64),
+                      ('distance', np.float64), ('angle', np.float64)])
+
+    def __init__(self, atoms, fragments, use_cell_list=False):
+        """
+        atoms: list of |Atom| objects in the system, with connected_atoms
+        assigned. fragments: list of lists of |Atom| objects, one for each
+        fragment.
+        """
+        self.atoms = atoms
+        self.use_cell_list = use_cell_list
+        position = {atom.index: i for i, atom in enumerate(atoms)}
+        num_atoms = len(atoms)
+
+        self.symbols = np.array([atom.symbol for atom in atoms], dtype='<U3')
+        self.fragment = np.full(num_atoms, -1, dtype=np.int64)
+        self.number = np.zeros(num_atoms, dtype=np.int64)
+        for i, frag in enumerate(fragments):
+            for k, atom in enumerate(frag):
+                self.fragment[position[atom.index]] = i
+                self.number[position[atom.index]] = k
+
+        self.anchor = np.full(num_atoms, -1, dtype=np.int64)
+        self.kind = np.empty(num_atoms, dtype=np.int64)
+        for i, atom in enumerate(atoms):
+            connected = atom.connected_atoms
+            if connected:
+                self.anchor[i] = position[connected[0].index]
+            self.kind[i] = self.classify(atom)
+
+    def __repr__(self):
+        return f'HydrogenBonds for {len(self.atoms)} atoms'
+
+    @classmethod
+    def from_molecule(cls, mol):
+        """
+        Creates a |HydrogenBonds| instance for the fragments of a |Molecule|
+        """
+        mol.assign_neighbours()
+        return cls(mol.coords,
+                   [frag['atoms'] for frag in mol.fragments.values()],
+                   mol.uses_cell_list)
+
+    @staticmethod
+    def is_imid_c2_h(atom):
+        """
+        Checks if a C2-H proton of imidazolium is found
+        """
+        connectors = {}
+        if atom.symbol == 'H':
+            for alpha in atom.connected_atoms:  # alpha = one atom away, beta = two away
+                for beta in alpha.connected_atoms:
+                    if beta.symbol not in connectors:
+                        connectors[beta.symbol] = 1
+                    else:
+                        connectors[beta.symbol] += 1
+                    if alpha.symbol == 'C' and connectors.get('N') == 2:
+                        return True
+        return False
+
+    @staticmethod
+    def is_alkyl(atom):
+        if atom.symbol == 'H':
+            for a in atom.connected_atoms:
+                if a.symbol == 'C':
+                    return True
+        return False
+
+    @classmethod
+    def classify(cls, atom):
+        """
+        Returns whether an atom can form hydrogen bonds. Imidazolium C2-H
+        protons can bond to any atom, while alkyl protons and atoms other
+        than O, F, H and N cannot form hydrogen bonds.
+        """
+        if atom.symbol == 'H':
+            if cls.is_imid_c2_h(atom):
+                return cls.IMIDAZOLIUM_H
+            if cls.is_alkyl(atom):
+                return cls.REJECT
+        if atom.symbol not in cls.H_BONDERS:
+            return cls.REJECT
+        return cls.VALID
+
+    def _check(self, xyz, atom1, atom2):
+        """
+        Checks the atom types and angle of every pair (atom1, atom2).
+        Returns a mask of valid bonds, and the angles.
+        """
+        kind1 = self.kind[atom1]
+        kind2 = self.kind[atom2]
+        valid_atoms = (kind1 == self.IMIDAZOLIUM_H) | ((kind1 == self.VALID) &
+                                                      (kind2 != self.REJECT))
+        anchor = self.anchor[atom2]
+        has_anchor = anchor >= 0
+        centre = xyz[atom2]
+        vec1 = xyz[atom1] - centre
+        vec2 = xyz[np.where(has_anchor, anchor, atom2)] - centre
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cos = (vec1 * vec2).sum(axis=1) / (np.linalg.norm(vec1, axis=1) *
+                                                np.linalg.norm(vec2, axis=1))
+            angle = np.degrees(np.arccos(np.clip(cos, -1, 1)))
+        valid_angle = has_anchor & (angle > 145) & (angle < 225)
+        return valid_atoms & valid_angle, angle
+
+    def find(self, xyz, distance=2.0):
+        """
+        Returns a table of hydrogen bonds for an (N, 3) array of coordinates,
+        sorted by the fragments and then by the atoms involved. Each pair of
+        atoms is listed once.
+        """
+        xyz = np.asarray(xyz, dtype=np.float64)
+        if len(xyz) != len(self.atoms):
+            raise ValueError(
+                f'HydrogenBonds: expected coordinates for {len(self.atoms)} atoms, got {len(xyz)}'
+            )
+        if self.use_cell_list:
+            rows, cols = CellList(xyz, distance).pairs_within(distance)
+        else:
+            rows, cols = pairs_within(xyz, distance)
+
+        keep = (self.fragment[rows] >= 0) & (self.fragment[cols] >= 0) & \
+            (self.fragment[rows] != self.fragment[cols]) & \
+            (self.symbols[rows] != self.symbols[cols])
+        rows = rows[keep]
+        cols = cols[keep]
+
+        # each pair is checked with the atom of the lower fragment as atom1,
+        # then the other way round if that fails
+        first = np.where(self.fragment[rows] < self.fragment[cols], rows, cols)
+        second = rows + cols - first
+        forward, forward_angle = self._check(xyz, first, second)
+        reverse, reverse_angle = self._check(xyz, second, first)
+        found = forward | reverse
+        atom1 = np.where(forward, first, second)[found]
+        atom2 = np.where(forward, second, first)[found]
+        angle = np.where(forward, forward_angle, reverse_angle)[found]
+
+        table = np.empty(len(atom1), dtype=self.TABLE)
+        table['atom1'] = atom1
+        table['atom2'] = atom2
+        table['distance'] = np.linalg.norm(xyz[atom1] - xyz[atom2], axis=1)
+        table['angle'] = angle
+        order = np.lexsort((self.number[atom2], self.number[atom1],
+                            self.fragment[atom2], self.fragment[atom1]))
+        return table[order]
+
+    def trajectory(self, frames, distance=2.0):
+        """
+        Generator yielding a table of hydrogen bonds for every frame passed
+        in, either |XYZFrame| objects or (N, 3) arrays of coordinates
+        """
+        for frame in frames:
+            yield self.find(getattr(frame, 'coords', frame), distance)
+
+    @staticmethod
+    def lifetimes(tables):
+        """
+        Returns {(atom1, atom2): [(first frame, number of frames), ...]} from
+        a list of tables, one per frame, giving every continuous period for
+        which each pair of atoms is hydrogen bonded. Pairs are given with the
+        lower position first.
+        """
+        runs = {}
+        for frame, table in enumerate(tables):
+            pairs = np.sort(np.stack([table['atom1'], table['atom2']], axis=1),
+                            axis=1)
+            for pair in map(tuple, pairs.tolist()):
+                periods = runs.setdefault(pair, [])
+                if periods and sum(periods[-1]) == frame:
+                    periods[-1] = (periods[-1][0], periods[-1][1] + 1)
+                else:
+                    periods.append((frame, 1))
+        return runs
@@ -2,26 +2,49 @@ from .atom import Atom
 from .molecule import Molecule
 from .settings import *
 from .sc import Supercomp
-from .utils import sort_elements, write_xyz
+from .utils import format_xyz, sort_elements, write_files, write_xyz
 
-from os.path import basename, dirname, join, exists
-from os import mkdir, chdir, getcwd, system, walk, listdir
+from functools import lru_cache
+from os.path import abspath, basename, dirname, join, exists
+from os import makedirs, mkdir, getcwd, system, walk, listdir
+from shutil import copyfile, move
 import sys
 
 __all__ = ["Job"]
 
 
+@lru_cache(maxsize=None)
+def read_job_template(job_file):
+    """Reads a job template once per process, returning its contents"""
+    with open(job_file) as f:
+        return f.read()
+
+
 class Job:
     """Base class for any input file for a computational chemistry calculation- ab initio or
-molecular dynamics. This class also creates job files in the same directory as the class is called. 
+molecular dynamics. This class also creates job files in ``directory``, by default the directory
+the class is called from.
 
     Instances of this class have the following attributes:
     * ``using`` -- coordinates of chemical system, in xyz format
+    * ``directory`` -- absolute path of the directory files are written to
+    * ``files`` -- contents of every file written, as {path relative to ``directory``: contents}
+
+    Every file is written to a path inside ``directory``, and the working directory is never
+    changed, so inputs for many systems can be created at once from separate threads or
+    processes:
+        >>> job = GamessJob(using='calcs/water/water.xyz', directory='calcs/water')
 
+    A |Molecule| that has already been separated can be passed in with ``mol``, in which case
+    ``using`` only gives the name of the system. With ``in_memory`` set to True, files are only
+    kept in ``files`` and not written, which is how jobs for the fragments of a system are made
+    before their directory tree is written in one go.
     """
 
     SLURM_HOSTS = ("stm", "mas", "mon")
     PBS_HOSTS = ("rjn", "gadi")
+    # decimal places of the xyz files written for each fragment; the ionic network always has 10
+    FRAGMENT_XYZ_DECIMALS = 5
 
     def __init__(
         self,
@@ -30,11 +53,21 @@ molecular dynamics. This class also creates job files in the same directory as t
         frags_in_subdir=False,
         user_settings=None,
         bonds_to_split=None,
+        mol=None,
+        in_memory=False,
+        directory=None,
         **kwargs,
     ):
+        self.directory = abspath(directory if directory is not None else getcwd())
+        self.files = {}
+        self.in_memory = in_memory
+        self.xyz = using
         # allows for fmo=True, even if nothing done with the arguments
         # pass on grouping/splitting to the base Molecule class
-        if using is not None:
+        if mol is not None:
+            self.molecule_name = using
+            self.mol = mol
+        elif using is not None:
             self.molecule_name = using
             if user_settings is not None and "grouped" in user_settings.keys():
                 self.mol = Molecule(
@@ -44,7 +77,7 @@ molecular dynamics. This class also creates job files in the same directory as t
                 self.mol = Molecule(using, bonds_to_split=bonds_to_split)
 
     def __repr__(self):
-        return f"{self.__class__.__name__}: {self.mol.xyz}"
+        return f"{self.__class__.__name__}: {self.molecule_name}"
 
     __str__ = __repr__
 
@@ -121,14 +154,96 @@ molecular dynamics. This class also creates job files in the same directory as t
         """Writes the generated input/jobs to a file. If no filename is passed when the class is instantiated, the name of the file defaults to the run type: a geometry optimisation (opt), single point energy calculation (spec), or a hessian matrix calculation for vibrational frequencies (freq). 
 
         NOTE: Must pass data as a string, not a list!"""
-        with open(f"{self.base_name}.{filetype}", "w") as f:
-            f.write(data)
+        self.write_output(f"{self.base_name}.{filetype}", data)
+
+    def output_path(self, *parts):
+        """Returns the absolute path of a file or directory inside ``self.directory``"""
+        return join(self.directory, *parts)
+
+    def write_output(self, path, data):
+        """
+        Writes a string to `path`, relative to ``self.directory``, creating any directories
+        needed. The contents are also kept in ``self.files``; if the job was created with
+        ``in_memory=True``, nothing is written.
+        """
+        self.files[path] = data
+        if not self.in_memory:
+            target = self.output_path(path)
+            makedirs(dirname(target), exist_ok=True)
+            with open(target, "w") as f:
+                f.write(data)
+
+    def place_files_in_dir(self):
+        """
+        Move input and job files into a directory named `complex`, along with a copy of the xyz
+        file as complex.xyz, if self.is_complex is set to True
+        """
+        if not self.is_complex:
+            return
+        if not self.in_memory:
+            makedirs(self.output_path("complex"), exist_ok=True)
+        for filename in (f"{self.base_name}.inp", f"{self.base_name}.job"):
+            if filename in self.files:
+                path = join("complex", filename)
+                self.files[path] = self.files.pop(filename)
+                if not self.in_memory:
+                    move(self.output_path(filename), self.output_path(path))
+        if self.in_memory:
+            self.files[join("complex", "complex.xyz")] = format_xyz(self.mol.coords)
+        else:
+            copyfile(self.xyz, self.output_path("complex", "complex.xyz"))
+
+    def fragment_molecules(self):
+        """
+        Generator yielding (subdir, name, data, |Molecule|) for every fragment of the system,
+        followed by the ionic network if there is one. ``data`` is the entry of the fragment in
+        ``self.mol.fragments``, or ``self.mol.ionic``, and each |Molecule| is made from atoms that
+        have already been separated, so no fragment is written to an xyz file and separated
+        again. Fragments are placed in frags/<name>_<number>, and the ionic network in ionic.
+        """
+        if not hasattr(self.mol, "fragments"):
+            self.mol.separate()
+        count = 0  # avoid overwriting files by iterating with a number
+        for data in self.mol.fragments.values():
+            if data["frag_type"] == "frag":
+                # i.e. acetate_0, acetate_1, choline_2, choline_3, water_4
+                name = f"{data['name']}_{count}"
+                yield join("frags", name), name, data, Molecule.from_fragments([data])
+                count += 1
+        if hasattr(self.mol, "ionic") and len(self.mol.ionic["atoms"]) > 0:
+            # only 1 ionic network, made of every fragment left after removing
+            # neutral species and single atom ions
+            atoms = self.mol.ionic["atoms"]
+            ionic = {atom.index for atom in atoms}
+            frags = [
+                data
+                for data in self.mol.fragments.values()
+                if all(atom.index in ionic for atom in data["atoms"])
+            ]
+            yield "ionic", "ionic", self.mol.ionic, Molecule.from_fragments(frags, atoms)
+
+    def write_fragment_files(self, jobs):
+        """
+        Writes the files of every fragment job, created with ``in_memory=True``, together with an
+        xyz file of each fragment, in one step. ``jobs`` is a list of (subdir, job) pairs, with
+        each subdir relative to ``self.directory``.
+        """
+        files = {}
+        for subdir, job in jobs:
+            decimals = 10 if subdir == "ionic" else self.FRAGMENT_XYZ_DECIMALS
+            files[join(subdir, f"{job.title}.xyz")] = format_xyz(job.mol.coords, decimals)
+            for filename, data in job.files.items():
+                files[join(subdir, filename)] = data
+        self.files.update(files)
+        if not self.in_memory:
+            write_files(files, self.directory)
 
     def get_job_template(self, dft=False):
-        job_file = self.find_job(dft=dft)
-        with open(job_file) as f:
-            job = f.read()
-            return job
+        """
+        Returns the contents of the job template found with `find_job`. Templates are only read
+        from disk once per process, so the same string is shared by every job.
+        """
+        return read_job_template(self.find_job(dft=dft))
 
     def create(self):
         """
@@ -1,6 +1,12 @@
 from .periodic_table import PeriodicTable as PT
 from .atom import Atom
+from .atom_array import AtomArray
+from .geometry import (CellList, bonded_pairs, connected_components,
+                       coordinate_array, distance_matrix, neighbour_lists,
+                       pairs_within, vdw_radii)
+from .hbonds import HydrogenBonds
 from .utils import sort_elements
+from .xyz import read_xyz_atoms
 
 import re
 import os
@@ -8,6 +14,7 @@ import numpy as np
 import math
 import itertools
 import sys
+from collections import Counter
 
 __all__ = ['Molecule']
 
@@ -36,6 +43,13 @@ class Molecule:
         format of {'name': [atomic symbols]} for positively charged radicals
     Dication_radicals: dict
         format of {'name': [atomic symbols]} for doubly charged radicals
+    DATABASES: tuple
+        (name of database, type, charge, multiplicity) for each of the 
+        databases above, in the order they are searched
+    database_index: dict
+        format of {composition: [(name, type, charge, multiplicity)]},
+        for every molecule in the databases. Built by 
+        `Molecule.index_database()`
 
     Instance Attributes
     -------------------
@@ -43,11 +57,24 @@ class Molecule:
         name of xyz file used to create the molecule
     coords: list 
         list of `Atom` objects for every atom in the molecule
+    compact: bool
+        if True, atoms are stored in an |AtomArray|, `self.atom_array`, and
+        `self.coords` holds an |AtomView| for each atom. This uses a fraction
+        of the memory of one |Atom| per atom, for systems of 10⁵ atoms or
+        more. Atoms passed in with the `atoms` argument are copied into the
+        array, unless an |AtomArray| is passed in.
+    spatial_index: string or None
+        neighbour search used when fragmenting: 'dense' compares every pair of
+        atoms, 'cells' uses a |CellList| so only nearby atoms are compared. By
+        default, a cell list is used for systems of more than
+        `Molecule.CELL_LIST_THRESHOLD` atoms
     fragments: dict
         format of {number: subdict} created when `self.separate()` is called.
         The subdict contains the keys: type (string), name (string),
         atoms (list of `Atom` instances), charge (int), mult (int), 
-        elements (list of atomic symbols)
+        elements (list of atomic symbols). Can be passed in along with
+        `atoms` if the atoms have already been separated, in which case the
+        atoms are not separated again; see `Molecule.from_fragments`
 
     """
 
@@ -230,19 +257,62 @@ class Molecule:
         **Dication_radicals
     }
 
+    CELL_LIST_THRESHOLD = 5000
+
+    DATABASES = (
+        ('Cations', 'cation', 1, 1),
+        ('Anions', 'anion', -1, 1),
+        ('Neutrals', 'neutral', 0, 1),
+        ('Radicals', 'radical', 0, 2),
+        ('Anion_radicals', 'anion-radical', -1, 2),
+        ('Cation_radicals', 'cation-radical', 1, 2),
+        ('Dications', 'dication', 2, 1),
+        ('Dication_radicals', 'dication-radical', 2, 2),
+    )
+
+    database_index = {}
+    _database_order = {}
+
+    # molecules.txt last read, and database entries it replaced
+    _user_file_stamp = None
+    _user_replaced = {}
+
     def __init__(self,
                  using=None,
                  atoms=None,
                  group=None,
-                 bonds_to_split=None):
+                 bonds_to_split=None,
+                 spatial_index=None,
+                 compact=False,
+                 fragments=None):
         self.check_user_additions()
+        if spatial_index not in (None, 'dense', 'cells'):
+            raise ValueError(
+                "Molecule: spatial_index must be one of None, 'dense' or 'cells'")
+        self.spatial_index = spatial_index
+        self.compact = compact
+        self.atom_array = None
         if using is not None:
             self.xyz = using
-            self.coords = self.read_xyz(self.xyz)
+            if compact:
+                self.atom_array = AtomArray(*read_xyz_atoms(self.xyz))
+                self.coords = self.atom_array.atoms
+            else:
+                self.coords = self.read_xyz(self.xyz)
         if atoms is not None and using is None:
             if len(atoms) == 0:
                 sys.exit('Error: atoms argument passed into Molecule is empty')
-            if not isinstance(atoms[0], Atom):
+            if compact:
+                if isinstance(atoms, AtomArray):
+                    self.atom_array = atoms
+                elif isinstance(atoms[0], Atom):
+                    self.atom_array = AtomArray.from_atoms(atoms)
+                else:
+                    self.atom_array = AtomArray(
+                        [atom[0] for atom in atoms],
+                        [atom[1:] for atom in atoms])
+                self.coords = self.atom_array.atoms
+            elif not isinstance(atoms[0], Atom):
                 self.coords = []
                 for atom in atoms:
                     sym, *coords = atom
@@ -260,8 +330,15 @@ class Molecule:
             self.bonds_to_split = bonds_to_split
             self.split_on_bonds = True
 
-        for index, atom in enumerate(self.coords):
-            atom.index = index + 1
+        if self.atom_array is not None:
+            self.atom_array.index[:] = np.arange(1, len(self.atom_array) + 1)
+        else:
+            for index, atom in enumerate(self.coords):
+                atom.index = index + 1
+
+        if fragments is not None:
+            # already separated, i.e. by `Molecule.from_fragments`
+            self.fragments = fragments
 
         if hasattr(self, 'coords'):
             # self.complex used in input files
@@ -379,16 +456,11 @@ class Molecule:
         Reads coordinates of an xyz file and return a list of |Atom| objects,
         one for each atom
         """
-        coords = []
-        with open(using, "r") as f:
-            for coord in f.readlines()[2:]:
-                line = coord.split()
-                for val in PT.ptable.values():
-                    if line[0] == val[0]:
-                        coords.append(
-                            Atom(line[0],
-                                 coords=tuple(float(i) for i in line[1:4])))
-        return coords
+        symbols, coords = read_xyz_atoms(using)
+        return [
+            Atom(sym, coords=xyz)
+            for sym, xyz in zip(symbols.tolist(), coords.tolist())
+        ]
 
     def write_xyz(self, atoms, filename=None):
         """
@@ -404,74 +476,71 @@ class Molecule:
                         f"{atom.symbol:5s} {atom.x:>10.5f} {atom.y:>10.5f} {atom.z:>10.5f} \n"
                     )
 
-    def check_db(self):
+    @staticmethod
+    def composition(symbols):
         """
-        Checks fragments for a match in the database
+        Returns a canonical signature of a list of atomic symbols, as a tuple
+        of (symbol, count) pairs sorted by symbol. Lists containing the same
+        atoms in any order share a signature:
+            >>> Molecule.composition(['H', 'O', 'H'])
+            (('H', 2), ('O', 1))
         """
+        return tuple(sorted(Counter(symbols).items()))
 
-        symbols = {}
-        for frag, atoms in self.mol_dict.items():
-            symbols[frag] = [atom.symbol for atom in atoms]
+    @classmethod
+    def index_database(cls):
+        """
+        Builds `Molecule.database_index`, mapping the composition of every
+        molecule in the databases to a list of (name, type, charge,
+        multiplicity) tuples, in the order the databases are searched.
+        Called when the class is loaded, and again whenever user-defined
+        molecules are added.
+        """
+        index = {}
+        order = {}
+        for db, mol_type, charge, mult in cls.DATABASES:
+            for name, atom_list in getattr(cls, db).items():
+                entry = (name, mol_type, charge, mult)
+                index.setdefault(cls.composition(atom_list), []).append(entry)
+                order.setdefault(entry, len(order))
+        cls.database_index = index
+        cls._database_order = order
 
-        def check_dict(molecules_dict, symbols_dict, db):
-            """
-            Checking molecule database for a match, and returning the required attributes- 
-            name, atoms in molecule, type of molecule, charge, multiplicity, 
-            and elements present in the molecule"""
-            if db == Molecule.Anions:
-                charge = -1
-                mult = 1
-                mol_type = 'anion'
-            elif db == Molecule.Cations:
-                charge = 1
-                mult = 1
-                mol_type = 'cation'
-            elif db == Molecule.Neutrals:
-                charge = 0
-                mult = 1
-                mol_type = 'neutral'
-            elif db == Molecule.Radicals:
-                charge = 0
-                mult = 2
-                mol_type = 'radical'
-            elif db == Molecule.Dications:
-                charge = 2
-                mult = 1
-                mol_type = 'dication'
-            elif db == Molecule.Anion_radicals:
-                charge = -1
-                mult = 2
-                mol_type = 'anion-radical'
-            elif db == Molecule.Cation_radicals:
-                charge = 1
-                mult = 2
-                mol_type = 'cation-radical'
-            elif db == Molecule.Dication_radicals:
-                charge = 2
-                mult = 2
-                mol_type = 'dication-radical'
-
-            for name, atom_list in db.items():
-                for sym, molecule in symbols_dict.items():
-                    if sorted(molecule) == sorted(atom_list):
-                        data = {
-                            "type": mol_type,
-                            "name": name,
-                            "atoms": self.mol_dict[sym],
-                            "charge": charge,
-                            "multiplicity": mult,
-                            "elements": sort_elements(self.mol_dict[sym]),
-                            "frag_type": "frag"
-                        }
-                        molecules_dict[sym] = data
-            return molecules_dict
+    @classmethod
+    def find_in_database(cls, symbols):
+        """
+        Returns a list of (name, type, charge, multiplicity) tuples for every
+        molecule in the databases made of the atomic symbols passed in. 
+        Returns an empty list if there is no match.
+        """
+        return cls.database_index.get(cls.composition(symbols), [])
+
+    def check_db(self):
+        """
+        Checks fragments for a match in the database. If a fragment matches
+        more than one molecule, the last match in the order of 
+        `Molecule.DATABASES` is used.
+        """
+        matches = []
+        for order, (sym, atoms) in enumerate(self.mol_dict.items()):
+            found = Molecule.find_in_database([atom.symbol for atom in atoms])
+            if found:
+                # fragments are listed in order of their first match
+                first = Molecule._database_order[found[0]]
+                matches.append((first, order, sym, found[-1]))
+        matches.sort(key=lambda match: match[:2])
 
         self.fragments = {}
-        for db in (Molecule.Cations, Molecule.Anions, Molecule.Neutrals,
-                   Molecule.Radicals, Molecule.Anion_radicals,
-                   Molecule.Cation_radicals, Molecule.Dications,
-                   Molecule.Dication_radicals):
-            self.fragments = check_dict(self.fragments, symbols, db)
+        for *_, sym, (name, mol_type, charge, mult) in matches:
+            self.fragments[sym] = {
+                "type": mol_type,
+                "name": name,
+                "atoms": self.mol_dict[sym],
+                "charge": charge,
+                "multiplicity": mult,
+                "elements": sort_elements(self.mol_dict[sym]),
+                "frag_type": "frag"
+            }
 
         #sort order of atoms
         for data in self.fragments.values():
@@ -486,18 +555,12 @@ class Molecule:
         This function takes the molecules and gives them a number from 1 to the 
         number of fragments
         """
-        current = set([atom.mol for atom in self.coords])
-        convert_keys = {k: v
-                        for k, v in enumerate(self.fragments.keys(), 1)
-                        }  # old: new
-        frags = list(self.fragments.items())
+        frags = list(self.fragments.values())
         self.fragments.clear()
-        for k, v in frags:
-            for key, val in convert_keys.items():
-                if k == val:
-                    self.fragments[key] = v
-                    for atom in self.fragments[key]['atoms']:
-                        atom.mol = key
+        for key, frag in enumerate(frags, 1):
+            self.fragments[key] = frag
+            for atom in frag['atoms']:
+                atom.mol = key
 
     def give_atoms_a_fragment_name(self):
         for num, frag in self.fragments.items():
@@ -593,16 +656,17 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
         atoms by considering separation and van der waals radii
         """
 
-        for i, atom_i in enumerate(self.coords):
-            for j, atom_j in enumerate(self.coords):
-                if i != j:
-                    dist = atom_i.distance_to(atom_j)
-                    vdw_dist = PT.get_vdw(atom_i) + PT.get_vdw(atom_j)
-                    if dist < vdw_dist:
-                        if atom_j not in atom_i.connected_atoms:
-                            atom_i.connected_atoms.append(atom_j)
-                        if atom_i not in atom_j.connected_atoms:
-                            atom_j.connected_atoms.append(atom_i)
+        if self.atom_array is not None:
+            self.atom_array.set_neighbours(*self.bonded_pairs())
+            return
+        for i, neighbours in enumerate(self.neighbours()):
+            atom_i = self.coords[i]
+            for j in neighbours:
+                atom_j = self.coords[j]
+                if atom_j not in atom_i.connected_atoms:
+                    atom_i.connected_atoms.append(atom_j)
+                if atom_i not in atom_j.connected_atoms:
+                    atom_j.connected_atoms.append(atom_i)
 
     def add_ionic_network(self):
         """
@@ -623,22 +687,12 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
 
             return charge, multiplicity
 
-        coord_list = [coord for coord in self.coords]
+        removed = set()
         for k, frag in self.fragments.items():
-            # remove neutrals
-            if frag['charge'] == 0:
-                for coord in frag['atoms']:
-                    # remove coord from coord_list
-                    for i, atom in enumerate(coord_list):
-                        if coord.index == atom.index:
-                            del coord_list[i]
-            # remove Li, Na, Cl, Br etc...
-            elif len(frag['atoms']) == 1:
-                for coord in frag['atoms']:
-                    # remove coord from coord_list
-                    for i, atom in enumerate(coord_list):
-                        if coord.index == atom.index:
-                            del coord_list[i]
+            # remove neutrals, and Li, Na, Cl, Br etc...
+            if frag['charge'] == 0 or len(frag['atoms']) == 1:
+                removed.update(atom.index for atom in frag['atoms'])
+        coord_list = [atom for atom in self.coords if atom.index not in removed]
         if len(coord_list) != len(self.coords) and len(coord_list) != 0:
             # split and add charges and multiplicities up
             # charge, multiplicity = ionic_mol_properties(coord_list)
@@ -652,6 +706,50 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
                 "frag_type": "ionic"
             }
 
+    @classmethod
+    def from_fragments(cls, fragments, atoms=None):
+        """
+        Creates a |Molecule| from fragments of a separated |Molecule|, taking
+        the name, charge and multiplicity of each fragment from its entry in
+        `fragments` rather than separating the atoms again. The atoms are
+        copied and numbered from one in the order of the original system, so
+        the result is the same as reading an xyz file of the fragments back
+        in, without writing one:
+            >>> anions = [frag for frag in mol.fragments.values()
+            ...           if frag['charge'] < 0]
+            >>> anion_mol = Molecule.from_fragments(anions)
+
+        `atoms` gives every atom of the new molecule, if it should contain
+        atoms that are not in any of the fragments, i.e. those of unknown
+        molecules.
+        """
+        fragments = sorted(
+            fragments,
+            key=lambda frag: min(atom.index for atom in frag['atoms']))
+        if atoms is None:
+            atoms = [atom for frag in fragments for atom in frag['atoms']]
+        copies = {
+            atom.index: Atom(atom.symbol, coords=(atom.x, atom.y, atom.z))
+            for atom in atoms
+        }
+        atoms = [copies[index] for index in sorted(copies)]
+
+        separated = {}
+        for key, frag in enumerate(fragments, 1):
+            frag_atoms = [copies[atom.index] for atom in frag['atoms']]
+            for number, atom in enumerate(frag_atoms, 1):
+                atom.mol = key
+                atom.number = number
+                atom.fragment = f"{frag['name']}_{key}"
+            separated[key] = {
+                **frag,
+                "atoms": frag_atoms,
+                "elements": sort_elements(frag_atoms)
+            }
+        mol = cls(atoms=atoms, fragments=separated)
+        mol.add_ionic_network()
+        return mol
+
     @property
     def all_atoms_assigned(self):
         """
@@ -775,62 +873,30 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
         indicating which bond to break. For example, [(4,9)] indicates a bond between
         atoms 4 and 9 of the original xyz file that should be broken. 
         """
-        def remove_connection(connections, atom1, atom2):
-            if atom2 in connections[atom1]:
-                connections[atom1].remove(atom2)
-            if atom1 in connections[atom2]:
-                connections[atom2].remove(atom1)
-            return connections
-
-        connections = {
-            atom.index: [con.index for con in atom.connected_atoms]
-            for atom in self
-        }
-        # apply split
+        split = set()
         for bond in self.bonds_to_split:
             a1, a2 = bond
-            connections = remove_connection(connections, a1, a2)
-
-        # convert indices back to atom objects
-        connections = {
-            k: [self.coords[i - 1] for i in v]
-            for k, v in connections.items()
-        }
-
-        # now have {original_atom: [connections_to_original_atom]}
-        # but need include original_atom in that dict
-
-        for k, v in connections.items():
-            # include as first, why not
-            v.insert(0, self.coords[k - 1])
-
-        # collect up frags after applying split
-        for index, connected_atoms in connections.items():
-            # now check rest of indices of connections
-            # for connections to any of current atoms in fragment
-            for index2, connected2 in connections.items():
-                if index != index2:
-                    if any(atom in connected2
-                           for atom in connected_atoms):  # frags are connected
-                        # add the rest of connected2 into connected_atoms and empty 'old' frag
-                        for a2 in connected2:
-                            if a2 not in connected_atoms:
-                                connected_atoms.append(a2)
-                        connections[index2] = []
-
-        connections = {
-            k: sorted(v, key=lambda atom: atom.index)
-            for k, v in connections.items() if len(v) != 0
-        }
+            split.add((a1, a2))
+            split.add((a2, a1))
+
+        # join atoms back together through every bond that is not split
+        position = {atom.index: i for i, atom in enumerate(self.coords)}
+        rows = []
+        cols = []
+        for i, atom in enumerate(self.coords):
+            for con in atom.connected_atoms:
+                if con.index in position and (atom.index, con.index) not in split:
+                    rows.append(i)
+                    cols.append(position[con.index])
+        labels = connected_components(len(self.coords), rows, cols)
 
         # redefine molecule number for each atom, starting from 1
         redefined = {}
-
-        for new_index, kv in enumerate(connections.items(), 1):
-            key, value = kv
-            redefined[new_index] = value
+        for atom, label in zip(self.coords, labels):
+            redefined.setdefault(label + 1, []).append(atom)
 
         for k, v in redefined.items():
+            v.sort(key=lambda atom: atom.index)
             for atom in v:
                 atom.mol = k
 
@@ -861,32 +927,14 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
             in that order.
             If not found, returns a neutral species with no unpaired electrons.
             """
-            anions = [sorted(v) for v in Molecule.Anions]
-            cations = [sorted(v) for v in Molecule.Cations]
-            neutrals = [sorted(v) for v in Molecule.Neutrals]
-            rads = [sorted(v) for v in Molecule.Radicals]
-            dicats = [sorted(v) for v in Molecule.Dications]
-            an_rads = [sorted(v) for v in Molecule.Anion_radicals]
-            cat_rads = [sorted(v) for v in Molecule.Cation_radicals]
-            dicat_rads = [sorted(v) for v in Molecule.Dication_radicals]
-            if atoms in anions:
-                return -1, 1
-            elif atoms in cations:
-                return 1, 1
-            elif atoms in neutrals:
-                return 0, 1
-            elif atoms in rads:
-                return 0, 2
-            elif atoms in dicats:
-                return 2, 1
-            elif atoms in an_rads:
-                return -1, 2
-            elif atoms in cat_rads:
-                return 1, 2
-            elif atoms in dicat_rads:
-                return 2, 2
-            else:
+            priority = ('anion', 'cation', 'neutral', 'radical', 'dication',
+                        'anion-radical', 'cation-radical', 'dication-radical')
+            found = Molecule.find_in_database([atom.symbol for atom in atoms])
+            if not found:
                 return 0, 1
+            name, mol_type, charge, mult = min(
+                found, key=lambda match: priority.index(match[1]))
+            return charge, mult
 
         #sort order of atoms
         for data in self.fragments.values():
@@ -909,66 +957,98 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
                 'frag_type': 'fragmented_on_bond'
             }
 
+    @property
+    def positions(self):
+        """
+        Returns an (N, 3) array of the coordinates of every atom in the system.
+        For a compact molecule this is the coordinate array itself, not a copy.
+        """
+        if self.atom_array is not None:
+            return self.atom_array.coords
+        return coordinate_array(self.coords)
+
     def distance_matrix(self):
         """
         Creates an N x N matrix of interatomic distances
         between every atom in the system. N = number of 
         atoms in system.
         """
-        num_atoms = len(self.coords)
-        matrix = np.zeros((num_atoms, num_atoms))
+        return distance_matrix(self.positions)
 
-        for i, atom_i in enumerate(self.coords):
-            for j, atom_j in enumerate(self.coords):
-                matrix[i, j] = atom_i.distance_to(atom_j)
-        return matrix
+    @property
+    def uses_cell_list(self):
+        """
+        Returns True if neighbours should be found using a |CellList|
+        """
+        if self.spatial_index is None:
+            return len(self.coords) > Molecule.CELL_LIST_THRESHOLD
+        return self.spatial_index == 'cells'
+
+    def bonded_pairs(self, cutoff=None):
+        """
+        Returns two arrays of positions in self.coords, (i, j), with i < j, for
+        every pair of neighbouring atoms. Atoms are neighbours if their
+        separation is less than the sum of their van der waals radii, or less
+        than `cutoff` angstroms if given.
+        All pairs are evaluated in one batched pass over the coordinates.
+        """
+        xyz = self.positions
+        if cutoff is None:
+            if self.atom_array is not None:
+                radii = PT.vdw_radii[self.atom_array.atnums]
+            else:
+                radii = vdw_radii(self.coords)
+            if self.uses_cell_list:
+                cell_size = 2 * radii.max() if len(radii) > 0 else 0
+                rows, cols = CellList(xyz, cell_size).bonded_pairs(radii)
+            else:
+                rows, cols = bonded_pairs(xyz, radii)
+        else:
+            if self.uses_cell_list:
+                rows, cols = CellList(xyz, cutoff).pairs_within(cutoff)
+            else:
+                rows, cols = pairs_within(xyz, cutoff)
+        return rows, cols
+
+    def neighbours(self, cutoff=None):
+        """
+        Returns a list of neighbours for every atom in self.coords, given as
+        positions in self.coords in ascending order, using `bonded_pairs`.
+        """
+        return neighbour_lists(len(self.coords), *self.bonded_pairs(cutoff))
 
     def split(self):
         """
-        Split a system into fragments using van der waals radii. Modifies
-        attributes of atoms in self.coords directly in loop, instead of creating
-        a dictionary and appending to the dictionary as we go. This
-        significantly speeds up the fragmentation.
-        """
-        mol_count = 0
-        dists = self.distance_matrix()
-        for i, atom_i in enumerate(self.coords):
-            connected = False
-            for j, atom_j in enumerate(self.coords):
-                if i != j:
-                    vdw_dist = PT.get_vdw(atom_i) + PT.get_vdw(atom_j)
-                    if dists[i, j] < vdw_dist:
-                        # connected
-                        connected = True
-                        if atom_i not in atom_j.connected_atoms:
-                            atom_j.connected_atoms.append(atom_i)
-                        if atom_j not in atom_i.connected_atoms:
-                            atom_i.connected_atoms.append(atom_j)
-                        if atom_i.mol is None and atom_j.mol is None:
-                            atom_i.mol = mol_count
-                            atom_j.mol = mol_count
-                            mol_count += 1
-                        elif atom_i.mol is None and atom_j.mol is not None:
-                            atom_i.mol = atom_j.mol
-                        elif atom_j.mol is None and atom_i.mol is not None:
-                            atom_j.mol = atom_i.mol
-                        # if different assignments, remove original assignment
-                        # combine the two fragments together, as they are connected
-                        elif atom_i.mol is not None and atom_j.mol is not None:
-                            if atom_i.mol != atom_j.mol:
-                                orig = atom_j.mol
-                                for atom in self.coords:
-                                    if atom.mol is orig:
-                                        atom.mol = atom_i.mol
-            if not connected:
-                atom_i.mol = mol_count
-                mol_count += 1
-
-        nums = set([atom.mol for atom in self.coords])
-        self.mol_dict = {
-            val: [atom for atom in self.coords if atom.mol == val]
-            for val in nums
-        }
+        Split a system into fragments using van der waals radii. Bonded atoms
+        are merged into molecules using a disjoint set, and each atom is
+        labelled with its molecule in `atom.mol`. Molecules are numbered from
+        zero in order of the first atom of each molecule.
+        """
+        if self.atom_array is not None:
+            rows, cols = self.bonded_pairs()
+            self.atom_array.set_neighbours(rows, cols)
+            labels = connected_components(len(self.coords), rows, cols)
+            self.atom_array.mol[:] = labels
+        else:
+            neighbours = self.neighbours()
+            rows = []
+            cols = []
+            for i, atom_i in enumerate(self.coords):
+                for j in neighbours[i]:
+                    atom_j = self.coords[j]
+                    if atom_j not in atom_i.connected_atoms:
+                        atom_i.connected_atoms.append(atom_j)
+                    if j > i:
+                        rows.append(i)
+                        cols.append(j)
+
+            labels = connected_components(len(self.coords), rows, cols)
+            for atom, label in zip(self.coords, labels):
+                atom.mol = label
+
+        self.mol_dict = {}
+        for atom, label in zip(self.coords, labels):
+            self.mol_dict.setdefault(label, []).append(atom)
         for mol in self.mol_dict.values():
             mol.sort(key=lambda atom: atom.index)
 
@@ -977,126 +1057,14 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
         Gives hydrogen bonding data back to the user. Checks for suitable
         connected atoms and bond lengths of less than 2 Å, and bond angles of
         45° either side of linear. Users can also provide an optional distance.
+        Bonds are found with |HydrogenBonds|; use it directly to analyse
+        many frames of the same system, or see `Molecule.trajectory_h_bonds`.
         """
         def find_bonds(self):
-            def is_imid_c2_h(atom):
-                """
-                Checks if a C2-H proton of imidazolium is found
-                """
-                connectors = {}
-                if atom.symbol == 'H':
-                    for alpha in atom.connected_atoms:  # alpha = one atom away, beta = two away
-                        for beta in alpha.connected_atoms:
-                            if beta.symbol not in connectors:
-                                connectors[beta.symbol] = 1
-                            else:
-                                connectors[beta.symbol] += 1
-                            if alpha.symbol == 'C' and 'N' in connectors and connectors[
-                                    'N'] == 2:
-                                return True
-                return False
-
-            def is_alkyl(atom):
-                if atom.symbol == 'H':
-                    for a in atom.connected_atoms:
-                        if a.symbol == 'C':
-                            return True
-                return False
-
-            def valid_atoms(atom1, atom2):
-                """
-                Checks if a bond is formed between a pair of atoms of the
-                correct type. This is achieved by checking the atoms
-                that the bonds are connected to, not involved in the bond.
-                For example, if an alkyl chain is close to an anion, this
-                function ignores any of those interactions.
-                """
-                # remove alkyl proton interactions
-                # need the atom.symbol == line,
-                # otherwise c-o --- h-o hydrogen
-                # bonds will fail (as c is not in
-                # h-bonders)
-                h_bonders = ['O', 'F', 'H', 'N']
-
-                # can't have two hydrogens for example
-                # if all(atom.symbol is 'H' for atom in (atom1, atom2)):
-                if atom1.symbol == atom2.symbol:
-                    return False
-                for atom in (atom1, atom2):
-                    if atom.symbol == 'H':
-                        if is_imid_c2_h(atom):  # exception
-                            return True
-                        if is_alkyl(atom):
-                            return False
-                    if atom.symbol not in h_bonders:
-                        return False
-                        for a in atom.connected_atoms:
-                            if a.symbol not in h_bonders:
-                                return False
-
-                return True
-
-            def within_hbond_distance(atom1, atom2, dist):
-                """
-                Checks that atoms are within hydrogen-bonding distances, set to
-                2 Å by default.
-                """
-                return atom1.distance_to(atom2) < dist
-
-            def bond_angle(atom1, atom2):
-                """
-                Returns the angle between two atoms.
-
-                 A
-                 \ 
-                   B --- C
-
-                Checks angle ∠ABC, when A is atom1, B is atom2 and C is the
-                connecting atom to atom2. There will probably be only one
-                connecting atom, but if there is more, only considering the
-                first in the list.
-                """
-                connected_to_atom2 = atom2.connected_atoms[0]
-                return atom2.angle_between(atom1.coords,
-                                           connected_to_atom2.coords)
-
-            def within_angle_tolerance(atom1, atom2):
-                """
-                Checks that a hydrogen bond is formed at a suitable angle, 45°
-                either side of linear.
-                """
-                return 225 > bond_angle(atom1, atom2) > 145
-
-            def valid_bond(atom1, atom2, dist):
-                """
-                Checks that two atoms forms a valid hydrogen bond.
-                """
-                if within_hbond_distance(atom1, atom2, dist) and \
-                within_angle_tolerance(atom1, atom2) and \
-                valid_atoms(atom1, atom2):
-                    return True
-                return False
-
-            self.assign_neighbours()
-            frag_list = [frag['atoms'] for frag in self.fragments.values()]
-
-            counted = []
-            h_bonded = []
-            for i, mol in enumerate(frag_list):
-                for j, mol2 in enumerate(frag_list):
-                    if i != j:
-                        for atom1 in mol:
-                            for atom2 in mol2:
-                                if valid_bond(atom1, atom2, distance):
-                                    pair = sorted([atom1.index, atom2.index])
-                                    if pair not in counted:
-                                        dist = atom1.distance_to(atom2)
-                                        angle = bond_angle(atom1, atom2)
-                                        h_bonded.append(
-                                            [atom1, atom2, dist, angle])
-                                        counted.append(pair)
-
-            return h_bonded
+            hbonds = HydrogenBonds.from_molecule(self)
+            table = hbonds.find(self.positions, distance)
+            return [[self.coords[atom1], self.coords[atom2], dist, angle]
+                    for atom1, atom2, dist, angle in table.tolist()]
 
         def find_molecule_type(molecule):
             """
@@ -1143,6 +1111,22 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
 
         return self.hbond_data
 
+    def trajectory_h_bonds(self, frames, distance=2.0):
+        """
+        Finds hydrogen bonds in every frame of a trajectory of this system,
+        using the fragments and bonding found for this |Molecule|. `frames` 
+        can be an |XYZTrajectory|, or any iterable of |XYZFrame| objects or
+        (N, 3) arrays of coordinates. Returns a list of tables, one for each
+        frame, and the lifetimes of each hydrogen bond; see |HydrogenBonds|.
+
+            >>> traj = XYZTrajectory('md.xyz')
+            >>> mol = Molecule(atoms=traj[0].atoms())
+            >>> tables, lifetimes = mol.trajectory_h_bonds(traj)
+        """
+        hbonds = HydrogenBonds.from_molecule(self)
+        tables = list(hbonds.trajectory(frames, distance))
+        return tables, HydrogenBonds.lifetimes(tables)
+
     def frag_name(self, atom):
         """
         Accepts an atom from the molecule, returning the name of the fragment containing that atom.
@@ -1165,7 +1149,8 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
                         for frag in fragment_dict.values()) else 1
         # extend multiplicity for biradicals etc...
 
-    def mol_template(self):
+    @staticmethod
+    def mol_template():
         lines = [
             "# Molecules should be laid out in four lines as follows:\n",
             "# name=<NAME>\n", "# charge=<CHARGE>\n",
@@ -1181,61 +1166,83 @@ molecules, include the number without brackets: [1, 3], 4, [5, 7]
     def check_user_additions(self):
         """
         Reads ~/.config/autochem/molecules.txt for 
-        any additional molecules
-        """
-        confdir = os.path.expanduser('~/.config/autochem/')
-        if not os.path.exists(confdir):
-            os.makedirs(confdir, exist_ok=True)
-        userfile = os.path.join(confdir, 'molecules.txt')
-        # CREATE TEMPLATE FILE IF NOT EXISTS
-        if not os.path.isfile(userfile):
-            open(userfile, 'w+').writelines(self.mol_template())
-        # READ USER MOLECULES IF FILE EXISTS
-        else:
-            name = False
-            charge = False
-            mult = False
-            atoms = False
-            with open(userfile, 'r+') as f:
-                for line in f:
-                    # GET RID OF EXTRA SPACES AND ANYTHING AFTER A HASH
-                    line = line.strip()
-                    line = line.split('#')[0]
-                    # SPLIT INTO DESCRIPTOR AND VALUE
-                    line = line.split('=')
-                    # FIND IF ONE OF THE DESCRIPTORS AND ASSIGN VALUE
-                    if 'name' in line[0]:
-                        name = line[1]
-                    elif 'charge' in line[0]:
-                        charge = int(line[1])
-                    elif 'multiplicity' in line[0]:
-                        mult = int(line[1])
-                    elif 'atoms' in line[0]:
-                        atoms = line[1].split(',')
-                        for i in range(len(atoms)):
-                            atoms[i] = atoms[i].strip()
-
-                    # ONCE ALL DEFINED ADD TO DICTIONARY
-                    if not name is False and not charge is False:
-                        if not mult is False and not atoms is False:
-                            if charge == 0 and mult == 1:
-                                Molecule.Neutrals[name] = atoms
-                            elif charge == -1 and mult == 1:
-                                Molecule.Anions[name] = atoms
-                            if charge == 1 and mult == 1:
-                                Molecule.Cations[name] = atoms
-                            if charge == 0 and mult == 2:
-                                Molecule.Radicals[name] = atoms
-                            if charge == -1 and mult == 2:
-                                Molecule.Anion_radicals[name] = atoms
-                            if charge == 1 and mult == 2:
-                                Molecule.Cation_radicals[name] = atoms
-                            if charge == 2 and mult == 1:
-                                Molecule.Dications[name] = atoms
-                            if charge == 2 and mult == 2:
-                                Molecule.Dication_radicals[name] = atoms
-                            # RESET VARS
-                            name = False
-                            charge = False
-                            mult = False
-                            atoms = False
+        any additional molecules. The file is only parsed again if it has
+        changed since it was last read; see `Molecule.load_user_molecules`
+        """
+        Molecule.load_user_molecules()
+
+    @classmethod
+    def load_user_molecules(cls, userfile=None, force=False):
+        """
+        Adds the molecules defined in `userfile`, by default 
+        ~/.config/autochem/molecules.txt, to the databases. If the default
+        file does not exist, a template is created.
+
+        The molecules are shared by every |Molecule| in the process, so the
+        file is only parsed when first requested or when its modification
+        time or size changes. Pass `force=True` to parse it regardless.
+        Molecules read previously from the file are removed before reading,
+        so edits and deletions are picked up:
+            >>> Molecule.load_user_molecules('my_molecules.txt')
+        """
+        if userfile is None:
+            confdir = os.path.expanduser('~/.config/autochem/')
+            userfile = os.path.join(confdir, 'molecules.txt')
+            # CREATE TEMPLATE FILE IF NOT EXISTS
+            if not os.path.isfile(userfile):
+                os.makedirs(confdir, exist_ok=True)
+                open(userfile, 'w+').writelines(cls.mol_template())
+        stat = os.stat(userfile)
+        stamp = (os.path.abspath(userfile), stat.st_mtime_ns, stat.st_size)
+        if stamp == cls._user_file_stamp and not force:
+            return
+
+        # restore anything replaced when the file was last read
+        for (db, name), original in cls._user_replaced.items():
+            if original is None:
+                getattr(cls, db).pop(name, None)
+            else:
+                getattr(cls, db)[name] = original
+        cls._user_replaced = {}
+
+        dbs = {(charge, mult): db for db, _, charge, mult in cls.DATABASES}
+        name = False
+        charge = False
+        mult = False
+        atoms = False
+        with open(userfile, 'r') as f:
+            for line in f:
+                # GET RID OF EXTRA SPACES AND ANYTHING AFTER A HASH
+                line = line.strip()
+                line = line.split('#')[0]
+                # SPLIT INTO DESCRIPTOR AND VALUE
+                line = line.split('=')
+                # FIND IF ONE OF THE DESCRIPTORS AND ASSIGN VALUE
+                if 'name' in line[0]:
+                    name = line[1]
+                elif 'charge' in line[0]:
+                    charge = int(line[1])
+                elif 'multiplicity' in line[0]:
+                    mult = int(line[1])
+                elif 'atoms' in line[0]:
+                    atoms = line[1].split(',')
+                    for i in range(len(atoms)):
+                        atoms[i] = atoms[i].strip()
+
+                # ONCE ALL DEFINED ADD TO DICTIONARY
+                if not name is False and not charge is False:
+                    if not mult is False and not atoms is False:
+                        if (charge, mult) in dbs:
+                            db = getattr(cls, dbs[(charge, mult)])
+                            cls._user_replaced.setdefault(
+                                (dbs[(charge, mult)], name), db.get(name))
+                            db[name] = atoms
+                        # RESET VARS
+                        name = False
+                        charge = False
+                        mult = False
+                        atoms = False
+        cls._user_file_stamp = stamp
+        cls.index_database()
+
+Molecule.index_database()
@@ -0,0 +1,153 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import sys
+
+from .cache import ResultsCache
+from .results import Results
+
+__all__ = ['harvest']
+
+
+def _run_chunk(func, chunk, cache_path=None):
+    """
+    Calls `func` on every file in a chunk, returning (True, result) for each
+    file, or (False, error message) if an exception was raised. If
+    `cache_path` is given, the |ResultsCache| there is opened for the
+    offsets of sections found in the logs.
+    """
+    results = []
+    if cache_path is not None:
+        Results.section_cache = ResultsCache(cache_path)
+    try:
+        for path in chunk:
+            try:
+                results.append((True, func(path)))
+            except Exception as e:
+                results.append((False, f"{type(e).__name__}: {e}"))
+    finally:
+        if cache_path is not None:
+            Results.section_cache.close()
+            Results.section_cache = None
+    return results
+
+
+def harvest(files,
+            func,
+            workers=None,
+            chunksize=None,
+            progress=True,
+            cache=None):
+    """
+    Calls `func` on every file in `files`, using a pool of `workers`
+    processes so that many output files can be parsed at once. `func` must
+    be defined at the top level of a module, so it can be sent to the
+    worker processes, and should return None for files to be skipped.
+
+    Files are sent to the workers in chunks of `chunksize` files. By
+    default, `workers` is the number of CPUs and files are split into about
+    four chunks per worker. Use `workers=1` to parse every file in this
+    process.
+
+    If a |ResultsCache| is passed as `cache`, values stored for files that
+    have not changed since they were last parsed are used instead of calling
+    `func`, and the values of the files parsed are stored for next time.
+    The offsets of the sections of logs read by |Results| classes are
+    stored in the same cache.
+
+    A file raising an exception does not stop the others being parsed.
+    Returns two lists, in the same order as `files`:
+    * results -- (file, result) for each file where `func` returned a value
+    * failures -- (file, error message) for each file raising an exception
+
+        >>> results, failures = harvest(get_files('.', ['log']), parse_log, workers=8)
+
+    If `progress` is True, the number of files parsed is printed to stderr
+    as the work is done, followed by any failures.
+    """
+    files = list(files)
+    found = {}
+    to_parse = files
+    cache_path = None
+    if cache is not None:
+        kind = cache.kind_of(func)
+        found, stamps = cache.lookup(files, kind)
+        to_parse = [file for file in files if file not in found]
+        cache_path = cache.path
+        if progress and found:
+            print(f"Using stored results for {len(found)}/{len(files)} files",
+                  file=sys.stderr)
+
+    parsed = _parse(to_parse, func, workers, chunksize, progress, cache_path)
+    if cache is not None:
+        cache.store([(path, value) for path, (ok, value) in parsed.items()
+                     if ok], kind, stamps)
+
+    results = []
+    failures = []
+    for path in files:
+        if path in found:
+            ok, value = True, found[path]
+        else:
+            ok, value = parsed[path]
+        if not ok:
+            failures.append((path, value))
+        elif value is not None:
+            results.append((path, value))
+
+    if progress and failures:
+        print(f"Failed to read {len(failures)} files:", file=sys.stderr)
+        for path, error in failures:
+            print(f"    {path}: {error}", file=sys.stderr)
+    return results, failures
+
+
+def _parse(files, func, workers, chunksize, progress, cache_path=None):
+    """
+    Calls `func` on every file, as described in `harvest`, with the
+    offsets of sections kept in the |ResultsCache| at `cache_path`, if
+    given. Returns {file: (True, result)} or {file: (False, error message)}.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(files)))
+    if chunksize is None:
+        chunksize = -(-len(files) // (workers * 4))
+    chunksize = max(1, chunksize)
+    chunks = [
+        files[start:start + chunksize]
+        for start in range(0, len(files), chunksize)
+    ]
+
+    done = 0
+
+    def report(num_files):
+        nonlocal done
+        done += num_files
+        if progress:
+            print(f"\rParsed {done}/{len(files)} files",
+                  end='',
+                  file=sys.stderr,
+                  flush=True)
+
+    outcomes = [None] * len(chunks)
+    if workers == 1:
+        for i, chunk in enumerate(chunks):
+            outcomes[i] = _run_chunk(func, chunk, cache_path)
+            report(len(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_run_chunk, func, chunk, cache_path): i
+                for i, chunk in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                outcomes[i] = future.result()
+                report(len(chunks[i]))
+    if progress and files:
+        print(file=sys.stderr)
+
+    parsed = {}
+    for chunk, outcome in zip(chunks, outcomes):
+        parsed.update(zip(chunk, outcome))
+    return parsed
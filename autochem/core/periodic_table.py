@@ -1,3 +1,5 @@
+import numpy as np
+
 __all__ = ['PeriodicTable']
 
 class PeriodicTable:
@@ -125,6 +127,14 @@ class PeriodicTable:
     ptable[116] = ['Lv', 293.00000, 2.00 ,  8, 0.000]
     ptable[117] = ['Ts', 294.00000, 2.00 ,  8, 0.000]
     ptable[118] = ['Og', 294.00000, 2.00 ,  8, 0.000]
+
+    # lookups built from ptable: symbol to atomic number, and arrays of each
+    # property indexed by atomic number
+    atnums = {values[0]: atnum for atnum, values in ptable.items()}
+    masses = np.array([values[1] for values in ptable.values()])
+    radii = np.array([values[2] for values in ptable.values()])
+    connectors = np.array([values[3] for values in ptable.values()])
+    vdw_radii = np.array([values[4] for values in ptable.values()])
                                                
     def __init__(self): 
         raise AttributeError('The PeriodicTable class cannot be instantiated.')
@@ -132,9 +142,7 @@ class PeriodicTable:
     @classmethod
     def get_atnum(cls, atom):
         """Converts symbol to atomic number"""
-        for key in cls.ptable.keys():
-            if cls.ptable[key][0] == atom.symbol.capitalize():
-                return key
+        return cls.atnums.get(atom.symbol.capitalize())
 
     @classmethod
     def get_symbol(cls, atom):
@@ -144,24 +152,56 @@ class PeriodicTable:
     @classmethod
     def get_radius(cls, atom):
         """Returns atomic radius for a given element"""
-        atnum = cls.get_atnum(atom)
-        return float(cls.ptable[atom.atnum][2])
+        return float(cls.radii[atom.atnum])
     
     @classmethod
     def get_mass(cls, atom):
         """Returns atomic mass for a given element"""
-        atnum = cls.get_atnum(atom)
-        return float(cls.ptable[atom.atnum][1])
+        return float(cls.masses[atom.atnum])
 
     @classmethod
     def get_connectors(cls, atom):
         """Returns number of possible attachments to a given element"""
-        atnum = cls.get_atnum(atom)
-        return int(cls.ptable[atom.atnum][-2])
+        return int(cls.connectors[atom.atnum])
     
     @classmethod
     def get_vdw(cls, atom):
         """Returns van der waals radius of a given element"""
-        atnum = cls.get_atnum(atom)
-        return float(cls.ptable[atom.atnum][-1])
-        
+        return float(cls.vdw_radii[atom.atnum])
+
+    @classmethod
+    def get_atnums(cls, symbols):
+        """
+        Converts an array of symbols to an array of atomic numbers. Each
+        distinct symbol is only looked up once, so large arrays are cheap:
+            >>> PeriodicTable.get_atnums(['O', 'H', 'H'])
+            array([8, 1, 1])
+        """
+        unique, inverse = np.unique(np.asarray(symbols, dtype=str),
+                                    return_inverse=True)
+        try:
+            atnums = np.array([cls.atnums[sym.capitalize()] for sym in unique],
+                              dtype=np.int64)
+        except KeyError as error:
+            raise ValueError(f'PeriodicTable: unknown element {error}')
+        return atnums[inverse.reshape(-1)]
+
+    @classmethod
+    def get_masses(cls, symbols):
+        """Returns an array of atomic masses for an array of symbols"""
+        return cls.masses[cls.get_atnums(symbols)]
+
+    @classmethod
+    def get_radii(cls, symbols):
+        """Returns an array of atomic radii for an array of symbols"""
+        return cls.radii[cls.get_atnums(symbols)]
+
+    @classmethod
+    def get_all_connectors(cls, symbols):
+        """Returns an array of possible attachments for an array of symbols"""
+        return cls.connectors[cls.get_atnums(symbols)]
+
+    @classmethod
+    def get_vdws(cls, symbols):
+        """Returns an array of van der waals radii for an array of symbols"""
+        return cls.vdw_radii[cls.get_atnums(symbols)]
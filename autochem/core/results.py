@@ -1,11 +1,88 @@
 import re
 import os
+from .scan import MarkerPass
+from .sections import SectionIndex
 from .utils import write_xyz, eof, read_file
+from .xyz import XYZFrame
+
+__all__ = ['OptimisationStep', 'OptimisationResults', 'Results']
+
+class OptimisationStep(XYZFrame):
+    """
+    Geometry of one step of an optimisation, as an |XYZFrame| with two more
+    attributes:
+
+    * ``energy`` -- energy of the geometry in hartrees, None if not printed
+    * ``converged`` -- True for geometries printed once the optimisation has
+      converged
+    """
+
+    def __init__(self, symbols, coords, energy=None, converged=False, index=0):
+        comment = '' if energy is None else f'E = {energy}'
+        super().__init__(symbols, coords, comment, index)
+        self.energy = energy
+        self.converged = converged
+
+    def __repr__(self):
+        return f'OptimisationStep {self.index}: {len(self)} atoms, E = {self.energy}'
+
+
+class OptimisationResults:
+    """
+    Mixin for |Results| of programs whose logs print every geometry of an
+    optimisation. Subclasses define `_steps(lines, index)`, a generator
+    yielding an |OptimisationStep| for every geometry in `lines` numbered
+    from `index`, and `_last_step()`, which returns the last one or None.
+    """
+
+    def optimisation_steps(self, last_only=False):
+        """
+        Generator yielding an |OptimisationStep| for every geometry printed
+        during an optimisation, with its energy, in one pass through the log:
+
+            >>> steps = list(results.optimisation_steps())
+            >>> energies = [step.energy for step in steps]
+            >>> write_frames(steps, 'opt.xyz')
+
+        If `last_only` is True, only the last geometry is yielded, reading
+        just the end of the log by seeking to it with `self.sections`.
+        """
+        if last_only:
+            step = self._last_step()
+            if step is not None:
+                yield step
+        else:
+            yield from self._steps(self.read())
 
-__all__ = ['Results']
 
 class Results:
-    """Base class, only for inheritance"""
+    """
+    Base class, only for inheritance.
+
+    Most properties of a log are found by scanners, which are fed lines from
+    one pass through the file. `SCANNERS` gives {name: markers}, and for
+    every name a subclass defines a generator method `_scan_<name>`. Each
+    scanner is only sent the lines containing one of its markers, with
+    `line = yield`, until it yields True to be sent the lines of the
+    section that follows, and receives None at the end of the file. The
+    value it returns is kept in `self.scanned`; see |MarkerPass|.
+
+    The pass only goes as far as needed for the value asked for with
+    `self.get_scanned(name)`, feeding every other scanner on the way, and
+    carries on from there when a value not found yet is needed. Properties
+    printed at the start of a log never read the rest of it.
+
+    Sections of the log found by a marker, usually near the end, are read by
+    seeking straight to them. `SECTIONS` gives {name: marker} for these, and
+    the offsets of the lines containing a marker are found the first time
+    they are needed from `self.sections`, a |SectionIndex|. The offsets are
+    kept in `section_cache`, a |ResultsCache|, if one is set, as it is in the
+    worker processes of `harvest` when it is given a cache.
+    """
+
+    SCANNERS = {}
+    SECTIONS = {}
+    section_cache = None
 
     def __init__(self, log):
         self.log = log
@@ -13,6 +90,8 @@ class Results:
         self.basename = self.file.split('.')[0]
         self.abspath = os.path.abspath(log)
         self.parent_dir = self.abspath.split('/')[-2]
+        self._pass = None
+        self._sections = None
 
     def __repr__(self):
         return f'{self.__class__.__name__}: {self.log}'
@@ -28,6 +107,71 @@ class Results:
         for line in read_file(self.log):
             yield line
 
+    def scan(self, *names):
+        """
+        Continues the pass through the log until every scanner in `names`,
+        or every scanner in `SCANNERS` if none are given, has returned.
+        Returns a dictionary of the values found so far. If a scanner raises
+        an exception, the exception is stored in place of its value and the
+        other scanners carry on.
+        """
+        if self._pass is None:
+            self._pass = MarkerPass(self.log, [
+                (name, getattr(self, f'_scan_{name}')(), markers)
+                for name, markers in self.SCANNERS.items()
+            ])
+        scanned = self._pass.values
+        names = names or tuple(self.SCANNERS)
+        try:
+            self._pass.run(lambda: all(name in scanned for name in names))
+        except BaseException:
+            self._pass = None
+            raise
+        return scanned
+
+    @property
+    def _scanned(self):
+        """Values found so far, without reading any more of the log"""
+        return {} if self._pass is None else self._pass.values
+
+    @property
+    def scanned(self):
+        """
+        Values found by every scanner, reading the rest of the log the first
+        time they are needed
+        """
+        return self.scan()
+
+    def get_scanned(self, name):
+        """
+        Returns the value found by scanner `name`, reading only as much of
+        the log as needed, and raising any exception raised while it was
+        found
+        """
+        value = self.scan(name)[name]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def index_sections(self, cache=None):
+        """
+        Returns a |SectionIndex| of the markers in `SECTIONS`, which finds
+        each marker the first time its section is needed, reading and
+        storing the offsets found in `cache`, a |ResultsCache|, if given
+        """
+        self._sections = SectionIndex(self.log, self.SECTIONS, cache)
+        return self._sections
+
+    @property
+    def sections(self):
+        """
+        |SectionIndex| of the markers in `SECTIONS`, made the first time it
+        is needed
+        """
+        if self._sections is None:
+            self.index_sections(self.section_cache)
+        return self._sections
+
     def get_error(self):
         print(f'{self.log}: Incomplete calculation')
 
@@ -1,8 +1,31 @@
-import os
-import subprocess
+from functools import lru_cache
+import socket
 
 __all__ = ['Supercomp']
 
+
+@lru_cache(maxsize=None)
+def detect_supercomp():
+    """
+    Returns the abbreviation of the supercomputer in use, decided from the
+    hostname. The hostname is only looked up once per process.
+    """
+    cases = {
+             'gadi': 'gadi',
+             'm3': 'mas',
+             'magnus': 'mgs',
+             'monarch': 'mon',
+             'nfs': 'gaia',
+             'raijin': 'rjn',
+             'stampede': 'stm',
+             }
+    hostname = socket.gethostname()
+    for key in cases:
+        if key in hostname:
+            return cases[key]
+    return 'stm'
+
+
 class Supercomp:
     """Detects the supercomputer in use when called. In reality, using a class
     may be overkill here. However, this allows for extensibility when required.
@@ -13,23 +36,7 @@ class Supercomp:
     """
 
     def __init__(self):
-        cases = {
-                 'gadi': 'gadi',
-                 'm3': 'mas',
-                 'magnus': 'mgs',
-                 'monarch': 'mon',
-                 'nfs': 'gaia',
-                 'raijin': 'rjn',
-                 'stampede': 'stm',
-                 }
-        hostname = subprocess.run('hostname', encoding = 'utf-8',
-                   stdout = subprocess.PIPE).stdout[:-1]
-        for key in cases:
-            if key in hostname:
-                self.sc = cases[key]
-                break
-            else:
-                self.sc = 'stm' 
+        self.sc = detect_supercomp()
 
     def __repr__(self):
         return str(self.sc)
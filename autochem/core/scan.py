@@ -0,0 +1,177 @@
+from contextlib import contextmanager
+import mmap
+import os
+
+__all__ = ['MarkerPass']
+
+
+@contextmanager
+def mapped_file(filename):
+    """Memory-maps a file for reading, giving None if it is empty"""
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+
+class MarkerPass:
+    """
+    One pass through a file, sending lines to generators ("scanners") that
+    each wait for lines containing their own markers. The file is
+    memory-mapped and searched for the markers with `bytes.find`, a window
+    at a time, so lines without a marker are never decoded or looked at in
+    Python.
+
+    `scanners` is a list of (name, generator, markers), the markers being
+    strings. A generator is started with `next`, then sent each line
+    containing one of its markers with `line = yield`. Yielding True
+    instead, `line = yield True`, asks for the line after the last, whether
+    or not it holds a marker, which is how a section following a marker line
+    is read. At the end of the file it is sent None. The value it returns is
+    kept in `self.values`, as is any exception it raises.
+
+    The pass stops whenever `run` is told it is done, and carries on from
+    the same place the next time `run` is called:
+
+        >>> scan = MarkerPass('opt.log', scanners)
+        >>> scan.run(lambda: 'title' in scan.values)
+    """
+
+    WINDOW = 1 << 16
+    MAX_WINDOW = 1 << 24
+
+    def __init__(self, filename, scanners):
+        self.filename = filename
+        self.values = {}
+        # offset of the next line to be read, and of the end of the part of
+        # the file searched for markers so far; always the start of a line
+        self.position = 0
+        self.searched = 0
+        self.window = self.WINDOW
+        # [name, generator, markers, reading every line]
+        self._scanners = []
+        # offset of the next marker found in the searched part of the file,
+        # or None if there are no more before `self.searched`
+        self._hits = {}
+        for name, scanner, markers in scanners:
+            markers = tuple(marker.encode() for marker in markers)
+            try:
+                every_line = next(scanner)
+            except StopIteration as done:
+                self.values[name] = done.value
+                continue
+            except Exception as e:
+                self.values[name] = e
+                continue
+            self._scanners.append([name, scanner, markers, bool(every_line)])
+            for marker in markers:
+                self._hits[marker] = None
+
+    def __repr__(self):
+        return f'MarkerPass: {self.filename} at {self.position}'
+
+    @staticmethod
+    def _find(mm, marker, start, end):
+        """Offset of the first `marker` between start and end, or None"""
+        position = mm.find(marker, start, end)
+        return None if position == -1 else position
+
+    def _extend(self, mm):
+        """Searches the next window of the file for every marker"""
+        limit = mm.find(b'\n', self.searched + self.window)
+        limit = len(mm) if limit == -1 else limit + 1
+        for marker, hit in self._hits.items():
+            if hit is None:
+                self._hits[marker] = self._find(mm, marker, self.searched,
+                                                limit)
+        self.searched = limit
+        self.window = min(2 * self.window, self.MAX_WINDOW)
+
+    def _next_line(self, mm):
+        """Offset of the start of the next line to be read, or None at the end"""
+        while True:
+            if any(scanner[3] for scanner in self._scanners):
+                if self.position >= len(mm):
+                    return None
+                if self.position >= self.searched:
+                    self._extend(mm)
+                return self.position
+            hits = [hit for hit in self._hits.values() if hit is not None]
+            if hits:
+                return mm.rfind(b'\n', self.position, min(hits)) + 1 \
+                    or self.position
+            if self.searched >= len(mm):
+                return None
+            self._extend(mm)
+
+    def _send(self, scanner, line):
+        """Sends a line to a scanner, returning False once it has returned"""
+        try:
+            scanner[3] = bool(scanner[1].send(line))
+        except StopIteration as done:
+            self.values[scanner[0]] = done.value
+        except Exception as e:
+            self.values[scanner[0]] = e
+        else:
+            return True
+        return False
+
+    def _dispatch(self, mm, line, end):
+        """
+        Sends a line, ending at offset `end`, to the scanners waiting for it
+        and looks for the next occurrence of each marker it contains
+        """
+        found = [
+            marker for marker, hit in self._hits.items()
+            if hit is not None and hit < end
+        ]
+        for marker in found:
+            self._hits[marker] = self._find(mm, marker, end, self.searched)
+        remaining = []
+        for scanner in self._scanners:
+            waiting = scanner[3] or any(marker in found
+                                        for marker in scanner[2])
+            if not waiting or self._send(scanner, line):
+                remaining.append(scanner)
+        if len(remaining) != len(self._scanners):
+            self._scanners = remaining
+            markers = {marker for scanner in remaining for marker in scanner[2]}
+            self._hits = {
+                marker: hit
+                for marker, hit in self._hits.items() if marker in markers
+            }
+
+    def _finish(self):
+        """Sends None to every scanner still waiting, at the end of the file"""
+        for scanner in self._scanners:
+            if self._send(scanner, None):
+                raise RuntimeError(
+                    f'{self.filename}: scanner {scanner[0]} did not return at '
+                    'the end of the file')
+        self._scanners = []
+
+    def run(self, done):
+        """
+        Continues the pass until `done()` returns True, every scanner has
+        returned or the end of the file is reached
+        """
+        if not self._scanners or done():
+            return
+        with mapped_file(self.filename) as mm:
+            while self._scanners and not done():
+                start = None if mm is None else self._next_line(mm)
+                if start is None:
+                    self._finish()
+                    break
+                end = mm.find(b'\n', start) + 1 or len(mm)
+                try:
+                    line = mm[start:end].decode('utf-8')
+                except UnicodeDecodeError:
+                    # as with read_file, a line that cannot be decoded ends
+                    # the file
+                    self._finish()
+                    break
+                self._dispatch(mm, line, end)
+                self.position = end
@@ -0,0 +1,140 @@
+from .scan import mapped_file
+
+__all__ = ['SectionIndex']
+
+
+class SectionIndex:
+    """
+    Byte offsets of the lines of a file containing given markers, so that a
+    section of a large output file can be read by seeking straight to it
+    rather than reading every line before it.
+
+    `markers` is a dictionary of {name: marker}. The file is memory-mapped
+    and only searched for a marker when its section is first needed. The
+    last occurrence of a marker, usually all that is wanted from the end of
+    an output file, is found searching backwards from the end of the file
+    with `bytes.rfind`; every occurrence is found with `bytes.find`:
+
+        >>> index = SectionIndex('opt.log', {'modes': 'MODE FREQ(CM**-1)'})
+        >>> for line in index.lines('modes'):  # from the last occurrence
+        ...     print(line)
+
+    If a |ResultsCache| is passed as `cache`, every occurrence of a marker
+    found is stored in it, keyed by the marker and the size and modification
+    time of the file, and used instead of searching again while the file is
+    unchanged.
+    """
+
+    def __init__(self, filename, markers, cache=None):
+        self.filename = filename
+        self.markers = markers
+        self.cache = cache
+        self._offsets = {}
+
+    def __repr__(self):
+        return f'SectionIndex: {self.filename}'
+
+    def __contains__(self, name):
+        return self.last(name) is not None
+
+    def offsets(self, name):
+        """
+        Offsets of the start of every line containing the marker `name`,
+        searching the whole file the first time they are needed, unless
+        they are stored in `cache`
+        """
+        if name not in self._offsets:
+            if self.cache is None:
+                self._offsets[name] = self._search(name)
+            else:
+                kind = f'{self.__class__.__name__}({self.markers[name]!r})'
+                stored, stamps = self.cache.lookup([self.filename], kind)
+                if self.filename in stored:
+                    self._offsets[name] = stored[self.filename]
+                else:
+                    self._offsets[name] = self._search(name)
+                    self.cache.store([(self.filename, self._offsets[name])],
+                                     kind, stamps)
+        return self._offsets[name]
+
+    def _search(self, name):
+        """Offsets of every line containing the marker `name`, from the file"""
+        found = []
+        marker = self.markers[name].encode()
+        with mapped_file(self.filename) as mm:
+            position = -1 if mm is None else mm.find(marker)
+            while position != -1:
+                start = mm.rfind(b'\n', 0, position) + 1
+                if not found or found[-1] != start:
+                    found.append(start)
+                position = mm.find(marker, position + len(marker))
+        return found
+
+    def _backwards(self, name):
+        """
+        Generator yielding the offset of every line containing the marker
+        `name`, from the last to the first, searching back from the end of
+        the file only as far as needed
+        """
+        if name in self._offsets:
+            yield from reversed(self._offsets[name])
+            return
+        marker = self.markers[name].encode()
+        with mapped_file(self.filename) as mm:
+            position = -1 if mm is None else mm.rfind(marker)
+            while position != -1:
+                start = mm.rfind(b'\n', 0, position) + 1
+                yield start
+                position = mm.rfind(marker, 0, start)
+
+    def last(self, name):
+        """
+        Offset of the start of the last line containing the marker `name`,
+        or None if it is not in the file
+        """
+        return next(self._backwards(name), None)
+
+    def lines(self, name, occurrence=-1):
+        """
+        Generator yielding the lines of the file, starting from the line of
+        `occurrence` of the marker `name` and continuing to the end of the
+        file unless stopped. Yields nothing if the marker was not found.
+        """
+        if occurrence == -1:
+            offset = self.last(name)
+        else:
+            found = self.offsets(name)
+            offset = found[occurrence] if found else None
+        if offset is not None:
+            yield from self.read_from(offset)
+
+    def read_from(self, offset):
+        """
+        Generator yielding the lines of the file from byte `offset`, which
+        should be the start of a line, to the end of the file
+        """
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    yield line.decode('utf-8')
+                except UnicodeDecodeError:
+                    return
+
+    def matching_lines(self, name, backwards=True):
+        """
+        Generator yielding every line containing the marker `name`, from the
+        last to the first, or from the first to the last if `backwards` is
+        False
+        """
+        if backwards:
+            offsets = self._backwards(name)
+        else:
+            offsets = self.offsets(name)
+        with open(self.filename, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                try:
+                    yield f.readline().decode('utf-8')
+                except UnicodeDecodeError:
+                    continue
@@ -1,4 +1,6 @@
 from os.path import (join, dirname)
+from copy import deepcopy
+from functools import lru_cache
 import json
 from .utils import remove_nones_from_dict
 
@@ -122,16 +124,22 @@ class Settings(dict):
     __repr__ = __str__
 
 
+@lru_cache(maxsize=None)
+def _load_template(template):
+    """Reads a json template once per process"""
+    path = join(dirname(__file__), '..', 'templates')
+    file = join(path, template)
+    with open(file, "r") as f:
+        return json.load(f)
+
+
 def read_template(template):
     """
     Obtains default parameters for input files of different packages, and returns them as a |Settings| object. 
-    Currently GAMESS and PSI4 are supported
+    Currently GAMESS and PSI4 are supported. Each template is only read from disk once; every call
+    returns a new copy, so the defaults can be changed freely.
     """
-    path = join(dirname(__file__), '..', 'templates')
-    file = join(path, template)
-    with open(file, "r") as f:
-        tmp = json.load(f)
-    return dict_to_settings(tmp)
+    return dict_to_settings(deepcopy(_load_template(template)))
 
 
 def dict_to_settings(d):
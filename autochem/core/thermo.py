@@ -1,12 +1,177 @@
 from .atom import Atom
+from .periodic_table import PeriodicTable as PT
 from .utils import read_file, write_csv_from_dict
+import numpy as np
 import os
 from glob import glob
 import re
 import subprocess
 import sys
-
-__all__ = ['thermo_data', 'freq_data_gamess', 'freq_data_gauss']
+import tempfile
+
+__all__ = [
+    'Rotor', 'Thermochemistry', 'freq_data_gamess', 'freq_data_gauss',
+    'fortran_thermo_data', 'thermo_data'
+]
+
+THERMO_EXE = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                          'thermo.exe')
+
+# files read and written by thermo.exe, in the directory it is run in
+THERMO_FILES = ('geom.input', 'freq.out', 'fort.10', 'moments')
+
+# constants as used by thermo.f, in SI units unless stated
+BOLTZMANN = 1.380658e-23
+GAS_CONSTANT = 8.31441  # J/(mol K)
+PLANCK = 6.6260755e-34
+LIGHT_SPEED = 2.99792458e10  # cm/s
+AMU = 1.6605402e-27  # kg
+ATMOSPHERE = 101325.0  # Pa
+HARTREE_TO_KJ = 2625.5
+CAL_TO_J = 4.184
+
+# IUPAC masses used by thermo.f; other elements use |PeriodicTable|
+MASSES = {
+    1: 1.00794, 2: 4.002602, 3: 6.941, 4: 9.012182, 5: 10.811, 6: 12.0107,
+    7: 14.0067, 8: 15.9994, 9: 18.9984032, 10: 20.1797, 11: 22.989770,
+    12: 24.3050, 13: 26.981538, 14: 28.0855, 15: 30.973761, 16: 32.065,
+    17: 35.453, 18: 39.948, 32: 72.64, 50: 118.71
+}
+
+# Pitzer and Gwinn tables for a hindered internal rotor: enthalpy/T and
+# entropy in cal/(mol K), for each value of 1/Qf (rows) and V/RT (columns)
+PITZER_V = np.array([
+    0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0, 6.0,
+    7.0, 8.0, 9.0, 10.0, 12.0, 14.0, 16.0, 18.0, 20.0
+])
+PITZER_Q = np.array([
+    0.0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.35, 0.4, 0.45, 0.5, 0.55, 0.6,
+    0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95
+])
+PITZER_H = np.array([
+    [0.994, 1.1822, 1.3513, 1.5011, 1.6324, 1.746, 1.9607, 2.0934,
+     2.1657, 2.1971, 2.203, 2.1944, 2.1788, 2.1607, 2.1261, 2.0984,
+     2.0781, 2.0634, 2.0526, 2.0382, 2.0292, 2.0229, 2.0182, 2.0147],
+    [0.994, 1.142, 1.3, 1.437, 1.556, 1.66, 1.856, 1.971,
+     2.031, 2.049, 2.043, 2.024, 1.998, 1.971, 1.918, 1.875,
+     1.84, 1.811, 1.787, 1.749, 1.717, 1.69, 1.666, 1.646],
+    [0.994, 1.106, 1.249, 1.374, 1.482, 1.576, 1.753, 1.854,
+     1.9, 1.909, 1.893, 1.864, 1.829, 1.794, 1.727, 1.67,
+     1.623, 1.583, 1.548, 1.492, 1.441, 1.401, 1.363, 1.329],
+    [0.994, 1.074, 1.2, 1.311, 1.411, 1.495, 1.654, 1.742,
+     1.779, 1.777, 1.753, 1.715, 1.673, 1.631, 1.552, 1.484,
+     1.427, 1.379, 1.335, 1.264, 1.202, 1.15, 1.102, 1.061],
+    [0.994, 1.05, 1.151, 1.251, 1.34, 1.418, 1.561, 1.636,
+     1.662, 1.651, 1.621, 1.577, 1.529, 1.481, 1.392, 1.315,
+     1.251, 1.196, 1.147, 1.067, 0.997, 0.937, 0.886, 0.841],
+    [0.994, 1.032, 1.106, 1.19, 1.272, 1.344, 1.472, 1.536,
+     1.55, 1.535, 1.497, 1.448, 1.394, 1.344, 1.247, 1.164,
+     1.095, 1.035, 0.982, 0.896, 0.823, 0.76, 0.707, 0.66],
+    [0.994, 1.022, 1.073, 1.138, 1.211, 1.275, 1.385, 1.44,
+     1.448, 1.426, 1.382, 1.329, 1.273, 1.218, 1.115, 1.029,
+     0.955, 0.892, 0.838, 0.745, 0.672, 0.613, 0.561, 0.515],
+    [0.994, 1.015, 1.051, 1.099, 1.157, 1.211, 1.306, 1.35,
+     1.351, 1.321, 1.275, 1.221, 1.162, 1.104, 0.999, 0.908,
+     0.833, 0.768, 0.715, 0.624, 0.551, 0.493, 0.443, 0.399],
+    [0.994, 1.008, 1.036, 1.072, 1.114, 1.155, 1.23, 1.265,
+     1.26, 1.224, 1.176, 1.121, 1.061, 1.002, 0.893, 0.802,
+     0.725, 0.661, 0.608, 0.519, 0.45, 0.394, 0.347, 0.307],
+    [0.994, 1.004, 1.025, 1.049, 1.077, 1.106, 1.164, 1.19,
+     1.179, 1.14, 1.088, 1.03, 0.968, 0.909, 0.799, 0.708,
+     0.631, 0.569, 0.515, 0.431, 0.365, 0.314, 0.271, 0.236],
+    [0.994, 1.0, 1.015, 1.03, 1.048, 1.065, 1.103, 1.12,
+     1.104, 1.06, 1.006, 0.947, 0.884, 0.824, 0.714, 0.624,
+     0.549, 0.488, 0.437, 0.356, 0.295, 0.249, 0.211, 0.181],
+    [0.994, 0.996, 1.006, 1.014, 1.026, 1.038, 1.059, 1.057,
+     1.032, 0.988, 0.933, 0.872, 0.81, 0.75, 0.644, 0.554,
+     0.48, 0.421, 0.37, 0.296, 0.24, 0.198, 0.164, 0.138],
+    [0.994, 0.994, 0.999, 1.004, 1.009, 1.014, 1.019, 1.005,
+     0.972, 0.924, 0.868, 0.806, 0.744, 0.685, 0.58, 0.491,
+     0.42, 0.363, 0.314, 0.244, 0.195, 0.157, 0.128, 0.105],
+    [0.994, 0.994, 0.994, 0.995, 0.996, 0.996, 0.987, 0.962,
+     0.922, 0.87, 0.811, 0.749, 0.687, 0.628, 0.523, 0.437,
+     0.368, 0.312, 0.269, 0.202, 0.158, 0.127, 0.099, 0.08],
+    [0.994, 0.994, 0.992, 0.99, 0.984, 0.982, 0.962, 0.928,
+     0.882, 0.828, 0.765, 0.701, 0.638, 0.58, 0.476, 0.392,
+     0.326, 0.273, 0.231, 0.17, 0.127, 0.098, 0.077, 0.061],
+    [0.994, 0.992, 0.99, 0.987, 0.98, 0.972, 0.945, 0.904,
+     0.85, 0.791, 0.727, 0.661, 0.599, 0.54, 0.437, 0.354,
+     0.29, 0.24, 0.2, 0.143, 0.103, 0.076, 0.06, 0.047],
+    [0.994, 0.992, 0.988, 0.984, 0.976, 0.965, 0.932, 0.886,
+     0.827, 0.763, 0.697, 0.63, 0.567, 0.508, 0.406, 0.324,
+     0.261, 0.211, 0.174, 0.121, 0.084, 0.061, 0.047, 0.036],
+    [0.994, 0.991, 0.988, 0.982, 0.974, 0.962, 0.922, 0.873,
+     0.811, 0.744, 0.676, 0.609, 0.545, 0.485, 0.383, 0.302,
+     0.239, 0.191, 0.154, 0.104, 0.072, 0.051, 0.036, 0.028],
+    [0.994, 0.99, 0.986, 0.98, 0.972, 0.96, 0.916, 0.864,
+     0.801, 0.732, 0.663, 0.595, 0.531, 0.47, 0.368, 0.286,
+     0.223, 0.176, 0.14, 0.091, 0.062, 0.044, 0.029, 0.022],
+    [0.994, 0.989, 0.985, 0.979, 0.971, 0.959, 0.915, 0.86,
+     0.796, 0.728, 0.659, 0.59, 0.526, 0.465, 0.361, 0.279,
+     0.215, 0.168, 0.132, 0.084, 0.056, 0.038, 0.026, 0.018],
+])
+PITZER_S = np.array([
+    [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+     0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+     0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    [6.946, 6.941, 6.926, 6.902, 6.869, 6.828, 6.694, 6.529,
+     6.347, 6.163, 5.982, 5.813, 5.657, 5.515, 5.272, 5.072,
+     4.906, 4.766, 4.643, 4.438, 4.27, 4.127, 4.003, 3.892],
+    [5.569, 5.565, 5.551, 5.526, 5.492, 5.452, 5.319, 5.154,
+     4.975, 4.792, 4.612, 4.443, 4.289, 4.148, 3.907, 3.709,
+     3.545, 3.406, 3.285, 3.084, 2.919, 2.781, 2.659, 2.552],
+    [4.763, 4.759, 4.745, 4.72, 4.688, 4.648, 4.515, 4.353,
+     4.178, 3.995, 3.819, 3.652, 3.498, 3.359, 3.12, 2.926,
+     2.765, 2.629, 2.511, 2.316, 2.156, 2.023, 1.908, 1.807],
+    [4.192, 4.188, 4.174, 4.152, 4.12, 4.08, 3.95, 3.79,
+     3.615, 3.435, 3.263, 3.098, 2.948, 2.812, 2.576, 2.385,
+     2.23, 2.097, 1.984, 1.798, 1.645, 1.518, 1.411, 1.32],
+    [3.748, 3.743, 3.73, 3.709, 3.679, 3.638, 3.512, 3.355,
+     3.18, 3.008, 2.838, 2.678, 2.528, 2.396, 2.166, 1.983,
+     1.83, 1.703, 1.593, 1.417, 1.275, 1.157, 1.058, 0.975],
+    [3.386, 3.382, 3.37, 3.347, 3.318, 3.279, 3.156, 3.004,
+     2.836, 2.667, 2.5, 2.343, 2.199, 2.068, 1.844, 1.665,
+     1.519, 1.397, 1.295, 1.125, 0.994, 0.89, 0.801, 0.727],
+    [3.079, 3.076, 3.065, 3.043, 3.013, 2.974, 2.854, 2.709,
+     2.548, 2.38, 2.18, 2.069, 1.926, 1.798, 1.585, 1.411,
+     1.272, 1.156, 1.06, 0.904, 0.783, 0.688, 0.609, 0.542],
+    [2.814, 2.811, 2.801, 2.78, 2.75, 2.714, 2.6, 2.458,
+     2.303, 2.138, 1.978, 1.834, 1.698, 1.579, 1.37, 1.204,
+     1.071, 0.962, 0.872, 0.728, 0.62, 0.533, 0.464, 0.405],
+    [2.58, 2.578, 2.568, 2.547, 2.519, 2.485, 2.376, 2.241,
+     2.091, 1.933, 1.782, 1.643, 1.511, 1.392, 1.192, 1.033,
+     0.906, 0.804, 0.719, 0.588, 0.492, 0.414, 0.353, 0.303],
+    [2.371, 2.369, 2.359, 2.34, 2.315, 2.279, 2.173, 2.048,
+     1.907, 1.756, 1.61, 1.475, 1.348, 1.233, 1.04, 0.891,
+     0.77, 0.674, 0.596, 0.476, 0.388, 0.322, 0.27, 0.228],
+    [2.182, 2.18, 2.17, 2.151, 2.125, 2.094, 1.997, 1.874,
+     1.739, 1.576, 1.458, 1.328, 1.209, 1.097, 0.915, 0.774,
+     0.66, 0.57, 0.496, 0.388, 0.309, 0.251, 0.205, 0.17],
+    [2.009, 2.003, 1.996, 1.98, 1.957, 1.928, 1.833, 1.718,
+     1.589, 1.456, 1.323, 1.199, 1.086, 0.982, 0.808, 0.672,
+     0.566, 0.483, 0.414, 0.315, 0.247, 0.196, 0.158, 0.129],
+    [1.85, 1.848, 1.837, 1.823, 1.8, 1.744, 1.685, 1.578,
+     1.456, 1.33, 1.206, 1.087, 0.978, 0.881, 0.715, 0.588,
+     0.486, 0.407, 0.348, 0.255, 0.196, 0.155, 0.121, 0.097],
+    [1.703, 1.701, 1.691, 1.677, 1.654, 1.629, 1.552, 1.45,
+     1.335, 1.217, 1.1, 0.988, 0.884, 0.794, 0.637, 0.516,
+     0.422, 0.35, 0.293, 0.213, 0.157, 0.119, 0.093, 0.073],
+    [1.567, 1.563, 1.555, 1.541, 1.523, 1.499, 1.428, 1.332,
+     1.224, 1.114, 1.004, 0.901, 0.804, 0.716, 0.568, 0.453,
+     0.366, 0.3, 0.248, 0.176, 0.126, 0.092, 0.072, 0.056],
+    [1.438, 1.433, 1.428, 1.415, 1.399, 1.377, 1.31, 1.224,
+     1.126, 1.021, 0.919, 0.821, 0.73, 0.648, 0.509, 0.401,
+     0.32, 0.258, 0.211, 0.146, 0.1, 0.075, 0.056, 0.042],
+    [1.316, 1.312, 1.307, 1.295, 1.284, 1.262, 1.201, 1.122,
+     1.031, 0.936, 0.841, 0.748, 0.662, 0.588, 0.457, 0.357,
+     0.281, 0.223, 0.18, 0.122, 0.084, 0.059, 0.042, 0.032],
+    [1.203, 1.196, 1.193, 1.184, 1.171, 1.153, 1.094, 1.024,
+     0.942, 0.855, 0.769, 0.683, 0.607, 0.535, 0.412, 0.319,
+     0.248, 0.195, 0.154, 0.101, 0.069, 0.048, 0.034, 0.024],
+    [1.097, 1.091, 1.085, 1.076, 1.068, 1.052, 1.0, 0.936,
+     0.86, 0.779, 0.703, 0.623, 0.551, 0.486, 0.372, 0.285,
+     0.22, 0.171, 0.134, 0.084, 0.056, 0.038, 0.026, 0.018],
+])
 
 
 def get_filetype(file):
@@ -20,33 +185,34 @@ def get_filetype(file):
             return 'gauss'
 
 
-def write_geom_input(atoms):
+def write_geom_input(atoms, directory='.'):
     """
-    Writes 'geom.input' from the list of |Atom| objects passed in.
+    Writes 'geom.input' to `directory` from the list of |Atom| objects
+    passed in.
     """
-    with open('geom.input', 'w') as new:
+    with open(os.path.join(directory, 'geom.input'), 'w') as new:
         for atom in atoms:
             new.write(
                 f"{atom.symbol:5s} {int(atom.atnum):3} {atom.x:>15.10f} {atom.y:>15.10f} {atom.z:>15.10f} \n"
             )
 
 
-def write_freq_out_file(results):
+def write_freq_out_file(results, directory='.'):
     """
-    Writes freq.out using the frequencies of the `results` dictionary.
-    Note all of the list is written to the file, so any removal of 
-    rotations and translations must occur before using this function.
+    Writes freq.out to `directory` using the frequencies of the `results`
+    dictionary. Note all of the list is written to the file, so any removal
+    of rotations and translations must occur before using this function.
     """
-    with open("freq.out", "w") as output:
+    with open(os.path.join(directory, "freq.out"), "w") as output:
         for i in results['Frequencies [cm-1]']:
             output.write(f"{i:.3f}\n")
 
 
-def thermo_initial_geom_gamess(file):
+def initial_geom_gamess(file):
     """
-    Parses GAMESS output for the initial geometry.
-    Takes the nuclear coordinates from the 'coord 0 vib 0' run,
-    and converts from Bohrs to angstroms.
+    Parses GAMESS output for the initial geometry, returning a list of
+    |Atom| objects. Takes the nuclear coordinates from the 'coord 0 vib 0'
+    run, and converts from Bohrs to angstroms.
     """
     atoms = []
     BOHR_TO_ANG = 0.529177
@@ -61,7 +227,12 @@ def thermo_initial_geom_gamess(file):
             _, sym, x, y, z = line.split()
             x, y, z = map(lambda v: float(v) * BOHR_TO_ANG, (x, y, z))
             atoms.append(Atom(symbol=sym, coords=(x, y, z)))
-    write_geom_input(atoms)
+    return atoms
+
+
+def thermo_initial_geom_gamess(file, directory='.'):
+    """Writes 'geom.input' from the initial geometry of a GAMESS log"""
+    write_geom_input(initial_geom_gamess(file), directory)
 
 
 def rm_additional_rots_and_trans(results):
@@ -74,11 +245,12 @@ def rm_additional_rots_and_trans(results):
     return results
 
 
-def thermo_initial_geom_gauss(file):
+def initial_geom_gauss(file):
     """
     Parses Gaussian frequency calculation log file for the initial 
-    geometry. Note that coordinates here are stored in .job files by     
-    default. Only works with xyz coordinates, not z-matrices.
+    geometry, returning a list of |Atom| objects. Note that coordinates
+    here are stored in .job files by default. Only works with xyz
+    coordinates, not z-matrices.
     """
     atoms = []
     regex = '\s+[A-z]{1,2}(\s+-?[0-9]+\.[0-9]+){3}'
@@ -93,8 +265,12 @@ def thermo_initial_geom_gauss(file):
             sym, x, y, z = line.split()
             x, y, z = map(float, (x, y, z))
             atoms.append(Atom(symbol=sym, coords=(x, y, z)))
+    return atoms
+
 
-    write_geom_input(atoms)
+def thermo_initial_geom_gauss(file, directory='.'):
+    """Writes 'geom.input' from the initial geometry of a Gaussian log"""
+    write_geom_input(initial_geom_gauss(file), directory)
 
 
 def freq_data_gamess(file):
@@ -125,9 +301,7 @@ def freq_data_gamess(file):
         'Intensities [Debye^2/(amu Å^2)]': ints
     }  # keys used as headers for csv
 
-    results = rm_additional_rots_and_trans(results)
-    write_freq_out_file(results)
-    return results
+    return rm_additional_rots_and_trans(results)
 
 
 def freq_data_gauss(file):
@@ -150,31 +324,40 @@ def freq_data_gauss(file):
         'Intensities [Debye^2/(amu Å^2)]': ints
     }  # keys used as headers for csv
 
-    results = rm_additional_rots_and_trans(results)
-    write_freq_out_file(results)
-
-    return results
+    return rm_additional_rots_and_trans(results)
 
 
-def run(file, mult, temp):
+def run(file, mult, temp, directory='.', timeout=None):
     """
-    Calls thermo.exe with geom.input and freq.out written to the same 
-    directory.
+    Calls thermo.exe in `directory`, where geom.input and freq.out for
+    `file` have been written, answering its prompts through stdin. No shell
+    is used. Raises RuntimeError, with the output of thermo.exe, if it fails
+    or runs for longer than `timeout` seconds.
     """
-    thermo_exe = os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                              'thermo.exe')
-    p = subprocess.Popen(thermo_exe,
-                         shell=True,
-                         stdin=subprocess.PIPE,
-                         stdout=subprocess.PIPE,
-                         universal_newlines=True)
     newline = os.linesep
-    commands = ['y', 'y', 'y', mult, temp]
-    p.communicate(newline.join(commands))
-
-
-def read_fort():
-    with open('fort.10', 'r') as f:
+    commands = ['y', 'y', 'y', str(mult), str(temp)]
+    try:
+        p = subprocess.run([THERMO_EXE],
+                           cwd=directory,
+                           input=newline.join(commands) + newline,
+                           stdout=subprocess.PIPE,
+                           stderr=subprocess.STDOUT,
+                           universal_newlines=True,
+                           timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f'{file}: thermo.exe ran for over {timeout} s')
+    except OSError as error:
+        raise RuntimeError(f'{file}: could not run thermo.exe: {error}')
+    if p.returncode != 0 or not os.path.exists(
+            os.path.join(directory, 'fort.10')):
+        output = p.stdout.strip().splitlines()[-5:]
+        raise RuntimeError(
+            f'{file}: thermo.exe failed with exit code {p.returncode}: ' +
+            ' '.join(line.strip() for line in output))
+
+
+def read_fort(directory='.'):
+    with open(os.path.join(directory, 'fort.10'), 'r') as f:
         fort = [line for line in f.readlines()]
     return fort
 
@@ -201,35 +384,345 @@ def grep_data(fort):
     return data
 
 
-def cleanup():
-    os.system('rm fort.10 moments geom.input freq.out')
+def cleanup(directory='.'):
+    """Removes the files read and written by thermo.exe from `directory`"""
+    for name in THERMO_FILES:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            os.remove(path)
 
 
-def setup_and_run_fortran_script(file, mult, temp):
+def setup_and_run_fortran_script(file, mult, temp, directory='.',
+                                 timeout=None):
     """
-    Runs fortran script to produce 'fort.10' files etc...
+    Runs fortran script in `directory` to produce 'fort.10' files etc...
     """
     filetype = get_filetype(file)
     if filetype == 'gamess':
-        thermo_initial_geom_gamess(file)
-        freq_data_gamess(file)
-        run(file, mult, temp)
-    if filetype == 'gauss':
-        thermo_initial_geom_gauss(file)
-        freq_data_gauss(file)
-        run(file, mult, temp)
+        thermo_initial_geom_gamess(file, directory)
+        write_freq_out_file(freq_data_gamess(file), directory)
+    elif filetype == 'gauss':
+        thermo_initial_geom_gauss(file, directory)
+        write_freq_out_file(freq_data_gauss(file), directory)
+    else:
+        raise ValueError(f'{file}: not a GAMESS or Gaussian log file')
+    run(file, mult, temp, directory, timeout)
 
 
-def thermo_data(file, mult, temp):
+def fortran_thermo_data(file, mult, temp, timeout=None):
     """
     Uses a fortran script to produce thermochemical data for GAMESS 
     Hessian calculations and GAUSSIAN frequency calculations- the results 
     produced in the GAMESS files have been shown to be 
-    inaccurate. At < 300 cm⁻¹, rigid rotor fails, and the fortran code 
-    implements hindered rotor.
+    inaccurate. |Thermochemistry| does the same calculation in-process.
+
+    thermo.exe is run in a temporary directory of its own, removed
+    afterwards, so any number of files can be processed at once, i.e. by
+    the workers of |harvest|. Raises RuntimeError if thermo.exe fails or
+    runs for longer than `timeout` seconds.
     """
-    setup_and_run_fortran_script(file, mult, temp)
-    fort = read_fort()
-    data = grep_data(fort)
-    cleanup()
-    return data
+    with tempfile.TemporaryDirectory(prefix='thermo') as tmp:
+        setup_and_run_fortran_script(file, mult, temp, tmp, timeout)
+        return grep_data(read_fort(tmp))
+
+
+def thermo_data(file, mult, temp):
+    """
+    Returns thermochemical data for GAMESS Hessian calculations and
+    GAUSSIAN frequency calculations at `temp` K- the results produced in
+    the GAMESS files have been shown to be inaccurate. Calculated in-process
+    by |Thermochemistry|, with the same keys and values, as strings, as
+    |fortran_thermo_data|.
+    """
+    data = Thermochemistry.from_log(file, mult).evaluate(float(temp))
+    return {key: f'{value[0]:.5f}' for key, value in data.items()}
+
+
+class Rotor:
+    """
+    A low-frequency vibration treated as the internal rotation of two
+    fragments of a molecule about the line joining their centres of mass.
+
+    * ``mode`` -- position of the vibration in the frequencies given to
+      |Thermochemistry|, from zero
+    * ``atoms`` -- positions of the atoms of one of the fragments, from
+      zero; the other fragment is every other atom
+    * ``symmetry`` -- internal symmetry number of the rotation
+    * ``barrier`` -- barrier to rotation in hartrees
+    """
+
+    def __init__(self, mode, atoms, symmetry=1, barrier=0.0):
+        self.mode = mode
+        self.atoms = list(atoms)
+        self.symmetry = symmetry
+        self.barrier = barrier
+
+    def __repr__(self):
+        return f'Rotor: mode {self.mode}, {len(self.atoms)} atoms'
+
+
+def _interpolate_pitzer(table, inv_q, barrier):
+    """
+    Bilinear interpolation of a Pitzer and Gwinn table, for arrays of 1/Qf
+    and V/RT. Values outside the table are extrapolated from its edges.
+    """
+    i = np.clip(
+        np.searchsorted(PITZER_Q, inv_q, side='right') - 1, 0,
+        len(PITZER_Q) - 2)
+    j = np.clip(
+        np.searchsorted(PITZER_V, barrier, side='right') - 1, 0,
+        len(PITZER_V) - 2)
+    t = (inv_q - PITZER_Q[i]) / (PITZER_Q[i + 1] - PITZER_Q[i])
+    u = (barrier - PITZER_V[j]) / (PITZER_V[j + 1] - PITZER_V[j])
+    return ((1 - t) * (1 - u) * table[i, j] + t * (1 - u) * table[i + 1, j] +
+            t * u * table[i + 1, j + 1] + (1 - t) * u * table[i, j + 1])
+
+
+class Thermochemistry:
+    """
+    Ideal gas thermochemistry from a geometry and harmonic frequencies, as
+    calculated by thermo.exe, but in-process and for any number of
+    temperatures at once:
+
+        >>> thermo = Thermochemistry.from_log('water.log', mult=1)
+        >>> data = thermo.evaluate([273.15, 298.15, 373.15])
+        >>> data['S tot']
+        array([191.39448794, 194.32234142, 201.87914985])
+
+    Everything that does not depend on temperature (masses, moments of
+    inertia and vibrational temperatures) is worked out once, when created.
+    `evaluate` returns a dictionary of arrays with one value for each
+    temperature, and pressure if given:
+
+    * ``ZPVE``, ``TC`` and ``TC - TS`` in kJ/mol
+    * ``S elec``, ``S trans``, ``S rot``, ``S vib`` and ``S tot`` in J/(mol K)
+
+    Vibrations are harmonic oscillators; frequencies of zero or less are
+    ignored. Vibrations given as |Rotor| objects are also treated as free
+    and hindered rotors, the latter interpolated from the tables of Pitzer
+    and Gwinn, adding ``TC FR``, ``TC HR``, ``S vib FR``, ``S vib HR``,
+    ``S tot FR`` and ``S tot HR``.
+
+    Frequencies are scaled by `zpve_scale`, `tc_scale` and `s_scale` for the
+    ZPVE, thermal correction and vibrational entropy, and `symmetry` is the
+    rotational symmetry number, all 1 by default as used with thermo.exe.
+
+    `table` evaluates every combination of a set of temperatures and
+    pressures at once, giving one row for each:
+
+        >>> table = thermo.table(np.arange(200, 401, 25), [0.5, 1, 2])
+        >>> table['G corr']  # ZPVE + TC - TS, in kJ/mol
+    """
+
+    def __init__(self,
+                 symbols,
+                 coords,
+                 freqs,
+                 mult=1,
+                 rotors=(),
+                 zpve_scale=1.0,
+                 tc_scale=1.0,
+                 s_scale=1.0,
+                 symmetry=1):
+        self.symbols = np.asarray(symbols, dtype='<U3')
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        if len(self.symbols) == 0:
+            raise ValueError('Thermochemistry: no atoms given')
+        self.freqs = np.asarray(freqs, dtype=np.float64)
+        self.mult = int(mult)
+        self.rotors = list(rotors)
+        self.symmetry = symmetry
+
+        atnums = PT.get_atnums(self.symbols).tolist()
+        self.masses = np.array([MASSES.get(n, PT.masses[n]) for n in atnums])
+        self.mass = self.masses.sum()
+        self.moments = self.principal_moments()
+
+        # vibrational temperatures in K, scaled for each property
+        real = self.freqs > 0
+        theta = self.freqs[real] * LIGHT_SPEED * PLANCK / BOLTZMANN
+        self._theta_zpve = theta * zpve_scale
+        self._theta_tc = theta * tc_scale
+        self._theta_s = theta * s_scale
+
+        # position of the vibration of each rotor among the real vibrations
+        position = np.cumsum(real) - 1
+        for rotor in self.rotors:
+            if not real[rotor.mode]:
+                raise ValueError(
+                    f'Thermochemistry: mode {rotor.mode} is not a real vibration'
+                )
+        self._rotor_modes = np.array([position[r.mode] for r in self.rotors],
+                                     dtype=np.int64)
+        self._reduced = np.array(
+            [self.reduced_moment(r.atoms) for r in self.rotors])
+
+    def __repr__(self):
+        return (f'Thermochemistry: {len(self.symbols)} atoms, '
+                f'{len(self._theta_s)} vibrations')
+
+    @classmethod
+    def from_log(cls, file, mult=1, **kwargs):
+        """
+        Creates a |Thermochemistry| instance from the initial geometry and
+        the frequencies of a GAMESS hessian or Gaussian frequency log, as
+        passed to thermo.exe. Keyword arguments are passed on to
+        |Thermochemistry|.
+        """
+        filetype = get_filetype(file)
+        if filetype == 'gamess':
+            atoms = initial_geom_gamess(file)
+            freqs = freq_data_gamess(file)['Frequencies [cm-1]']
+        elif filetype == 'gauss':
+            atoms = initial_geom_gauss(file)
+            freqs = freq_data_gauss(file)['Frequencies [cm-1]']
+        else:
+            raise ValueError(f'{file}: not a GAMESS or Gaussian log file')
+        return cls([atom.symbol for atom in atoms],
+                   [atom.coords for atom in atoms], freqs, mult, **kwargs)
+
+    @property
+    def linear(self):
+        """Whether the atoms lie on a line, with no moment about it"""
+        if len(self.symbols) < 3:
+            return len(self.symbols) == 2
+        return self.moments[0] < 1e-5 * self.moments[2]
+
+    def principal_moments(self):
+        """Principal moments of inertia in amu Å², smallest first"""
+        centre = self.masses @ self.coords / self.mass
+        r = self.coords - centre
+        tensor = np.eye(3) * (self.masses * (r**2).sum(axis=1)).sum()
+        tensor -= (self.masses[:, None] * r).T @ r
+        return np.linalg.eigvalsh(tensor)
+
+    def reduced_moment(self, atoms):
+        """
+        Reduced moment of inertia in amu Å² for the rotation of the atoms at
+        positions `atoms` against the rest of the molecule, about the line
+        joining the centres of mass of the two fragments
+        """
+        first = np.zeros(len(self.symbols), dtype=bool)
+        first[atoms] = True
+        if first.all() or not first.any():
+            raise ValueError('Thermochemistry: a rotor needs two fragments')
+        parts = (first, ~first)
+        centres = [
+            self.masses[part] @ self.coords[part] / self.masses[part].sum()
+            for part in parts
+        ]
+        axis = centres[1] - centres[0]
+        axis /= np.linalg.norm(axis)
+        tops = []
+        for part, centre in zip(parts, centres):
+            r = self.coords[part] - centre
+            distances = (r**2).sum(axis=1) - (r @ axis)**2
+            tops.append((self.masses[part] * distances).sum())
+        return tops[0] * tops[1] / (tops[0] + tops[1])
+
+    def _rotational(self, temps):
+        """Rotational entropy and thermal correction for each temperature"""
+        R = GAS_CONSTANT
+        if len(self.symbols) == 1:
+            return np.zeros_like(temps), np.zeros_like(temps)
+        # rotational temperatures in K, from the moments of inertia in kg m²
+        moments = self.moments * AMU * 1e-20
+        if self.linear:
+            theta = PLANCK**2 / (8 * np.pi**2 * BOLTZMANN * moments[2])
+            q = temps / (self.symmetry * theta)
+            return R * (np.log(q) + 1), R * temps / 1000
+        theta = PLANCK**2 / (8 * np.pi**2 * BOLTZMANN * moments)
+        q = np.sqrt(np.pi) / self.symmetry * temps**1.5 / np.sqrt(theta.prod())
+        return R * (np.log(q) + 1.5), 1.5 * R * temps / 1000
+
+    def evaluate(self, temps, pressures=1.0):
+        """
+        Returns a dictionary of arrays of thermochemical data, with one value
+        for each temperature in `temps`, in K, and pressure in `pressures`,
+        in atm. Temperatures and pressures are broadcast against each
+        other, so one pressure can be given for many temperatures.
+        """
+        R = GAS_CONSTANT
+        temps, pressures = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(temps, dtype=np.float64)),
+            np.asarray(pressures, dtype=np.float64))
+        t = temps[:, None]
+
+        with np.errstate(over='ignore'):
+            x = self._theta_s / t
+            s_vib = R * (x / np.expm1(x) - np.log(-np.expm1(-x)))
+            h_vib = R * self._theta_tc / np.expm1(self._theta_tc / t) / 1000
+        zpve = np.full(len(temps), R * self._theta_zpve.sum() * 0.5 / 1000)
+
+        q_trans = (2 * np.pi * self.mass * AMU * BOLTZMANN * temps /
+                   PLANCK**2)**1.5 * BOLTZMANN * temps / (ATMOSPHERE *
+                                                          pressures)
+        s_trans = R * (np.log(q_trans) + 2.5)
+        s_elec = np.full(len(temps), R * np.log(self.mult))
+        s_rot, tc_rot = self._rotational(temps)
+
+        tc = h_vib.sum(axis=1) + 2.5 * R * temps / 1000 + tc_rot
+        s_tot = s_elec + s_trans + s_rot + s_vib.sum(axis=1)
+        data = {
+            'ZPVE': zpve,
+            'TC': tc,
+            'S elec': s_elec,
+            'S trans': s_trans,
+            'S rot': s_rot,
+            'S vib': s_vib.sum(axis=1),
+            'S tot': s_tot,
+            'TC - TS': tc - temps * s_tot / 1000,
+        }
+        if self.rotors:
+            data.update(self._rotor_corrections(t, h_vib, s_vib, data))
+        return data
+
+    def table(self, temps, pressures=1.0):
+        """
+        Returns a dictionary of arrays of thermochemical data with one row
+        for every combination of `temps`, in K, and `pressures`, in atm,
+        evaluated at once. Along with the temperature, pressure and the data
+        of `evaluate`, gives ``G corr``, the correction to the electronic
+        energy for the Gibbs free energy: ZPVE + TC - TS, in kJ/mol.
+        """
+        temps, pressures = np.meshgrid(np.asarray(temps, dtype=np.float64),
+                                       np.asarray(pressures, dtype=np.float64),
+                                       indexing='ij')
+        table = {
+            'Temperature [K]': temps.ravel(),
+            'Pressure [atm]': pressures.ravel()
+        }
+        table.update(self.evaluate(temps.ravel(), pressures.ravel()))
+        table['G corr'] = table['ZPVE'] + table['TC - TS']
+        return table
+
+    def _rotor_corrections(self, t, h_vib, s_vib, data):
+        """
+        Thermal corrections and entropies with the vibrations of the rotors
+        replaced by free and by hindered rotors
+        """
+        R = GAS_CONSTANT
+        symmetry = np.array([rotor.symmetry for rotor in self.rotors])
+        barrier = np.array([rotor.barrier for rotor in self.rotors])
+
+        q_free = np.sqrt(8 * np.pi**3 * self._reduced * AMU * 1e-20 *
+                         BOLTZMANN * t) / (symmetry * PLANCK)
+        s_free = R * (np.log(q_free) + 0.5)
+        h_free = np.broadcast_to(0.5 * R * t / 1000, s_free.shape)
+
+        # free rotor partition function as used by Pitzer and Gwinn
+        inv_q = symmetry / (2.7935 * np.sqrt(self._reduced * t * 1.66035e-2))
+        v = barrier * HARTREE_TO_KJ * 1000 / (R * t)
+        h_hr = t * CAL_TO_J * _interpolate_pitzer(PITZER_H, inv_q, v) / 1000
+        s_hr = CAL_TO_J * _interpolate_pitzer(PITZER_S, inv_q, v)
+
+        h_ho = h_vib[:, self._rotor_modes]
+        s_ho = s_vib[:, self._rotor_modes]
+        corrections = {}
+        for name, h, s in (('FR', h_free, s_free), ('HR', h_hr, s_hr)):
+            corrections[f'TC {name}'] = data['TC'] + (h - h_ho).sum(axis=1)
+            corrections[f'S vib {name}'] = data['S vib'] + (s - s_ho).sum(
+                axis=1)
+            corrections[f'S tot {name}'] = data['S tot'] + (s - s_ho).sum(
+                axis=1)
+        return corrections
@@ -1,4 +1,5 @@
 import csv
+from functools import lru_cache
 import os
 import pandas as pd
 import re
@@ -6,6 +7,7 @@ import sys
 import time
 from .atom import Atom
 from .periodic_table import PeriodicTable as PT
+from .xyz import read_xyz_atoms
 
 __all__ = [
     "cd",
@@ -13,6 +15,7 @@ __all__ = [
     "consecutive",
     "df_from_namedtuples",
     "eof",
+    "format_xyz",
     "get_files",
     "get_log_type",
     "list_of_dicts_to_one_level_dict",
@@ -24,9 +27,11 @@ __all__ = [
     "search_dict_recursively",
     "sort_data",
     "sort_elements",
+    "substitute",
     "timeit",
     "write_csv_from_dict",
     "write_csv_from_nested",
+    "write_files",
     "write_geom_input_for_thermo",
     "write_xyz",
 ]
@@ -100,16 +105,35 @@ def get_log_type(file):
 
 def read_xyz(using):
     """Reads coordinates of an xyz file and return a list of |Atom| objects, one for each atom"""
-    coords = []
-    with open(using, "r") as f:
-        for coord in f.readlines()[2:]:
-            line = coord.split()
-            for val in PT.ptable.values():
-                if line[0] == val[0]:
-                    coords.append(
-                        Atom(line[0],
-                             coords=tuple(float(i) for i in line[1:4])))
-    return coords
+    symbols, coords = read_xyz_atoms(using)
+    return [
+        Atom(sym, coords=xyz)
+        for sym, xyz in zip(symbols.tolist(), coords.tolist())
+    ]
+
+
+def format_xyz(atoms, decimals=10):
+    """
+    Returns the contents of an xyz file for a list of |Atom| instances, or just a list of regular
+    coordinates, with or without atomic numbers, with coordinates given to `decimals` places.
+    """
+    width = decimals + 5
+    lines = [str(len(atoms)) + "\n\n"]
+    for atom in atoms:
+        if not isinstance(atom, Atom):
+            parts = atom.split()
+            if len(parts) > 4:  # includes atomic nums
+                sym, *_, x, y, z = parts
+            else:
+                sym, x, y, z = parts
+            x, y, z = float(x), float(y), float(z)
+            lines.append(f"{sym:5s} {x:>{width}.{decimals}f} {y:{width}.{decimals}f} {z:{width}.{decimals}f} \n")
+        else:
+            lines.append(
+                f"{atom.symbol:5s} {atom.x:>{width}.{decimals}f} {atom.y:>{width}.{decimals}f} "
+                f"{atom.z:>{width}.{decimals}f} \n"
+            )
+    return "".join(lines)
 
 
 def write_xyz(atoms, filename=None):
@@ -121,21 +145,41 @@ def write_xyz(atoms, filename=None):
         raise ValueError("write_xyz: Must give a path to the output file")
     else:
         with open(filename, "w") as file:
-            file.write(str(len(atoms)) + "\n\n")
-            for atom in atoms:
-                if type(atom) is not Atom:
-                    parts = atom.split()
-                    if len(parts) > 4:  # includes atomic nums
-                        sym, *_, x, y, z = parts
-                    else:
-                        sym, x, y, z = parts
-                    x, y, z = float(x), float(y), float(z)
-                    file.write(
-                        f"{sym:5s} {x:>15.10f} {y:15.10f} {z:15.10f} \n")
-                else:
-                    file.write(
-                        f"{atom.symbol:5s} {atom.x:>15.10f} {atom.y:>15.10f} {atom.z:>15.10f} \n"
-                    )
+            file.write(format_xyz(atoms))
+
+
+def write_files(files, directory="."):
+    """
+    Writes {path: contents} to files, with paths relative to `directory`. Every subdirectory
+    needed is created first, so a whole directory tree of inputs can be rendered in memory and
+    written in one go.
+    """
+    for subdir in sorted({os.path.dirname(path) for path in files}):
+        os.makedirs(os.path.join(directory, subdir), exist_ok=True)
+    for path, contents in files.items():
+        with open(os.path.join(directory, path), "w") as f:
+            f.write(contents)
+
+
+@lru_cache(maxsize=None)
+def _substitution_pattern(keys):
+    """Compiles a pattern matching any of `keys`, trying the longest first"""
+    return re.compile("|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True)))
+
+
+def substitute(text, replacements):
+    """
+    Replaces every occurrence of each key of `replacements` in `text` with its value, in a
+    single pass, so a replacement is never itself replaced by a later key. Where keys overlap,
+    the longest match is used. Used to fill in job templates:
+
+        >>> substitute(job, {"name": "opt", "24:00:00": "12:00:00"})
+    """
+    replacements = {old: new for old, new in replacements.items() if old != new}
+    if not replacements:
+        return text
+    pattern = _substitution_pattern(tuple(sorted(replacements)))
+    return pattern.sub(lambda match: replacements[match.group(0)], text)
 
 
 def get_files(directory, ext, filepath_includes=None):
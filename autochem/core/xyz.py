@@ -0,0 +1,248 @@
+from .atom import Atom
+from .atom_array import AtomArray
+from .periodic_table import PeriodicTable as PT
+
+import mmap
+import os
+import numpy as np
+
+__all__ = [
+    'XYZFrame', 'XYZTrajectory', 'read_frames', 'read_xyz_atoms', 'write_frames'
+]
+
+
+def _parse_atom_rows(rows):
+    """
+    Converts a list of split atom lines into an array of symbols and an (N, 3)
+    array of coordinates. Lines with extra columns (charges, velocities and
+    so on) keep only the symbol and x, y, z.
+    """
+    if not rows:
+        return np.empty(0, dtype='<U3'), np.empty((0, 3), dtype=np.float64)
+    if any(len(row) != 4 for row in rows):
+        rows = [row[:4] for row in rows]
+    block = np.array(rows)
+    return block[:, 0].astype('<U3'), block[:, 1:].astype(np.float64)
+
+
+def _line_starts(data, chunk_size=1 << 22):
+    """
+    Generator yielding an array of the offsets of the start of the lines of
+    each chunk of `chunk_size` bytes of `data`, after the first line. The
+    end of the data is given as the start of a line if it does not end with
+    a line break.
+    """
+    size = len(data)
+    for start in range(0, size, chunk_size):
+        chunk = np.frombuffer(data[start:start + chunk_size], dtype=np.uint8)
+        starts = np.flatnonzero(chunk == 10) + (start + 1)
+        if start + len(chunk) == size and chunk[-1] != 10:
+            starts = np.append(starts, size)
+        yield starts
+
+
+def read_xyz_atoms(using):
+    """
+    Reads every atom of an xyz file, skipping the two header lines and any
+    line not starting with an atomic symbol. Returns an array of symbols and
+    an (N, 3) array of coordinates; all coordinates are converted in one
+    NumPy call rather than one float at a time.
+    """
+    with open(using, "r") as f:
+        lines = f.read().splitlines()[2:]
+    rows = []
+    for line in lines:
+        line = line.split()
+        if line and line[0] in PT.atnums:
+            rows.append(line)
+    return _parse_atom_rows(rows)
+
+
+class XYZFrame:
+    """
+    A single frame of an xyz file or trajectory.
+
+    * ``symbols`` -- array of atomic symbols
+    * ``coords`` -- (N, 3) array of coordinates in angstroms
+    * ``comment`` -- the comment line of the frame
+    * ``index`` -- position of the frame in the trajectory, from zero
+
+    Atoms for a |Molecule| can be created from a frame:
+
+        >>> mol = Molecule(atoms=frame.atoms())
+        >>> mol = Molecule(atoms=frame.atom_array(), compact=True)
+    """
+
+    def __init__(self, symbols, coords, comment='', index=0):
+        self.symbols = symbols
+        self.coords = coords
+        self.comment = comment
+        self.index = index
+
+    def __repr__(self):
+        return f'XYZFrame {self.index}: {len(self)} atoms'
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def atoms(self):
+        """Returns a list of |Atom| objects, one for each atom"""
+        return [
+            Atom(sym, coords=coords)
+            for sym, coords in zip(self.symbols.tolist(), self.coords.tolist())
+        ]
+
+    def atom_array(self):
+        """Returns an |AtomArray| holding the atoms of the frame"""
+        return AtomArray(self.symbols, self.coords)
+
+
+class XYZTrajectory:
+    """
+    Reads xyz files containing one or more frames, each starting with a line
+    giving the number of atoms and a comment line. Frames are streamed one at
+    a time when iterating, so trajectories of any length can be analysed
+    without holding more than one frame in memory:
+
+        >>> for frame in XYZTrajectory('md.xyz'):
+        ...     mol = Molecule(atoms=frame.atoms())
+
+    Indexing reads a single frame, seeking straight to it. The byte offset of
+    every frame is found once, on first use, by walking from one frame header
+    to the next. If `use_mmap` is True the file is memory-mapped for the scan
+    and for reading frames, rather than read into memory.
+
+        >>> traj = XYZTrajectory('md.xyz', use_mmap=True)
+        >>> len(traj), traj[-1]
+    """
+
+    def __init__(self, filename, use_mmap=False):
+        self.filename = filename
+        self.use_mmap = use_mmap
+        self._offsets = None
+
+    def __repr__(self):
+        return f'XYZTrajectory: {self.filename}'
+
+    def __iter__(self):
+        with open(self.filename, "rb") as f:
+            index = 0
+            while True:
+                header = f.readline()
+                if not header.strip():
+                    break
+                num_atoms = int(header)
+                comment = f.readline()
+                lines = [f.readline() for _ in range(num_atoms)]
+                if num_atoms and not lines[-1]:
+                    raise ValueError(
+                        f'{self.filename}: frame {index} is incomplete')
+                yield self._frame(comment, b''.join(lines), num_atoms, index)
+                index += 1
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.frame(k) for k in range(*key.indices(len(self)))]
+        return self.frame(key)
+
+    def _frame(self, comment, block, num_atoms, index):
+        """Parses the atom lines of one frame"""
+        rows = [line.split() for line in block.decode().splitlines()]
+        symbols, coords = _parse_atom_rows(rows[:num_atoms])
+        return XYZFrame(symbols, coords, comment.decode().strip(), index)
+
+    def _scan(self, data):
+        """
+        Finds the byte offset of the start of every frame, walking from one
+        frame header to the next. Only the offsets of the lines of the chunk
+        being walked are held, so the scan needs little memory for any size
+        of file.
+        """
+        chunks = _line_starts(data)
+        # offsets of the start of lines, from line number `first`
+        starts = np.zeros(1, dtype=np.int64)
+        first = 0
+        offsets = []
+        line = 0
+        while True:
+            while line + 1 >= first + len(starts):
+                more = next(chunks, None)
+                if more is None:
+                    break
+                passed = min(line - first, len(starts))
+                starts = np.concatenate([starts[passed:], more])
+                first += passed
+            if line + 1 >= first + len(starts):
+                break
+            start = int(starts[line - first])
+            header = data[start:int(starts[line - first + 1])]
+            if not header.strip():
+                break
+            offsets.append(start)
+            line += int(header) + 2
+        if line >= first + len(starts):
+            raise ValueError(
+                f'{self.filename}: frame {len(offsets) - 1} is incomplete')
+        offsets.append(int(starts[line - first]))
+        return offsets
+
+    def _read(self, start, stop):
+        """Returns the bytes of the file from start to stop"""
+        with open(self.filename, "rb") as f:
+            if self.use_mmap:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return mm[start:stop]
+            f.seek(start)
+            return f.read(stop - start)
+
+    @property
+    def offsets(self):
+        """
+        Byte offsets of the start of every frame, followed by the offset of the
+        end of the last frame
+        """
+        if self._offsets is None:
+            with open(self.filename, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    self._offsets = [0]
+                elif self.use_mmap:
+                    with mmap.mmap(f.fileno(), 0,
+                                   access=mmap.ACCESS_READ) as mm:
+                        self._offsets = self._scan(mm)
+                else:
+                    self._offsets = self._scan(f.read())
+        return self._offsets
+
+    def frame(self, index):
+        """Returns frame `index`, counting from zero; negative indices count back from the end"""
+        num_frames = len(self)
+        if index < 0:
+            index += num_frames
+        if not 0 <= index < num_frames:
+            raise IndexError(f'{self.filename}: no frame {index}')
+        data = self._read(self.offsets[index], self.offsets[index + 1])
+        header, comment, block = data.split(b'\n', 2)
+        return self._frame(comment, block, int(header), index)
+
+
+def read_frames(filename):
+    """
+    Generator yielding every frame of an xyz trajectory as an |XYZFrame|
+    """
+    yield from XYZTrajectory(filename)
+
+
+def write_frames(frames, filename):
+    """
+    Writes |XYZFrame| objects one after another to a multi-frame xyz file,
+    with the comment of each frame on its second line
+    """
+    with open(filename, "w") as f:
+        for frame in frames:
+            f.write(f"{len(frame)}\n{frame.comment}\n")
+            for sym, (x, y, z) in zip(frame.symbols.tolist(),
+                                      frame.coords.tolist()):
+                f.write(f"{sym:5s} {x:>15.10f} {y:>15.10f} {z:>15.10f} \n")
@@ -4,10 +4,10 @@ from ..core.settings import Settings, read_template, dict_to_settings
 from ..core.job import Job
 from ..core.periodic_table import PeriodicTable as PT
 from ..core.sc import Supercomp
-from ..core.utils import consecutive, sort_elements, write_xyz
+from ..core.utils import sort_elements, substitute
 
-from os import chdir, mkdir, getcwd, system, walk, listdir
-from os.path import exists, join, dirname
+from os import makedirs
+from os.path import dirname
 
 __all__ = ["GamessJob"]
 
@@ -74,6 +74,8 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
 
     """
 
+    FRAGMENT_XYZ_DECIMALS = 10
+
     def __init__(
         self,
         using=None,
@@ -85,6 +87,9 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
         run_dir=None,
         keep=False,
         bonds_to_split=None,
+        mol=None,
+        in_memory=False,
+        directory=None,
     ):
         # Also read in bonds to split from settings object
         self.fmo = fmo  # Boolean
@@ -109,9 +114,15 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
         if bonds_to_split is None:
             if hasattr(self, "merged") and "bonds_to_split" in self.merged:
                 bonds_to_split = self.merged.bonds_to_split
-        if bonds_to_split is not None:
-            self.fragmenting_on_bonds = True
-        super().__init__(using, user_settings=settings, bonds_to_split=bonds_to_split)
+        self.fragmenting_on_bonds = bonds_to_split is not None
+        super().__init__(
+            using,
+            user_settings=settings,
+            bonds_to_split=bonds_to_split,
+            mol=mol,
+            in_memory=in_memory,
+            directory=directory,
+        )
 
         if "/" in using:
             # say using = ../xyz_files/file.xyz --> file
@@ -272,7 +283,7 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
 
     def fmo_meta(self):
         """Creates strings for the INDAT and ICHARG blocks of GAMESS FMO calculations, bound to the
-        molecule instance as self.indat and self.charg.
+        molecule instance as self.fmo_indat and self.fmo_charg.
         If all fragments are the same molecule, the fmo information required is much simpler,
         and this function will create a self.nacut value that is used to split the atoms into chunks of
         the size of the molecule included. Assumes that the atoms in the xyz file are included as
@@ -280,14 +291,28 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
         all of mol2
         all of mol3
         etc...
-        if all fragments are of the same molecule."""
+        if all fragments are of the same molecule.
+
+        Otherwise, fragments are numbered in order of their first atom, and INDAT is written in
+        the compressed format, where each fragment is given as ranges of atoms, i.e. 0,1,-7,9,
+        for atoms 1 to 7 and atom 9. Set ``sett.input.fmo.indat = 'uncompressed'`` to instead give
+        the fragment of every atom in turn, i.e. 1,1,1,1,1,1,1,2,1,. Both are made from one pass
+        over the atoms, so are quick to make for systems with thousands of fragments."""
+
+        # fragment each atom belongs to, checking that no atom is in two fragments
+        num_atoms = len(self.mol.coords)
+        atom_frags = [None] * (num_atoms + 1)  # atom indices start at 1
+        for frag, data in self.mol.fragments.items():
+            if frag != "ionic":
+                for atom in data["atoms"]:
+                    if atom_frags[atom.index] is not None:
+                        raise ValueError(
+                            f"Atom {atom.index} of {self.molecule_name} is in more than one fragment"
+                        )
+                    atom_frags[atom.index] = frag
 
         # check if all fragments are found
-        atoms_in_system = []
-        for data in self.mol.fragments.values():
-            for atom in data["atoms"]:
-                atoms_in_system.append(atom.index)
-        self.all_frags_known_to_autochem = len(atoms_in_system) == len(self.mol.coords)
+        self.all_frags_known_to_autochem = None not in atom_frags[1:]
         if not self.all_frags_known_to_autochem:
             if self.fragmenting_on_bonds:
                 print(
@@ -303,7 +328,8 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
         for data in self.mol.fragments.values():
             mols.append(data["name"].rsplit("_")[0])
         mols = list(set(mols))
-        self.all_frags_same = len(mols) == 1
+        # fragments made by splitting bonds are all named fragmented_<n>, but differ
+        self.all_frags_same = len(mols) == 1 and not self.fragmenting_on_bonds
         if self.all_frags_same and self.all_frags_known_to_autochem:
             self.nacut = len(Molecule.molecules.get(mols[0]))
             self.fmo_charg = [
@@ -314,116 +340,55 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
             ]
             # exit early if all molecules are the same
             return
-        info = {}
-        # group together indat and charge for each fragment, and order according
-        # to the atom indices of indat
-        for frag, data in self.mol.fragments.items():
-            if frag != "ionic":
-                if len(data["atoms"]) == 1:
-                    # should add to next fragment- wasteful to run on own node
-                    info[frag] = {
-                        "indat": f"0,{data['atoms'][0].index},-{data['atoms'][0].index},",
-                        "charg": str(data["charge"]),
-                        "mult": str(data["multiplicity"]),
-                    }
-                else:
-                    # check for consecutive numbers
-                    atom_indices = [atom.index for atom in data["atoms"]]
-                    if consecutive(atom_indices):
-                        indat_string = (
-                            f"0,{data['atoms'][0].index},-{data['atoms'][-1].index},"
-                        )
-                    else:
-                        # odd ordering, especially when fragmenting on a bond
-                        groups = []
-                        frags = []
-                        indices = [atom.index for atom in data["atoms"]]
-                        for i, atom_i in enumerate(indices):
-                            for j, atom_j in enumerate(indices):
-                                if j == i + 1:
-                                    # first item
-                                    if len(frags) == 0:
-                                        frags.append(atom_i)
-                                    if not consecutive([atom_i, atom_j]):
-                                        if frags[-1] == "-":
-                                            # end one fragment, start another
-                                            frags += [atom_i, atom_j]
-                                    # count back to see how many atoms are in 'current' fragment
-                                    count = 0
-                                    for val in frags[::-1]:
-                                        if val == "-":
-                                            count += 1
-                                        else:
-                                            break
-                                    if count == 0:
-                                        frags.append("-")
-                                    # at end
-                                    if j == len(indices) - 1:
-                                        frags.append(atom_j)
-
-                        # Algorithm above needs improving- if it worked properly,
-                        # there would be no need for the next two for loops
-
-                        # Check for 'single' atom parts i.e. 43, -, 43,
-                        # remove -, 43
-                        for i, val in enumerate(frags):
-                            if frags[i : i + 3] == [val, "-", val]:
-                                del frags[i + 1 : i + 3]
-                        # Check for consecutives like 46, -, 47, remove - from middle
-                        for i, val in enumerate(frags):
-                            try:
-                                if (
-                                    isinstance(frags[i], int)
-                                    and isinstance(frags[i + 1], str)
-                                    and isinstance(frags[i + 2], int)
-                                ):
-                                    if frags[i + 2] == val + 1:
-                                        del frags[i + 1]
-                            except IndexError:
-                                break
-                        groups.append(frags)
-
-                        indat_string = "0,"
-                        for group in groups:
-                            if len(group) == 1:
-                                indat_string += f"{group[0]},"
-                            else:
-                                # if '-', then add to next element
-                                for i, val in enumerate(group):
-                                    if val == "-":
-                                        group[i + 1] = f"-{group[i+1]}"
-                                        del group[i]
-                                group = map(str, group)
-                                indat_string += ",".join(group) + ","
-                    info[frag] = {
-                        "indat": indat_string,
-                        "charg": str(data["charge"]),
-                        "mult": str(data["multiplicity"]),
-                    }
-
-        # items need sorting
-        # 0,1,7, ### sort on 2nd item ###
-        # 0,8,28,
-        # 0,29,35,
-        # and not
-        # 0,1,7,
-        # 0,29,35,
-        # 0.8,28
-
-        sorted_info = sorted(
-            info.items(), key=lambda val: int(val[1]["indat"].split(",")[1])
-        )
-        # could also just sort on mol (or frag of info[frag]), from the assignments in self.split(), but these might not
-        # always be in a numerical order- by using the index from self.coords, it is always ensured that the
-        # correct order is shown, as these coords are also used in the input file
-        self.fmo_indat = []
-        self.fmo_charg = []
-        self.fmo_mult = []
-        for val in sorted_info:
-            self.fmo_indat.append(val[1]["indat"])
-            self.fmo_charg.append(val[1]["charg"])
-            self.fmo_mult.append(val[1]["mult"])
-        self.fmo_indat.append("0")
+
+        # ranges of consecutive atoms in each fragment, with fragments ordered by
+        # their first atom, as the coords are written in that order in the input file
+        ranges = {}
+        for index in range(1, num_atoms + 1):
+            frag = atom_frags[index]
+            if frag is None:
+                continue
+            if frag not in ranges:
+                ranges[frag] = [[index, index]]
+            elif ranges[frag][-1][1] == index - 1:
+                ranges[frag][-1][1] = index
+            else:
+                ranges[frag].append([index, index])
+
+        indat_format = self.input.fmo.indat if "indat" in self.input.fmo else "compressed"
+        if indat_format == "compressed":
+            self.fmo_indat = [
+                "0,"
+                + "".join(
+                    f"{start}," if start == end else f"{start},-{end},"
+                    for start, end in frag_ranges
+                )
+                for frag_ranges in ranges.values()
+            ]
+            self.fmo_indat.append("0")
+        elif indat_format == "uncompressed":
+            if not self.all_frags_known_to_autochem:
+                raise ValueError(
+                    "An uncompressed INDAT needs every atom to be in a known fragment"
+                )
+            numbers = {frag: str(num) for num, frag in enumerate(ranges, 1)}
+            # split over lines, to stay within the 80 columns read by GAMESS
+            self.fmo_indat = []
+            line = ""
+            for frag in atom_frags[1:]:
+                if len(line) + len(numbers[frag]) >= 60:
+                    self.fmo_indat.append(line)
+                    line = ""
+                line += f"{numbers[frag]},"
+            self.fmo_indat.append(line[:-1])
+        else:
+            raise ValueError(
+                f"sett.input.fmo.indat must be 'compressed' or 'uncompressed', not {indat_format!r}"
+            )
+        self.fmo_charg = [str(self.mol.fragments[frag]["charge"]) for frag in ranges]
+        self.fmo_mult = [
+            str(self.mol.fragments[frag]["multiplicity"]) for frag in ranges
+        ]
 
     def fmo_formatting(self):
         self.fmo_meta()  # gives self.mol.indat, self.mol.charg
@@ -527,54 +492,44 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
         self.write_file(inp, filetype="inp")
 
     def get_job_template(self):
-        if "dfttyp" in [x.lower() for x in self.input.contrl.keys()]:
-            job_file = self.find_job(dft=True)
-        else:
-            job_file = self.find_job()
-        with open(job_file) as f:
-            job = f.read()
-            return job
+        dft = "dfttyp" in [x.lower() for x in self.input.contrl.keys()]
+        return super().get_job_template(dft=dft)
 
-    def change_mgs_job(self, job):
+    def mgs_job_changes(self):
+        changes = {"name": self.base_name}
         if hasattr(self.mol, "fragments") and len(self.mol.fragments) != 0:
             num_frags = len(self.mol.fragments)
-            jobfile = job.replace("nodes=1", f"nodes={num_frags}")
-            jobfile = jobfile.replace("24 24", f"{24 * num_frags} 24")
-            return jobfile
-        return job
+            changes["nodes=1"] = f"nodes={num_frags}"
+            changes["24 24"] = f"{24 * num_frags} 24"
+        return changes
 
-    def change_rjn_job(self, job):
+    def rjn_job_changes(self):
+        changes = {"name": self.base_name}
         if hasattr(self.mol, "fragments") and len(self.mol.fragments) != 0:
             num_frags = len(self.mol.fragments)
-            jobfile = job.replace("ncpus=32", f"ncpus={16 * num_frags}")
-            jobfile = jobfile.replace(
-                "mem=125gb", f"mem={4 * 16 * num_frags}gb"
-            )  # 4gb cpus
-            jobfile = jobfile.replace(
-                "jobfs=150gb", f"jobfs={4 * 16 * num_frags + 20}gb"
-            )
-            return jobfile
-        return job
+            changes["ncpus=32"] = f"ncpus={16 * num_frags}"
+            changes["mem=125gb"] = f"mem={4 * 16 * num_frags}gb"  # 4gb cpus
+            changes["jobfs=150gb"] = f"jobfs={4 * 16 * num_frags + 20}gb"
+        return changes
 
-    def change_stm_job(self, job):
-        jobfile = job.replace("name", f"{self.base_name}")
+    def stm_job_changes(self):
+        changes = {"name": self.base_name}
         if hasattr(self.mol, "fragments") and len(self.mol.fragments) != 0:
             num_frags = len(self.mol.fragments)
-            jobfile = jobfile.replace("-N 1", f"-N {num_frags}")
-            jobfile = jobfile.replace("-n 22", f"-n {22 * num_frags}")
+            changes["-N 1"] = f"-N {num_frags}"
+            changes["-n 22"] = f"-n {22 * num_frags}"
         if self.keep:
-            jobfile = jobfile.replace("rungms.tom", "rungms.tom.keep_files")
-        return jobfile
+            changes["rungms.tom"] = "rungms.tom.keep_files"
+        return changes
 
-    def change_monash_job(self, job):
+    def monash_job_changes(self):
         """
         Thresholds are implemented here automatically.
         If a job is an FMO job, automatically uses 48 cpus with 24 per node,
         unless otherwise stated in a Settings object.
         If memory is not allocated by the user, 4 GB per cpu is used for FMO jobs. 
         """
-        jobfile = job.replace("=name", f"={self.base_name}")
-        jobfile = jobfile.replace(" name", f" {self.base_name}")
+        changes = {"=name": f"={self.base_name}", " name": f" {self.base_name}"}
         # thresholds...
         # if running fmo, automatically use two nodes if not allocated
         # for this work, must use an even number of cpus
@@ -593,90 +548,60 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
                 self.meta.mem = 96
 
         if "mem" in self.meta:
-            jobfile = jobfile.replace(
-                "mem=32", f"mem={str(self.meta.mem).upper().replace('GB', '')}"
-            )
+            changes["mem=32"] = f"mem={str(self.meta.mem).upper().replace('GB', '')}"
         if "ncpus" in self.meta:
-            jobfile = jobfile.replace("ntasks=16", f"ntasks={self.meta.ncpus}")
-            jobfile = jobfile.replace(
-                "tasks-per-node=16",
-                f"tasks-per-node={int(self.meta.ncpus / self.meta.nodes)}",
-            )
-        return jobfile
-
-    def change_gadi_job(self, job):
-        job = job.replace("name", f"{self.base_name}")
+            changes["ntasks=16"] = f"ntasks={self.meta.ncpus}"
+            changes[
+                "tasks-per-node=16"
+            ] = f"tasks-per-node={int(self.meta.ncpus / self.meta.nodes)}"
+        return changes
+
+    def gadi_job_changes(self):
+        changes = {"name": self.base_name}
         # can now give as number or string with gb
         if "mem" in self.meta:
-            job = job.replace(
-                "mem=96", f"mem={str(self.meta.mem).upper().replace('GB', '')}"
-            )
+            changes["mem=96"] = f"mem={str(self.meta.mem).upper().replace('GB', '')}"
         if "ncpus" in self.meta:
-            job = job.replace("ncpus=48", f"ncpus={self.meta.ncpus}")
+            changes["ncpus=48"] = f"ncpus={self.meta.ncpus}"
         if "jobfs" in self.meta:
-            job = job.replace(
-                "jobfs=100", f"jobfs={str(self.meta.jobfs).upper().replace('GB', '')}"
-            )
+            jobfs = str(self.meta.jobfs).upper().replace("GB", "")
+            changes["jobfs=100"] = f"jobfs={jobfs}"
         if "partition" in self.meta:
-            job = job.replace(
-                "#PBS -l wd", f"#PBS -l wd\n#PBS -q {self.meta.partition}"
-            )
+            changes["#PBS -l wd"] = f"#PBS -l wd\n#PBS -q {self.meta.partition}"
         # if fmo srs run on >1 node, use rungms.gadi.ln, else use rungms.gadi
         # default is set to use logical node
         if self._job_runtype == "standard":
-            job = job.replace("rungms.gadi.ln", "rungms.gadi")
-        if self.keep:  # multinode
-            job = job.replace("rungms.gadi.ln", "rungms.keep_files")
-        return job
+            changes["rungms.gadi.ln"] = "rungms.gadi"
+        elif self.keep:  # multinode
+            changes["rungms.gadi.ln"] = "rungms.keep_files"
+        return changes
 
     def create_job(self):
-        """Returns the relevant job template as a list, then performs the necessary modifications. After, the job file is printed in the appropriate directory."""
+        """Returns the relevant job template, then fills in the changes needed for the supercomputer in one pass. After, the job file is printed in the appropriate directory."""
         jobfile = self.get_job_template()
-        if self.sc == "mgs":
-            jobfile = self.change_mgs_job(jobfile)
-            jobfile = jobfile.replace("name", f"{self.base_name}")
-        elif self.sc == "rjn":
-            jobfile = self.change_rjn_job(jobfile)
-            jobfile = jobfile.replace("name", f"{self.base_name}")
-        elif self.sc == "mon":
-            jobfile = self.change_monash_job(jobfile)
-        elif self.sc == "mas":
-            jobfile = self.change_monash_job(jobfile)
-        elif self.sc == "stm":
-            jobfile = self.change_stm_job(jobfile)
-        elif self.sc == "gadi":
-            jobfile = self.change_gadi_job(jobfile)
+        job_changes = {
+            "mgs": self.mgs_job_changes,
+            "rjn": self.rjn_job_changes,
+            "mon": self.monash_job_changes,
+            "mas": self.monash_job_changes,
+            "stm": self.stm_job_changes,
+            "gadi": self.gadi_job_changes,
+        }
+        changes = {}
+        if self.sc in job_changes:
+            changes = job_changes[self.sc]()
 
         if hasattr(self, "meta") and "time" in self.meta:
-            jobfile = jobfile.replace("24:00:00", self.meta.time)
+            changes["24:00:00"] = self.meta.time
 
-        self.write_file(jobfile, filetype="job")
+        self.write_file(substitute(jobfile, changes), filetype="job")
 
     def make_run_dir(self):
         if not self.made_run_dir:  # only do it once
-            if not exists(self.base_name):
-                mkdir(self.base_name)  # make opt/spec/hessin parent dir
+            # make opt/spec/hessin parent dir
+            makedirs(self.output_path(self.base_name), exist_ok=True)
             self.made_run_dir = True
 
-    def place_files_in_dir(self):
-        """Move input and job files into a directory named with the input name (``base_name``) i.e.
-        moves opt.inp and opt.job into a directory called ``opt``."""
-        complex_dir = join(getcwd(), "complex")
-        if self.is_complex:
-            if not exists(complex_dir):
-                mkdir(complex_dir)
-            system(f"mv {self.base_name}.inp {self.base_name}.job complex/")
-            system(f"cp {self.xyz} complex/complex.xyz")
-
-    def ionic_mol_has_two_or_more_frags(self):
-        """
-        If ionic molecule has more than two fragments, return True, and use fmo,
-        else make a non-fmo calculation
-        """
-        ionic_mol = Molecule(atoms=self.mol.ionic["atoms"])
-        ionic_mol.separate()
-        return len(ionic_mol.fragments) > 2
-
     def create_inputs_for_fragments(self, complex_is_fmo=False):
         """Very useful to generate files for each fragment automatically, 
         for single point and frequency calculations, generating free energy changes. 
@@ -704,70 +629,30 @@ energy (spec) or hessian matrix calculation for thermochemical data and vibratio
         """
         self.is_complex = False
         # look over self.mol.fragments, generate inputs- make a settings object with the desired features
-        if not hasattr(self.mol, "fragments"):
-            self.mol.separate()
-        # make subdir if not already there
-        subdirectory = join(getcwd(), "frags")
-        if not exists(subdirectory):
-            mkdir(subdirectory)
-
-        parent_dir = getcwd()
-        count = 0  # avoid  overwriting files by iterating with a number
-        for frag, data in self.mol.fragments.items():
-            if data["frag_type"] == "frag":
-
-                # make a directory inside the subdir for each fragment
-                # i.e. acetate0, acetate1, choline2, choline3, water4
-                name = f"{data['name']}_{count}"
-                if not exists(join(subdirectory, name)):
-                    mkdir(join(subdirectory, name))  # ./frags/water4/
-                chdir(join(subdirectory, name))
-                write_xyz(atoms=data["atoms"], filename=name + str(".xyz"))
-
-                # re-use input file settings from complex
-                if hasattr(self, "merged"):
-                    frag_settings = self.merged
-                else:
-                    frag_settings = self.defaults
+        jobs = []
+        for subdir, name, data, mol in self.fragment_molecules():
+            # re-use input file settings from complex
+            if hasattr(self, "merged"):
+                frag_settings = self.merged
+            else:
+                frag_settings = self.defaults
+            fmo = False
+            if data["frag_type"] == "ionic":
+                # FMO only if more than 2 fragments
+                fmo = complex_is_fmo and len(mol.fragments) > 2
+            else:
                 # for job info, use self.frag.meta
                 frag_settings = frag_settings.merge(self.frag)
-                frag_settings.input.contrl.icharg = data["charge"]
-                if data["multiplicity"] != 1:
-                    frag_settings.input.contrl.mult = data["multiplicity"]
-                job = GamessJob(
-                    using=name + str(".xyz"), settings=frag_settings, run_dir=True
-                )
-                chdir(parent_dir)
-                count += 1
-
-        if hasattr(self.mol, "ionic"):
-            if len(self.mol.ionic["atoms"]) > 0:
-                # only 1 ionic network
-                subdir_ionic = join(getcwd(), "ionic")
-                if not exists(subdir_ionic):
-                    mkdir(subdir_ionic)
-                chdir(subdir_ionic)
-                write_xyz(atoms=self.mol.ionic["atoms"], filename="ionic.xyz")
-
-                # re-use settings from complex
-                if hasattr(self, "merged"):
-                    frag_settings = self.merged
-                else:
-                    frag_settings = self.defaults
-                frag_settings.input.contrl.icharg = self.mol.ionic["charge"]
-                if self.mol.ionic["multiplicity"] != 1:
-                    frag_settings.input.contrl.mult = self.mol.ionic["multiplicity"]
-
-                # FMO only if more than 2 fragments
-                if complex_is_fmo:
-                    complex_is_fmo = self.ionic_mol_has_two_or_more_frags()
-
-                job = GamessJob(
-                    using="ionic.xyz",
-                    settings=frag_settings,
-                    fmo=complex_is_fmo,
-                    run_dir=True,
-                )
-                chdir(parent_dir)
-
-                chdir(parent_dir)
+            frag_settings.input.contrl.icharg = data["charge"]
+            if data["multiplicity"] != 1:
+                frag_settings.input.contrl.mult = data["multiplicity"]
+            job = GamessJob(
+                using=f"{name}.xyz",
+                settings=frag_settings,
+                fmo=fmo,
+                run_dir=True,
+                mol=mol,
+                in_memory=True,
+            )
+            jobs.append((subdir, job))
+        self.write_fragment_files(jobs)
@@ -1,6 +1,9 @@
-from ..core.utils import write_geom_input_for_thermo, write_xyz, eof
-from ..core.results import Results
+from ..core.utils import write_geom_input_for_thermo, eof
+from ..core.results import OptimisationResults, OptimisationStep, Results
+from ..core.xyz import XYZFrame, write_frames
 
+from bisect import bisect_left
+import numpy as np
 import re
 import os
 import subprocess
@@ -9,7 +12,7 @@ import sys
 __all__ = ["GamessResults"]
 
 
-class GamessResults(Results):
+class GamessResults(OptimisationResults, Results):
     """Class for obtaining results from Gamess simulations. This class requires
     a log file to be read.
     Usage:
@@ -33,22 +36,62 @@ back if not found.
     Currently all methods to find energy return the last occurrence of that energy- needs amending to grep every
 instance, really. Simple fix; instead of returning values, store in list and return the list, maybe
 store the iteration number.
+
+    Properties printed at the start of the log are found by one pass through
+    the file, which stops once they are found; see |Results|. Energies
+    printed at the end of a calculation and vibrational data are read by
+    seeking to the last line containing each marker in `SECTIONS`.
     """
 
+    SCANNERS = {
+        "title": ("RUN TITLE",),
+        # input cards can be in any case, but the $CONTRL summary is upper case
+        "runtype": ("RUNTYP=", "runtyp=", "Runtyp=", "RunTyp="),
+        "fmo_level": ("NBODY",),
+        "version": ("GAMESS VERSION =",),
+        "raw_basis": ("INPUT CARD> $BASIS",),
+        "dft_type": ("DFTTYP",),
+        "energy_type": ("FMO", "MPLEVL", "SCS", "DFT", "RUN TITLE"),
+        "solvent_calc": ("INPUT FOR PCM SOLVATION CALCULATION",
+                         "BEGINNING GEOMETRY SEARCH"),
+        "multiplicity": ("SPIN MULTIPLICITY", "spin multiplicity",
+                         "Spin multiplicity", "Spin Multiplicity"),
+        "num_orbitals_occupied": ("ORBITALS ARE OCCUPIED",),
+        "orbital_energies": ("EIGENVECTORS",),
+    }
+
+    SECTIONS = {
+        "coordinates": "COORDINATES OF ALL ATOMS ARE (ANGS)",
+        "equilibrium": "EQUILIBRIUM GEOMETRY LOCATED",
+        "total_energy": "TOTAL ENERGY =",
+        "normal_modes": "MODE FREQ(CM**-1)",
+        "uncorrelated": "Euncorr",  # Euncorr HF and Euncorr(n)=
+        "correlation": "E corr ",
+        "reference": "E(0)=",
+        "opposite_spin": "E(2S)=",
+        "same_spin": "E(2T)=",
+        "mp2": "E(MP2)=",
+    }
+
     def __init__(self, log):
         super().__init__(log)
 
-    
     @property
     def title(self):
+        return self.get_scanned("title")
+
+    def _scan_title(self):
         found = False
-        for line in self.read():    
+        while True:
+            line = yield found  # every line after 'RUN TITLE'
+            if line is None:
+                return None
             if found:
                 if re.search('[A-Za-z0-9]', line):
                     return line
             if 'RUN TITLE' in line:
                 found = True
- 
+
     
     ################################
     #                              #
@@ -71,11 +114,7 @@ store the iteration number.
     def get_error(self):
         super().get_error()
         if self.is_optimisation():
-            no_equil = True
-            for line in self.read():
-                # check for equilibrium coords
-                if "EQUILIBRIUM GEOMETRY LOCATED" in line:
-                    no_equil = False
+            no_equil = "equilibrium" not in self.sections
             if no_equil:
                 return "No equilibrium geometry found- need to resubmit with rerun.xyz"
             else:
@@ -89,7 +128,13 @@ store the iteration number.
 
     def get_runtype(self):
         """Returns type of calculation ran"""
-        for line in self.read():
+        return self.get_scanned("runtype")
+
+    def _scan_runtype(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "RUNTYP=" in line.upper():
                 parts = line.split()
                 for p in parts:
@@ -99,23 +144,89 @@ store the iteration number.
     @property
     def fmo_level(self):
         """Returns level of FMO calculation ran"""
-        for line in self.read():
+        return self.get_scanned("fmo_level")
+
+    def _scan_fmo_level(self):
+        while True:
+            line = yield
+            if line is None:
+                return 0
             if "NBODY" in line:
                 return int(line.split()[-1].split("=")[-1])  # FMO2 or 3
-        return 0
+
+    def _steps(self, lines, index=0):
+        """
+        Reads every block printed under 'COORDINATES OF ALL ATOMS ARE (ANGS)',
+        with the energy from the 'NSERCH:' line that follows it. The block
+        printed after 'EQUILIBRIUM GEOMETRY LOCATED' is the converged geometry.
+        """
+        block = None  # (symbols, coords, converged), waiting for its energy
+        energy = None
+        converged = False
+        rows = None
+        for line in lines:
+            if rows is not None:
+                parts = line.split()
+                if not parts:
+                    block = self._block(rows, converged)
+                    rows = None
+                    converged = False
+                elif len(parts) == 5 and parts[0] != "ATOM":
+                    rows.append(parts)
+                continue
+            if "COORDINATES OF ALL ATOMS ARE (ANGS)" in line:
+                if block is not None:
+                    yield OptimisationStep(*block[:2], energy, block[2], index)
+                    index += 1
+                block = None
+                energy = None
+                rows = []
+            elif "EQUILIBRIUM GEOMETRY LOCATED" in line:
+                converged = True
+            elif block is not None and "NSERCH:" in line and "E=" in line:
+                parts = line.split()
+                energy = float(parts[parts.index("E=") + 1])
+        if rows:
+            block = self._block(rows, converged)
+        if block is not None:
+            yield OptimisationStep(*block[:2], energy, block[2], index)
+
+    @staticmethod
+    def _block(rows, converged):
+        """Converts rows of 'label charge x y z' into symbols and coordinates"""
+        block = np.array(rows).reshape(-1, 5)
+        return block[:, 0], block[:, 2:].astype(np.float64), converged
+
+    def _last_step(self):
+        """
+        Reads the last block of coordinates, starting from the equilibrium
+        marker if it was printed just before the block
+        """
+        blocks = self.sections.offsets("coordinates")
+        if not blocks:
+            return None
+        start = blocks[-1]
+        previous = blocks[-2] if len(blocks) > 1 else -1
+        for offset in self.sections.offsets("equilibrium"):
+            if previous < offset < start:
+                start = offset
+                break
+        step = None
+        for step in self._steps(self.sections.read_from(start),
+                                bisect_left(blocks, start)):
+            pass
+        return step
 
     def get_equil_coords(self, output=None):
+        """
+        Writes the equilibrium geometry to spec/<basename>_equil.xyz in the
+        directory of the system, or the last geometry to rerun/rerun.xyz if
+        the optimisation has not converged
+        """
         # find the parent dir for the system, regardless of opt/rerun
         # find the dir with complex/ionic/frags (for frags in subdir) /opt/spec/hess (not frags in
         # subdir)
         # first time that comes up- that's the parent!
-        import re
-
-        equil = []
-        rerun = []
-        regex = "[A-Za-z]{1,2}(\s*\D?[0-9]{1,3}\.[0-9]{1,10}){4}"
-        found_equil = False
-        found_some = False
         par_dir = []
         for part in self.path.split("/"):
             if part in ("opt", "spec", "hess"):
@@ -123,38 +234,18 @@ store the iteration number.
             else:
                 par_dir.append(part)
         MOLECULE_PARENT_DIR = "/".join(par_dir)
-        for line in self.read():
-            if "EQUILIBRIUM GEOMETRY LOCATED" in line:
-                found_equil = True
-            if "COORDINATES OF ALL ATOMS ARE (ANGS)" in line:  # store every coord list
-                found_some = True
-                if len(rerun) > 0:  # from last run, remove those coords
-                    rerun = []
-            if found_equil:
-                if re.search(regex, line):
-                    if line.endswith("\n"):
-                        equil.append(line[:-1])  # drop newline char
-                    else:
-                        equil.append(line)
-            if found_some:
-                if re.search(regex, line):
-                    if line.endswith("\n"):
-                        rerun.append(line[:-1])  # drop newline char
-                    else:
-                        rerun.append(line)
-            if line == "\n":
-                found_equil = False
-                found_some = False
-
-        if len(equil) > 0:
+        step = next(self.optimisation_steps(last_only=True), None)
+
+        if step is not None and step.converged:
             print("Found equilibrium!")
             newdir = os.path.join(MOLECULE_PARENT_DIR, "spec")
             newname = self.basename + "_equil.xyz"
             if not os.path.isdir(newdir):
                 os.mkdir(newdir)
-            write_xyz(equil, os.path.join(newdir, newname))
+            write_frames([XYZFrame(step.symbols, step.coords)],
+                         os.path.join(newdir, newname))
         else:
-            if len(rerun) > 0:
+            if step is not None:
                 print(
                     "Equilibrium not found. Needs resubmitting."
                     f"\nCoords stored in {self.path}/rerun/rerun.xyz"
@@ -162,7 +253,8 @@ store the iteration number.
                 rerun_dir = os.path.join(self.path, "rerun")
                 if not os.path.exists(rerun_dir):
                     os.mkdir(rerun_dir)
-                write_xyz(rerun, os.path.join(rerun_dir, "rerun.xyz"))
+                write_frames([XYZFrame(step.symbols, step.coords)],
+                             os.path.join(rerun_dir, "rerun.xyz"))
             else:
                 print("No iterations were cycled through!")
 
@@ -185,10 +277,36 @@ store the iteration number.
 
     @property
     def version(self):
-        for line in self.read():
+        return self.get_scanned("version")
+
+    def _scan_version(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "GAMESS VERSION =" in line:
                 return " ".join(line.split()[4:-1])
 
+    def _last_line(self, section, condition):
+        """
+        Returns the last line containing the marker of `section` for which
+        `condition(line)` is True, or None if there is no such line
+        """
+        for line in self.sections.matching_lines(section):
+            if condition(line):
+                return line
+        return None
+
+    def _last_value(self, section, token, column):
+        """
+        Returns column `column` of the last line containing `token` as a
+        separate word, or "" if not found
+        """
+        line = self._last_line(section, lambda line: token in line.split())
+        if line is None:
+            return ""
+        return line.split()[column]
+
     def fmo_mp2_data(self, mp2_type):
         """
         Returns Hartree Fock and MP2 data.
@@ -200,14 +318,11 @@ store the iteration number.
         to return the correlated SCS energy, 'E corr SCS', or correlated
         MP2 energies, 'E corr MP2'.
         """
-        HF = ""
-        MP2 = ""
-        for line in self.eof(0.2):  # last values only
-            if "Euncorr HF" in line:
-                HF = line.split()[-1]
-            if f"E corr {mp2_type}" in line:
-                MP2 = line.split()[-1]
-
+        HF = self._last_line("uncorrelated", lambda line: "Euncorr HF" in line)
+        MP2 = self._last_line("correlation",
+                              lambda line: f"E corr {mp2_type}" in line)
+        HF, MP2 = (line.split()[-1] if line is not None else ""
+                   for line in (HF, MP2))
         HF, MP2 = map(float, (HF, MP2))
         return HF, MP2
 
@@ -216,10 +331,8 @@ store the iteration number.
         """
         Returns last occurrence of total energy.
         """
-        total = ""
-        for line in self.read():
-            if "TOTAL ENERGY =" in line:
-                total = line.split()[-1]
+        line = next(self.sections.matching_lines("total_energy"), None)
+        total = line.split()[-1] if line is not None else ""
         return float(total)
 
     @property
@@ -227,13 +340,7 @@ store the iteration number.
         """
         Returns basis set.
         """
-
-        def raw_basis():
-            for line in self.read():
-                if "INPUT CARD> $BASIS" in line:
-                    return line.split()[-2].split("=")[1]
-
-        basis = raw_basis()
+        basis = self.get_scanned("raw_basis")
         change_basis = {
             "CCD": "cc-pVDZ",
             "CCT": "cc-pVTZ",
@@ -246,23 +353,23 @@ store the iteration number.
             basis, basis
         )  # if self.basis not in dict, return self.basis
 
+    def _scan_raw_basis(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
+            if "INPUT CARD> $BASIS" in line:
+                return line.split()[-2].split("=")[1]
+
     def non_fmo_mp2_gas_data_for_spec(self):
         """
         Returns value of E(0) as HF, E(2S) as the opposite spin energy and
         E(2T) as same spin energy. Then user can scale energies accordingly.
         If looking at optimisations, only the overall correlation energy is printed.
         """
-        HF = ""
-        MP2_opp = ""
-        MP2_same = ""
-        for line in self.eof(0.2):
-            line = line.split()
-            if "E(0)=" in line:
-                HF = line[-1]
-            if "E(2S)=" in line:
-                MP2_opp = line[-1]
-            if "E(2T)=" in line:
-                MP2_same = line[-1]
+        HF = self._last_value("reference", "E(0)=", -1)
+        MP2_opp = self._last_value("opposite_spin", "E(2S)=", -1)
+        MP2_same = self._last_value("same_spin", "E(2T)=", -1)
         HF, MP2_opp, MP2_same = map(float, (HF, MP2_opp, MP2_same))
         return HF, MP2_opp, MP2_same
 
@@ -270,14 +377,8 @@ store the iteration number.
         """
         Returns value of E(0) as HF, E(MP2) as the overall MP2 energy.
         """
-        HF = ""
-        MP2 = ""
-        for line in self.eof(0.2):
-            line = line.split()
-            if "E(0)=" in line:
-                HF = line[-1]
-            if "E(MP2)=" in line:
-                MP2 = line[1]
+        HF = self._last_value("reference", "E(0)=", -1)
+        MP2 = self._last_value("mp2", "E(MP2)=", 1)
         HF, MP2 = map(float, (HF, MP2))
         return HF, MP2
 
@@ -289,14 +390,8 @@ store the iteration number.
         not with the addition of the energy of the solvent. In order to find
         that, search for 'THE P(2) CORRECTED MP2-CPCM ENERGY'.
         """
-        HF = ""
-        MP2 = ""
-        for line in self.eof(0.2):
-            line = line.split()
-            if "E(0)=" in line:
-                HF = line[-1]
-            if "E(MP2)=" in line:
-                MP2 = line[1]
+        HF = self._last_value("reference", "E(0)=", -1)
+        MP2 = self._last_value("mp2", "E(MP2)=", 1)
 
         HF, MP2 = map(float, (HF, MP2))
         return HF, MP2
@@ -306,7 +401,13 @@ store the iteration number.
         """
         Returns DFT type (DFTTYP=...)
         """
-        for line in self.read():
+        return self.get_scanned("dft_type")
+
+    def _scan_dft_type(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "DFTTYP" in line:
                 line = line.split()
                 for val in line:
@@ -319,13 +420,10 @@ store the iteration number.
         Returns the FMO energy stored as Euncorr(2)/Euncorr(3)
         """
         if "2019" in self.version:
-            energy = ""
             fmo = self.fmo_level
-            # issues with opening the same file twice, so store fmo level
-            # before looking for the line
-            for line in self.eof(0.1):
-                if f"Euncorr({fmo})=" in line:
-                    energy = line.split()[-1]
+            line = self._last_line("uncorrelated",
+                                   lambda line: f"Euncorr({fmo})=" in line)
+            energy = line.split()[-1] if line is not None else ""
             return float(energy)
 
     @property
@@ -333,11 +431,17 @@ store the iteration number.
         """
         Returns energy type, i.e. HF, DFT, MP2
         """
+        return self.get_scanned("energy_type")
+
+    def _scan_energy_type(self):
         dft = False
         fmo = False
         mp2 = False
         scs = False
-        for line in self.read():
+        while True:
+            line = yield
+            if line is None:
+                break
             if "FMO" in line:
                 fmo = True
             if "MPLEVL" in line:
@@ -387,12 +491,17 @@ store the iteration number.
         input file at the top though, so instead has to check when the 
         log file reports it.
         """
-        for line in self.read():
+        return self.get_scanned("solvent_calc")
+
+    def _scan_solvent_calc(self):
+        while True:
+            line = yield
+            if line is None:
+                return False
             if "INPUT FOR PCM SOLVATION CALCULATION" in line:
                 return True
             if "BEGINNING GEOMETRY SEARCH" in line:
-                break
-        return False
+                return False
 
     def get_data(self):
         """
@@ -434,7 +543,13 @@ store the iteration number.
 
     @property
     def multiplicity(self):
-        for line in self.read():
+        return self.get_scanned("multiplicity")
+
+    def _scan_multiplicity(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "SPIN MULTIPLICITY" in line.upper():  # sometimes prints lower case
                 return int(line.split()[-1])
 
@@ -444,17 +559,23 @@ store the iteration number.
 
     @property
     def num_orbitals_occupied(self):
-        for line in self.read():
+        return self.get_scanned("num_orbitals_occupied")
+
+    def _scan_num_orbitals_occupied(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "ORBITALS ARE OCCUPIED" in line:
                 return int(line.split()[0])
 
-    def _homo_lumo(self):
-        """
-        Finds HOMO/LUMO orbitals.
-        """
+    def _scan_orbital_energies(self):
         found = False
         orbital_energies = []
-        for line in self.read():
+        while True:
+            line = yield found  # every line of the eigenvectors
+            if line is None:
+                return orbital_energies
             if "EIGENVECTORS" in line:
                 found = True
             if "CPU" in line:
@@ -462,9 +583,17 @@ store the iteration number.
             if found:
                 if re.search("^(\s+-?[0-9]+.[0-9]+){1,5}$", line):
                     orbital_energies += [float(i) for i in line.split()]
-                    # save time
-                    if len(orbital_energies) > self.num_orbitals_occupied + 1:
-                        break
+                    # save time, once the number of occupied orbitals is known
+                    occupied = self._scanned.get("num_orbitals_occupied")
+                    if isinstance(occupied, int) and \
+                            len(orbital_energies) > occupied + 1:
+                        return orbital_energies
+
+    def _homo_lumo(self):
+        """
+        Finds HOMO/LUMO orbitals.
+        """
+        orbital_energies = self.get_scanned("orbital_energies")
         homo = orbital_energies[self.num_orbitals_occupied - 1]
         lumo = orbital_energies[self.num_orbitals_occupied]
         return homo, lumo
@@ -525,7 +654,7 @@ store the iteration number.
         """
         vibs = []
         regex = "[0-9]{1,9}?\s*[0-9]{1,9}\.[0-9]{1,9}\s*[A-Za-z](\s*[0-9]{1,9}\.[0-9]{1,9}){2}$"
-        for line in self.eof(0.2):  # last 20 % of file
+        for line in self.sections.lines("normal_modes"):
             if re.search(regex, line):
                 vibs.append(float(line.split()[1]))
         return vibs
@@ -539,7 +668,7 @@ store the iteration number.
         """
         ints = []
         regex = "[0-9]{1,9}?\s*[0-9]{1,9}\.[0-9]{1,9}\s*[A-Za-z](\s*[0-9]{1,9}\.[0-9]{1,9}){2}$"
-        for line in self.eof(0.2):  # last 20 % of file
+        for line in self.sections.lines("normal_modes"):
             if re.search(regex, line):
                 ints.append(float(line.split()[-1]))
         return ints
@@ -1,9 +1,7 @@
 from ..core.atom import Atom
-from ..core.molecule import Molecule
 from ..core.settings import Settings, read_template
 from ..core.job import Job
-from os import mkdir, chdir, getcwd, system
-from os.path import exists, join
+from ..core.utils import substitute
 from shutil import copyfile, move
 
 __all__ = ["GaussJob"]
@@ -33,8 +31,11 @@ class GaussJob(Job):
         settings=None,
         filename=None,
         is_complex=None,
+        mol=None,
+        in_memory=False,
+        directory=None,
     ):
-        super().__init__(using)
+        super().__init__(using, mol=mol, in_memory=in_memory, directory=directory)
         self.filename = filename
         self.defaults = read_template("gaussian.json")
         if settings is not None:
@@ -96,46 +97,45 @@ class GaussJob(Job):
                     jobfile[num] = f"{search_term}{partition}"
             return jobfile
 
-        job = self.get_job_template().replace("name", self.base_name)
+        job = self.get_job_template()
+        changes = {"name": self.base_name}
+        partition = None
         if hasattr(self, "meta"):
             if "time" in self.meta:
-                job = job.replace("24:00:00", self.meta.time)
+                changes["24:00:00"] = self.meta.time
             if "nodemem" in self.meta:
                 mem = self.meta.nodemem[:-2]
                 if self.sc in ("mas", "mon"):
-                    job = job.replace("mem=32", f"mem={mem}")
+                    changes["mem=32"] = f"mem={mem}"
                 if self.sc == "gadi":
-                    job = job.replace("mem=192", f"mem={mem}")
+                    changes["mem=192"] = f"mem={mem}"
             if "ncpus" in self.meta:
                 if self.sc in super().SLURM_HOSTS:
-                    job = job.replace(
-                        "cpus-per-task=16", f"cpus-per-task={self.meta.ncpus}"
-                    )
+                    changes["cpus-per-task=16"] = f"cpus-per-task={self.meta.ncpus}"
                     # for stampede, specified as -c, so it won't change there, which is
                     # what we want as you are charged for the whole node there!
                 else:  # gadi
-                    job = job.replace("ncpus=48", f"ncpus={self.meta.ncpus}")
+                    changes["ncpus=48"] = f"ncpus={self.meta.ncpus}"
             if "partition" in self.meta:
                 if self.sc in super().SLURM_HOSTS:
-                    jobfile = job.split("\n")
-                    jobfile = _change_partition(
-                        jobfile, self.meta.partition, search_term="#SBATCH -p "
-                    )
-                    # might be --partition=
-                    jobfile = _change_partition(
-                        jobfile, self.meta.partition, search_term="#SBATCH --partition="
-                    )
-                    job = "\n".join(jobfile)
+                    partition = self.meta.partition
                 else:
-                    job = job.replace(
-                        "#PBS -l wd", f"#PBS -q {self.meta.partition}\n#PBS -l wd"
-                    )
+                    changes["#PBS -l wd"] = f"#PBS -q {self.meta.partition}\n#PBS -l wd"
 
             if self.sc in super().PBS_HOSTS:
                 if "jobfs" in self.meta:
                     jobfs = self.meta.jobfs.upper().replace("GB", "")
-                    job = job.replace("jobfs=200GB", f"jobfs={jobfs}GB")
+                    changes["jobfs=200GB"] = f"jobfs={jobfs}GB"
 
+        job = substitute(job, changes)
+        if partition is not None:
+            jobfile = job.split("\n")
+            jobfile = _change_partition(jobfile, partition, search_term="#SBATCH -p ")
+            # might be --partition=
+            jobfile = _change_partition(
+                jobfile, partition, search_term="#SBATCH --partition="
+            )
+            job = "\n".join(jobfile)
         return job
 
     @property
@@ -245,18 +245,6 @@ class GaussJob(Job):
         ]
         return "\n".join(info)
 
-    def place_files_in_dir(self):
-        """
-        Move input and job files into a directory named `complex`, if self.
-        is_complex is set to True
-        """
-        complex_dir = join(getcwd(), "complex")
-        if self.is_complex:
-            if not exists(complex_dir):
-                mkdir(complex_dir)
-            system("cp *.xyz complex/complex.xyz")
-            system(f"mv {self.base_name}.inp {self.base_name}.job complex/")
-
     def create_inputs_for_fragments(self):
         """Very useful to generate files for each fragment automatically, for single point and frequency calculations, generating free energy changes. Called if ``frags_in_subdir`` is set to True, as each fragment is given a subdirectory in an overall subdirectory, creating the following directory structure (here for a 5-molecule system):
             .
@@ -280,61 +268,25 @@ class GaussJob(Job):
         """
         # not necessarily any splitting prior to this
         self.is_complex = False
-
-        self.mol.separate()  # creating frags
         # look over self.mol.fragments, generate inputs- make a settings object with the desired features
-
-        # after separation- create another frag with the ionic cluster!
-
-        # make subdir if not already there
-        subdirectory = join(getcwd(), "frags")
-        if not exists(subdirectory):
-            mkdir(subdirectory)
-
-        parent_dir = getcwd()
-        count = 0  # avoid overwriting files by iterating with a number
-        for frag, data in self.mol.fragments.items():
-            if data["frag_type"] == "frag":
-                # make a directory inside the subdir for each fragment
-                name = f"{data['name']}_{count}"  # i.e. acetate0, acetate1, choline2, choline3, water4
-                if not exists(join(subdirectory, name)):
-                    mkdir(join(subdirectory, name))  # ./frags/water4/
-                chdir(join(subdirectory, name))
-                Molecule.write_xyz(
-                    self, atoms=data["atoms"], filename=name + str(".xyz")
-                )  # using the method, but with no class
-
-                # use the same settings, so if runtype is freq, generate freq inputs for all fragments too.
-                if hasattr(self, "merged"):
-                    frag_settings = self.merged
-                else:
-                    frag_settings = self.defaults
-                # for job info, use self.frag.meta
-                frag_settings = frag_settings.merge(self.frag)
-                frag_settings.input.charge = data["charge"]
-                if data["multiplicity"] != 1:
-                    frag_settings.input.mult = data["multiplicity"]
-                job = GaussJob(using=name + str(".xyz"), settings=frag_settings)
-                chdir(parent_dir)
-                count += 1
-        if hasattr(self.mol, "ionic"):
-            # only 1 ionic network
-            subdir_ionic = join(getcwd(), "ionic")
-            if not exists(subdir_ionic):
-                mkdir(subdir_ionic)
-            chdir(subdir_ionic)
-            write_xyz(atoms=self.mol.ionic["atoms"], filename="ionic.xyz")
-
-            # re-use settings from complex
+        jobs = []
+        for subdir, name, data, mol in self.fragment_molecules():
+            # use the same settings, so if runtype is freq, generate freq inputs for all fragments too.
             if hasattr(self, "merged"):
                 frag_settings = self.merged
             else:
                 frag_settings = self.defaults
-            frag_settings.input.charge = self.mol.ionic["charge"]
-            if self.mol.ionic["multiplicity"] != 1:
-                frag_settings.input.mult = self.mol.ionic["multiplicity"]
-            job = GaussJob(using="ionic.xyz", settings=frag_settings)
-            chdir(parent_dir)
+            if data["frag_type"] == "frag":
+                # for job info, use self.frag.meta
+                frag_settings = frag_settings.merge(self.frag)
+            frag_settings.input.charge = data["charge"]
+            if data["multiplicity"] != 1:
+                frag_settings.input.mult = data["multiplicity"]
+            job = GaussJob(
+                using=f"{name}.xyz", settings=frag_settings, mol=mol, in_memory=True
+            )
+            jobs.append((subdir, job))
+        self.write_fragment_files(jobs)
 
 
 def gauss_print(d, value):
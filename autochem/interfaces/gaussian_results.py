@@ -1,8 +1,11 @@
-from ..core.utils import read_file, write_geom_input_for_thermo, write_xyz
-from ..core.results import Results
+from ..core.utils import read_file, write_geom_input_for_thermo
+from ..core.results import OptimisationResults, OptimisationStep, Results
+from ..core.xyz import XYZFrame, write_frames
 from ..core.periodic_table import PeriodicTable as PT
 from ..core.atom import Atom
 
+from bisect import bisect_left
+import numpy as np
 import re
 import os
 import subprocess
@@ -10,11 +13,34 @@ import subprocess
 __all__ = ["GaussianResults"]
 
 
-class GaussianResults(Results):
+class GaussianResults(OptimisationResults, Results):
     """
     Class for obtaining results from Gaussian simulations. This class requires a log file to be read.
+    Properties printed at the start of the log are found by one pass through
+    the file, which stops once they are found; see |Results|. Energies,
+    vibrational data and excited states are read by seeking to the lines
+    containing each marker in `SECTIONS`.
     """
 
+    SCANNERS = {
+        "title": (),
+        "user_commands": ("#",),
+        "multiplicity": ("Multiplicity",),
+        "homo_lumo": ("Alpha  occ. eigenvalues", "Alpha virt. eigenvalues"),
+    }
+
+    SECTIONS = {
+        "orientation": "Standard orientation",
+        "completed": "Optimization completed",
+        "freq": "Freq\n",
+        "hf_energy": "E=",
+        "dft_energy": "SCF Done",
+        "frequencies": "Frequencies --",
+        "intensities": "IR Inten    --",
+        "excited_states": "Excitation energies and oscillator strengths",
+        "leave_link": "Leave Link",
+    }
+
     def __init__(self, log):
         super().__init__(log)
 
@@ -60,50 +86,87 @@ class GaussianResults(Results):
                 return True
         return False
 
-    def _calcall_equil_coords(self):
+    def _steps(self, lines, index=0):
         """
-        For opt=(...calcall), coords printed differently
+        Reads every 'Standard orientation' table, with the energy from the
+        'SCF Done' line that follows it. Geometries printed after
+        'Optimization completed' are converged. Stops at the frequency job of
+        an opt freq calculation, the first line ending in 'Freq' after a
+        geometry.
         """
-        regex = "^(\s+[0-9]+){3}(\s+-?[0-9]{1,3}.[0-9]+){3}$"
-        coords = []
-        found_some = False
-        found_equil = False
-        for line in self.read():
-            if "Optimization completed" in line:
-                found_equil = True
+        block = None  # (symbols, coords, converged), waiting for its energy
+        energy = None
+        converged = False
+        rows = None
+        dashes = 0
+        for line in lines:
+            if rows is not None:
+                if line.lstrip().startswith("---"):
+                    dashes += 1
+                    if dashes == 3:
+                        block = self._block(rows) + (converged, )
+                        rows = None
+                elif dashes == 2:
+                    rows.append(line.split())
+                continue
             if "Standard orientation" in line:
-                found_some = True
-                if len(coords) > 0:
-                    coords = []  # after each iter
-            if "Rotational constants" in line:
-                found_some = False
-            # check that opt has finished (if opt freq ran)
-            if re.search("Freq$", line):
+                if block is not None:
+                    yield OptimisationStep(*block[:2], energy, block[2], index)
+                    index += 1
+                block = None
+                energy = None
+                rows = []
+                dashes = 0
+            elif "Optimization completed" in line:
+                converged = True
+            elif block is not None and "SCF Done" in line:
+                energy = float(line.split()[4])
+            elif block is not None and line.rstrip().endswith("Freq"):
                 break
-            if found_some:
-                if re.search(regex, line):
-                    _, atnum, _, x, y, z = line.split()
-                    atnum, x, y, z = map(float, (atnum, x, y, z))
-                    coords.append(Atom(atnum=atnum, coords=(x, y, z)))
-        if found_equil:
-            return coords, "equil"
-        else:
-            return coords, "rerun"
+        if rows:
+            block = self._block(rows) + (converged, )
+        if block is not None:
+            yield OptimisationStep(*block[:2], energy, block[2], index)
+
+    @staticmethod
+    def _block(rows):
+        """
+        Converts rows of 'centre atnum type x y z' into symbols and
+        coordinates
+        """
+        block = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        symbols = np.array(
+            [PT.ptable[atnum][0] for atnum in block[:, 1].astype(int)])
+        return symbols, block[:, 3:]
+
+    def _last_step(self):
+        """
+        Reads the last 'Standard orientation' table before any frequency job,
+        starting from 'Optimization completed' if printed before it
+        """
+        offsets = self.sections.offsets
+        blocks = offsets("orientation")
+        if not blocks:
+            return None
+        freq = [offset for offset in offsets("freq") if offset > blocks[0]]
+        if freq:
+            blocks = [offset for offset in blocks if offset < freq[0]]
+        start = blocks[-1]
+        completed = [offset for offset in offsets("completed") if offset < start]
+        if completed:
+            start = completed[0]
+        step = None
+        for step in self._steps(self.sections.read_from(start),
+                                bisect_left(blocks, start)):
+            pass
+        return step
 
     def get_equil_coords(self, output=None):
         """
-        Returns either the equilibrium coordinates or coordinates for the rerun.
-        """
-        # with calcall, things are different, collect standard orientation
-        # and if optimization completed found, they are equil coords
-        # else rerun
-        calcall = True if "calcall" else False in self.user_commands
-        # tddft = True if "td" in self.user_commands else False
-        found_equil = False
-        found_some = False
-        regex = "^(\s+[0-9]+){3}(\s+-?[0-9]{1,3}.[0-9]+){3}$"
-        coords = []
-        some_coords = []
+        Writes the equilibrium coordinates to spec/<title>-equil.xyz, or the
+        last coordinates to rerun/<title>-rerun.xyz if the optimisation has
+        not converged.
+        """
         par_dir = []
         for part in self.path.split("/"):
             if part not in ("opt", "spec", "hess"):
@@ -111,44 +174,17 @@ class GaussianResults(Results):
             else:
                 break
         MOLECULE_PARENT_DIR = "/".join(par_dir)
-        if not calcall:  # and not tddft:
-            for line in self.read():
-                if "Optimization completed" in line:
-                    found_equil = True
-                if "Standard orientation" in line:
-                    found_some = True
-                    if len(some_coords) > 0:  # from last run, remove those coords
-                        some_coords = []
-                if found_equil:
-                    if re.search(regex, line):
-                        _, atnum, _, x, y, z = line.split()
-                        atnum, x, y, z = map(float, (atnum, x, y, z))
-                        coords.append(Atom(atnum=atnum, coords=(x, y, z)))
-                if found_some:
-                    if re.search(regex, line):
-                        _, atnum, _, x, y, z = line.split()
-                        atnum, x, y, z = map(float, (atnum, x, y, z))
-                        some_coords.append(Atom(atnum=atnum, coords=(x, y, z)))
-                if "Rotational constants" in line:
-                    found_some = False
-                if "Distance matrix (angstroms)" in line:
-                    found_equil = False
-
-        if calcall:
-            coords_found, coord_type = self._calcall_equil_coords()
-            if coord_type == "equil":
-                coords = coords_found
-            else:
-                some_coords = coords_found
+        step = next(self.optimisation_steps(last_only=True), None)
 
-        if len(coords) > 0:
+        if step is not None and step.converged:
             print("Found equilibrium!")
             newdir = os.path.join(MOLECULE_PARENT_DIR, "spec")
             if not os.path.isdir(newdir):
                 os.mkdir(newdir)
-            write_xyz(coords, os.path.join(newdir, f"{self.title}-equil.xyz"))
+            write_frames([XYZFrame(step.symbols, step.coords)],
+                         os.path.join(newdir, f"{self.title}-equil.xyz"))
         else:
-            if len(some_coords) > 0:
+            if step is not None:
                 print(
                     "Equilibrium not found. Needs resubmitting.",
                     f"Coords stored in {self.path}/rerun/{self.title}.xyz",
@@ -156,7 +192,8 @@ class GaussianResults(Results):
                 newdir = os.path.join(MOLECULE_PARENT_DIR, "rerun")
                 if not os.path.isdir(newdir):
                     os.mkdir(newdir)
-                write_xyz(some_coords, os.path.join(newdir, f"{self.title}-rerun.xyz"))
+                write_frames([XYZFrame(step.symbols, step.coords)],
+                             os.path.join(newdir, f"{self.title}-rerun.xyz"))
             else:
                 print("No iterations were cycled through!")
 
@@ -171,13 +208,15 @@ class GaussianResults(Results):
         Symbolic Z-matrix
         ...
         """
+        return self.get_scanned("title")
+
+    def _scan_title(self):
         lines = []
-        found = False
-        for line in self.read():
-            if "Symbolic" in line:
-                break
-            lines.append(line)
-        return lines[-2].strip()
+        while True:
+            line = yield True
+            if line is None or "Symbolic" in line:
+                return lines[-2].strip()
+            lines = lines[-1:] + [line]
 
     @property
     def user_commands(self):
@@ -185,9 +224,15 @@ class GaussianResults(Results):
         Returns the #P line of the input file.
         Now accounts for more than one line.
         """
+        return self.get_scanned("user_commands")
+
+    def _scan_user_commands(self):
         lines = []
         found = False
-        for line in self.read():
+        while True:
+            line = yield found
+            if line is None:
+                break
             if re.search("^\s*?#P?", line.upper()):
                 found = True
             if found:
@@ -241,9 +286,10 @@ class GaussianResults(Results):
         Returns last occurrence of Hartree-Fock energy.
         """
         HF = ""
-        for line in self.read():
+        for line in self.sections.matching_lines("hf_energy"):
             if re.search("^\sE=\s*-?[0-9]*.[0-9]*", line):
                 HF = line.split()[1]
+                break
         return float(HF)
 
     @property
@@ -259,10 +305,8 @@ class GaussianResults(Results):
         """
         Returns last occurrence of DFT energy.
         """
-        dft = ""
-        for line in self.read():
-            if "SCF Done" in line:
-                dft = line.split()[4]
+        line = next(self.sections.matching_lines("dft_energy"), None)
+        dft = line.split()[4] if line is not None else ""
         return float(dft)
 
     def get_data(self):
@@ -311,22 +355,34 @@ class GaussianResults(Results):
         """
         Returns multiplicity from the symbolic z-matrix section.
         """
-        for line in self.read():
+        return self.get_scanned("multiplicity")
+
+    def _scan_multiplicity(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "Charge" in line and "Multiplicity" in line:
                 return int(line.split()[-1])
 
-    def _homo_lumo(self):
-        """
-        Finds HOMO/LUMO orbitals.
-        """
+    def _scan_homo_lumo(self):
         occupied = []
         lumo = ""
-        for line in self.read():
+        while True:
+            line = yield
+            if line is None:
+                return occupied, lumo
             if "Alpha  occ. eigenvalues" in line:
                 occupied += line.split()[4:]
             if "Alpha virt. eigenvalues" in line:
                 lumo = line.split()[4]
-                break
+                return occupied, lumo
+
+    def _homo_lumo(self):
+        """
+        Finds HOMO/LUMO orbitals.
+        """
+        occupied, lumo = self.get_scanned("homo_lumo")
         homo = occupied[-1]
         homo, lumo = map(float, (homo, lumo))
         return homo, lumo
@@ -367,20 +423,16 @@ class GaussianResults(Results):
     @property
     def frequencies(self):
         vibs = []
-        for line in self.read():
-            if "Frequencies --" in line:
-                vibs += line.split()[2:]
-        vibs = [float(v) for v in vibs]
-        return vibs
+        for line in self.sections.matching_lines("frequencies", backwards=False):
+            vibs += line.split()[2:]
+        return [float(v) for v in vibs]
 
     @property
     def intensities(self):
         ints = []
-        for line in self.read():
-            if "IR Inten    --" in line:
-                ints += line.split()[3:]
-        ints = [float(i) for i in ints]
-        return ints
+        for line in self.sections.matching_lines("intensities", backwards=False):
+            ints += line.split()[3:]
+        return [float(i) for i in ints]
 
     def write_initial_geom_for_thermo(self):
         """
@@ -404,6 +456,32 @@ class GaussianResults(Results):
 
     # TD-DFT Excited states
 
+    def _excited_states(self):
+        """
+        Collects the 'Excited State' lines of each iteration, split into
+        columns. Each iteration is read from its 'Excitation energies and
+        oscillator strengths' line to the next 'Leave Link'.
+        """
+        states = []
+        ends = self.sections.offsets("leave_link")
+        end = -1
+        for start in self.sections.offsets("excited_states"):
+            if start <= end:
+                continue  # printed again within the same iteration
+            following = bisect_left(ends, start)
+            if following == len(ends):
+                break  # the last iteration did not finish
+            end = ends[following]
+            states_per_iter = []
+            for line in self.sections.read_from(start):
+                if "Excited State" in line:
+                    states_per_iter.append(line.split())
+                if "Leave Link" in line:
+                    if len(states_per_iter) > 0:
+                        states.append(states_per_iter)
+                    break
+        return states
+
     @property
     def td_dft_wavelengths(self):
         """
@@ -413,63 +491,21 @@ class GaussianResults(Results):
         excited state optimisation, there will be many 
         iterations.
         """
-        waves = []
-        waves_per_iter = []
-        found_region = False
-        for line in self.read():
-            if "Excitation energies and oscillator strengths" in line:
-                found_region = True
-            if found_region:
-                if "Excited State" in line:
-                    wave = float(line.split()[6])
-                    waves_per_iter.append(wave)
-            if "Leave Link" in line:
-                found_region = False
-                if len(waves_per_iter) > 0:
-                    waves.append(waves_per_iter)
-                    waves_per_iter = []
-        return waves
+        return [[float(state[6]) for state in states]
+                for states in self._excited_states()]
 
     @property
     def td_dft_intensities(self):
         """
         Returns a nested list of intensities, one for each iteration.
         """
-        ints = []
-        ints_per_iter = []
-        found_region = False
-        for line in self.read():
-            if "Excitation energies and oscillator strengths" in line:
-                found_region = True
-            if found_region:
-                if "Excited State" in line:
-                    _int = float(line.split()[8].split("=")[1])
-                    ints_per_iter.append(_int)
-            if "Leave Link" in line:
-                found_region = False
-                if len(ints_per_iter) > 0:
-                    ints.append(ints_per_iter)
-                    ints_per_iter = []
-        return ints
+        return [[float(state[8].split("=")[1]) for state in states]
+                for states in self._excited_states()]
 
     @property
     def td_dft_transition_energies(self):
         """
         Returns a nested list of energies of each transition in eV
         """
-        vals = []
-        vals_per_iter = []
-        found_region = False
-        for line in self.read():
-            if "Excitation energies and oscillator strengths" in line:
-                found_region = True
-            if found_region:
-                if "Excited State" in line:
-                    val = float(line.split()[4])
-                    vals_per_iter.append(val)
-            if "Leave Link" in line:
-                found_region = False
-                if len(vals_per_iter) > 0:
-                    vals.append(vals_per_iter)
-                    vals_per_iter = []
-        return vals
+        return [[float(state[4]) for state in states]
+                for states in self._excited_states()]
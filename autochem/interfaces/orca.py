@@ -1,13 +1,11 @@
 from ..core.atom import Atom
-from ..core.molecule import Molecule
 from ..core.settings import Settings, read_template, dict_to_settings
 from ..core.job import Job
 from ..core.periodic_table import PeriodicTable as PT
 from ..core.sc import Supercomp
-from ..core.utils import search_dict_recursively, write_xyz
+from ..core.utils import search_dict_recursively, substitute
 
-from os import chdir, mkdir, getcwd, system
-from os.path import exists, join, dirname
+from os.path import dirname, relpath
 import re
 
 __all__ = ["OrcaJob"]
@@ -38,8 +36,11 @@ class OrcaJob(Job):
         settings=None,
         filename=None,
         is_complex=None,
+        mol=None,
+        in_memory=False,
+        directory=None,
     ):
-        super().__init__(using)
+        super().__init__(using, mol=mol, in_memory=in_memory, directory=directory)
         self.filename = filename
         self.defaults = read_template("orca.json")  # settings object
         if settings is not None:
@@ -59,8 +60,8 @@ class OrcaJob(Job):
         else:
             self.title = using[:-4]
 
-        # self.xyzfile = using.split("/")[-1]
-        self.xyzfile = using
+        # xyz file as seen from the directory the input is written to
+        self.xyzfile = relpath(using, self.directory)
 
         self.file_basename()
         self.get_sc()  # required to be called here as func uses sett.supercomp if provided
@@ -78,26 +79,15 @@ class OrcaJob(Job):
         if make_frags and not is_complex:
             self.is_complex = True
 
-    def write_file(self, data, filetype):
-        """Writes the generated Orca input/jobs to a file. If no filename is passed when the class is instantiated, the name of the file defaults to the run type: a geometry optimisation (opt), single point energy calculation (spec), or a hessian matrix calculation for vibrational frequencies (freq). 
-        NOTE: Must pass data as a string, not a list!"""
-        with open(f"{self.base_name}.{filetype}", "w") as f:
-            f.write(data)
-
-    def get_job_template(self):
-        job_file = self.find_job()
-        with open(job_file) as f:
-            job = f.read()
-            return job
-
     def create_job(self):
         """
-        Returns the relevant job template as a list, then performs the 
-        necessary modifications. After, the job file is printed in the      
+        Returns the relevant job template, then performs the necessary
+        modifications. After, the job file is printed in the
         appropriate directory.
         """
-        jobfile = self.get_job_template().replace(" name", f" {self.base_name}")
+        jobfile = self.get_job_template()
         # need space due to `dirname` being used in script to find orca path
+        changes = {" name": f" {self.base_name}"}
 
         # replace cpus for parallelisation
         # and set cpus per task to 1
@@ -123,42 +113,27 @@ class OrcaJob(Job):
 
             # change job time, memory
             if hasattr(self, "meta") and "time" in self.meta:
-                jobfile = jobfile.replace("24:00:00", self.meta.time)
+                changes["24:00:00"] = self.meta.time
 
             if hasattr(self, "meta") and "mem" in self.meta:
                 mem = str(self.meta.mem).lower().replace('gb', '')
-                jobfile = jobfile.replace(
-                    "mem=64", f"mem={mem}"
-                )  # for m3/mon, mem=... doesn't appear for stm
+                # for m3/mon, mem=... doesn't appear for stm
+                changes["mem=64"] = f"mem={mem}"
         else:
             if "time" in self.meta:
-                jobfile = jobfile.replace("24:00:00", self.meta.time)
+                changes["24:00:00"] = self.meta.time
             if "mem" in self.meta:
                 mem = str(self.meta.mem).lower().replace('gb', '')
-                jobfile = jobfile.replace("mem=192", f"mem={mem}")
+                changes["mem=192"] = f"mem={mem}"
             if "partition" in self.meta:
-                jobfile = jobfile.replace(
-                    "#PBS -l wd", f"#PBS -l wd\n#PBS -q {self.meta.partition}"
-                )
+                changes["#PBS -l wd"] = f"#PBS -l wd\n#PBS -q {self.meta.partition}"
             if "ncpus" in self.meta:
-                jobfile = jobfile.replace("ncpus=48", f"ncpus={self.meta.ncpus}")
+                changes["ncpus=48"] = f"ncpus={self.meta.ncpus}"
             if "jobfs" in self.meta:
                 jobfs = self.meta.jobfs.upper().replace("GB", "")
-                jobfile = jobfile.replace("jobfs=200GB", f"jobfs={jobfs}GB")
-
-        self.write_file(jobfile, filetype="job")
+                changes["jobfs=200GB"] = f"jobfs={jobfs}GB"
 
-    def place_files_in_dir(self):
-        """
-        Move input and job files into a directory named `complex`, if self.
-        is_complex is set to True
-        """
-        complex_dir = join(getcwd(), "complex")
-        if self.is_complex:
-            if not exists(complex_dir):
-                mkdir(complex_dir)
-            system("cp *.xyz complex/complex.xyz")
-            system(f"mv {self.base_name}.inp {self.base_name}.job complex/")
+        self.write_file(substitute(jobfile, changes), filetype="job")
 
     def create_inputs_for_fragments(self):
         """Very useful to generate files for each fragment automatically, for single point and frequency calculations, generating free energy changes. Called if ``frags_in_subdir`` is set to True, as each fragment is given a subdirectory in an overall subdirectory, creating the following directory structure (here for a 5-molecule system):
@@ -183,61 +158,25 @@ class OrcaJob(Job):
         """
         # not necessarily any splitting prior to this
         self.is_complex = False
-
-        self.mol.separate()  # creating frags
         # look over self.mol.fragments, generate inputs- make a settings object with the desired features
-
-        # after separation- create another frag with the ionic cluster!
-
-        # make subdir if not already there
-        subdirectory = join(getcwd(), "frags")
-        if not exists(subdirectory):
-            mkdir(subdirectory)
-
-        parent_dir = getcwd()
-        count = 0  # avoid overwriting files by iterating with a number
-        for frag, data in self.mol.fragments.items():
-            if data["frag_type"] == "frag":
-                # make a directory inside the subdir for each fragment
-                name = f"{data['name']}_{count}"  # i.e. acetate0, acetate1, choline2, choline3, water4
-                if not exists(join(subdirectory, name)):
-                    mkdir(join(subdirectory, name))  # ./frags/water4/
-                chdir(join(subdirectory, name))
-                Molecule.write_xyz(
-                    self, atoms=data["atoms"], filename=name + str(".xyz")
-                )  # using the method, but with no class
-
-                # use the same settings, so if runtype is freq, generate freq inputs for all fragments too.
-                if hasattr(self, "merged"):
-                    frag_settings = self.merged
-                else:
-                    frag_settings = self.defaults
-                # for job info, use self.frag.meta
-                frag_settings = frag_settings.merge(self.frag)
-                frag_settings.input.charge = data["charge"]
-                if data["multiplicity"] != 1:
-                    frag_settings.input.mult = data["multiplicity"]
-                job = OrcaJob(using=name + str(".xyz"), settings=frag_settings)
-                chdir(parent_dir)
-                count += 1
-        if hasattr(self.mol, "ionic"):
-            # only 1 ionic network
-            subdir_ionic = join(getcwd(), "ionic")
-            if not exists(subdir_ionic):
-                mkdir(subdir_ionic)
-            chdir(subdir_ionic)
-            write_xyz(atoms=self.mol.ionic["atoms"], filename="ionic.xyz")
-
-            # re-use settings from complex
+        jobs = []
+        for subdir, name, data, mol in self.fragment_molecules():
+            # use the same settings, so if runtype is freq, generate freq inputs for all fragments too.
             if hasattr(self, "merged"):
                 frag_settings = self.merged
             else:
                 frag_settings = self.defaults
-            frag_settings.input.charge = self.mol.ionic["charge"]
-            if self.mol.ionic["multiplicity"] != 1:
-                frag_settings.input.mult = self.mol.ionic["multiplicity"]
-            job = OrcaJob(using="ionic.xyz", settings=frag_settings)
-            chdir(parent_dir)
+            if data["frag_type"] == "frag":
+                # for job info, use self.frag.meta
+                frag_settings = frag_settings.merge(self.frag)
+            frag_settings.input.charge = data["charge"]
+            if data["multiplicity"] != 1:
+                frag_settings.input.mult = data["multiplicity"]
+            job = OrcaJob(
+                using=f"{name}.xyz", settings=frag_settings, mol=mol, in_memory=True
+            )
+            jobs.append((subdir, job))
+        self.write_fragment_files(jobs)
 
     def file_basename(self):
         """
@@ -13,9 +13,30 @@ __all__ = ["OrcaResults"]
 class OrcaResults(Results):
     """
     Class for obtaining results from Orca simulations. This class     
-    requires a log file to be read.
+    requires a log file to be read. Properties printed at the start of
+    the log are found by one pass through the file, which stops once they
+    are found; see |Results|. Vibrational data and excited states are read
+    by seeking to the lines containing each marker in `SECTIONS`.
     """
 
+    SCANNERS = {
+        "user_commands": ("> !",),
+        "title": ("The coordinates will be read from file",),
+        "is_dft": ("Density Functional     Method          .... DFT",),
+        "method": ("Exchange Functional    Exchange",
+                   "Ab initio Hamiltonian  Method"),
+        "num_atoms": ("Number of atoms",),
+        "basis": ("Your calculation utilizes the basis:",),
+        "total_energy": ("Total Energy       :",),
+        "multiplicity": ("Multiplicity",),
+        "homo_lumo": ("ORBITAL ENERGIES",),
+    }
+
+    SECTIONS = {
+        "vibrations": "Mode    freq (cm**-1)",
+        "excited_states": "TRANSITION ELECTRIC",
+    }
+
     def __init__(self, log):
         super().__init__(log)
 
@@ -66,7 +87,13 @@ class OrcaResults(Results):
         """
         Returns the ! ... line of the input file.
         """
-        for line in self.read():
+        return self.get_scanned("user_commands")
+
+    def _scan_user_commands(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "> !" in line:
                 return line.lower()
 
@@ -75,7 +102,13 @@ class OrcaResults(Results):
         """
         Returns xyz file with no extension. Used when writing new coords
         """
-        for line in self.read():
+        return self.get_scanned("title")
+
+    def _scan_title(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "The coordinates will be read from file" in line:
                 return line.split()[-1].rsplit(".")[0]
 
@@ -84,17 +117,28 @@ class OrcaResults(Results):
         """
         Used internally to decide if dft energies should be collected.
         """
-        for line in self.read():
+        return self.get_scanned("is_dft")
+
+    def _scan_is_dft(self):
+        while True:
+            line = yield
+            if line is None:
+                return False
             if "Density Functional     Method          .... DFT" in line:
                 return True
-        return False
 
     @property
     def method(self):
         """
         Returns method used in calculation.
         """
-        for line in self.read():
+        return self.get_scanned("method")
+
+    def _scan_method(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             # dft
             if "Exchange Functional    Exchange" in line:
                 return line.split()[-1]
@@ -106,7 +150,13 @@ class OrcaResults(Results):
 
     @property
     def num_atoms(self):
-        for line in self.read():
+        return self.get_scanned("num_atoms")
+
+    def _scan_num_atoms(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "Number of atoms" in line:
                 return int(line.split()[-1])
 
@@ -153,7 +203,13 @@ class OrcaResults(Results):
         """
         Returns basis set.
         """
-        for line in self.read():
+        return self.get_scanned("basis")
+
+    def _scan_basis(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "Your calculation utilizes the basis:" in line:
                 return line.split()[-1]
 
@@ -162,7 +218,13 @@ class OrcaResults(Results):
         """
         Returns total energy, printed for scf calculations.
         """
-        for line in self.read():
+        return self.get_scanned("total_energy")
+
+    def _scan_total_energy(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "Total Energy       :" in line:
                 return float(line.split()[3].strip())
 
@@ -204,7 +266,13 @@ class OrcaResults(Results):
         """
         Return multiplicity.
         """
-        for line in self.read():
+        return self.get_scanned("multiplicity")
+
+    def _scan_multiplicity(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "Multiplicity" in line:
                 return int(line.split()[-1])
 
@@ -213,11 +281,18 @@ class OrcaResults(Results):
         Finds HOMO/LUMO orbitals, and ORCA prints the
         energies in eV, so no need for conversion.
         """
+        homo, lumo = map(float, self.get_scanned("homo_lumo"))
+        return homo, lumo
+
+    def _scan_homo_lumo(self):
         homo = ""
         lumo = ""
         regex = r"^\s+[0-9]+(\s+-?[0-9]+.[0-9]+){3}"
         found = False
-        for line in self.read():
+        while True:
+            line = yield found
+            if line is None:
+                return homo, lumo
             if "ORBITAL ENERGIES" in line:
                 found = True
             if found:
@@ -227,9 +302,7 @@ class OrcaResults(Results):
                         homo = line[-1]
                     else:
                         lumo = line[-1]
-                        break
-        homo, lumo = map(float, (homo, lumo))
-        return homo, lumo
+                        return homo, lumo
 
     def _homo_lumo_gap(self):
         homo, lumo = self._homo_lumo()
@@ -269,31 +342,28 @@ class OrcaResults(Results):
         """
         Orca removes rotations/vibrations before printing.
         """
-        vibs = []
-        found = False
-        for line in self.read():
-            if "Mode    freq (cm**-1)" in line:
-                found = True
-            if found and line == "\n":
-                found = False
-            if found and '------' not in line:
-                vibs.append(float(line.split()[1]))
-        return vibs
+        return self._vibrations(1)
 
     @property
     def intensities(self):
         """
         Orca removes rotations/vibrations before printing
         """
-        ints = []
-        for line in self.read():
-            if "Mode    freq (cm**-1)" in line:
-                found = True
-            if found and line == "\n":
-                found = False
-            if found and '------' not in line:
-                ints.append(float(line.split()[2]))
-        return ints
+        return self._vibrations(2)
+
+    def _vibrations(self, column):
+        """
+        Reads `column` of each table starting with a 'Mode    freq (cm**-1)'
+        line, up to the blank line after it
+        """
+        values = []
+        for start in self.sections.offsets("vibrations"):
+            for line in self.sections.read_from(start):
+                if line == "\n":
+                    break
+                if '------' not in line:
+                    values.append(float(line.split()[column]))
+        return values
 
     #####################
     #  Thermochemistry  #
@@ -365,51 +435,47 @@ class OrcaResults(Results):
     #  TD-DFT Excited states  #
     ###########################
     
+    def _excited_states(self):
+        """
+        Collects the rows of the transition electric dipole table of each
+        iteration, split into columns. Each table is read from its
+        'TRANSITION ELECTRIC' line to the blank line after it.
+        """
+        states = []
+        end = 0
+        regex = "^\s+[0-9]+(\s+-?[0-9]+\.[0-9]+){7}$"
+        for start in self.sections.offsets("excited_states"):
+            if start < end:
+                continue  # printed again within the same table
+            states_per_iter = []
+            end = start
+            for line in self.sections.read_from(start):
+                end += len(line.encode())
+                if re.search(regex, line):
+                    states_per_iter.append(line.split())
+                if line == "\n":
+                    if len(states_per_iter) > 0:
+                        states.append(states_per_iter)
+                    break
+            else:
+                break  # the last table did not finish
+        return states
+
     @property
     def td_dft_wavelengths(self):
         """
         Returns a nested list of wavelengths per iteration
         """
-        waves = []
-        waves_per_iter = []
-        found = False
-        regex = "^\s+[0-9]+(\s+-?[0-9]+\.[0-9]+){7}$"
-        for line in self.read():
-            if "TRANSITION ELECTRIC" in line:
-                found = True
-            if found:
-                if re.search(regex, line):
-                    wave = float(line.split()[2])
-                    waves_per_iter.append(wave)
-            if line == "\n":
-                found = False
-                if len(waves_per_iter) > 0:
-                    waves.append(waves_per_iter)
-                    waves_per_iter = []
-        return waves
+        return [[float(state[2]) for state in states]
+                for states in self._excited_states()]
 
     @property
     def td_dft_intensities(self):
         """
         Returns a nested list of intensities
         """
-        ints = []
-        ints_per_iter = []
-        found = False
-        regex = "^\s+[0-9]+(\s+-?[0-9]+\.[0-9]+){7}$"
-        for line in self.read():
-            if "TRANSITION ELECTRIC" in line:
-                found = True
-            if found:
-                if re.search(regex, line):
-                    intensity = float(line.split()[4])
-                    ints_per_iter.append(intensity)
-            if line == "\n":
-                found = False
-                if len(ints_per_iter) > 0:
-                    ints.append(ints_per_iter)
-                    ints_per_iter = []
-        return ints
+        return [[float(state[4]) for state in states]
+                for states in self._excited_states()]
 
     @property
     def td_dft_transition_energies(self):
@@ -418,20 +484,5 @@ class OrcaResults(Results):
         from cm-1 to eV
         """
         inverse_cm_to_ev = 1 / 8065.6
-        vals = []
-        vals_per_iter = []
-        found = False
-        regex = "^\s+[0-9]+(\s+-?[0-9]+\.[0-9]+){7}$"
-        for line in self.read():
-            if "TRANSITION ELECTRIC" in line:
-                found = True
-            if found:
-                if re.search(regex, line):
-                    val = float(line.split()[1]) * inverse_cm_to_ev
-                    vals_per_iter.append(val)
-            if line == "\n":
-                found = False
-                if len(vals_per_iter) > 0:
-                    vals.append(vals_per_iter)
-                    vals_per_iter = []
-        return vals
+        return [[float(state[1]) * inverse_cm_to_ev for state in states]
+                for states in self._excited_states()]
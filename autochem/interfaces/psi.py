@@ -1,13 +1,11 @@
 from ..core.atom import Atom
-from ..core.molecule import Molecule
 from ..core.settings import Settings, read_template, dict_to_settings
 from ..core.job import Job
 from ..core.periodic_table import PeriodicTable as PT
 from ..core.sc import Supercomp
-from ..core.utils import search_dict_recursively, write_xyz
+from ..core.utils import search_dict_recursively, substitute
 
-from os import chdir, mkdir, getcwd, system
-from os.path import exists, join, dirname
+from os.path import join, dirname
 
 __all__ = ["PsiJob"]
 
@@ -91,8 +89,11 @@ cluster.
         filename=None,
         is_complex=False,
         cp=False,
+        mol=None,
+        in_memory=False,
+        directory=None,
     ):
-        super().__init__(using)
+        super().__init__(using, mol=mol, in_memory=in_memory, directory=directory)
         self.filename = filename
         self.defaults = read_template("psi.json")  # settings object
         if settings is not None:
@@ -227,12 +228,6 @@ cluster.
         else:
             self.base_name = self.filename
 
-    def write_file(self, data, filetype):
-        """Writes the generated PSI4 input/jobs to a file. If no filename is passed when the class is instantiated, the name of the file defaults to the run type: a geometry optimisation (opt), single point energy calculation (spec), or a hessian matrix calculation for vibrational frequencies (freq). 
-        NOTE: Must pass data as a string, not a list!"""
-        with open(f"{self.base_name}.{filetype}", "w") as f:
-            f.write(data)
-
     def make_counterpoise(self):
         """
         Make a counterpoise corrected HF input file and place in a separate directory.
@@ -278,43 +273,8 @@ cluster.
         data.append("}\n")
 
         data.append("energy('HF', bsse_type='cp')")
-        cp_dir = join(getcwd(), "cp-hf")
-        if not exists(cp_dir):
-            mkdir(cp_dir)
-        cp_input = join(cp_dir, f"{self.base_name}.inp")
-        cp_job = join(cp_dir, f"{self.base_name}.job")
-        with open(cp_input, "w") as f:
-            for line in data:
-                f.write(line)
-        # self.create_job() doesn't write to subdirs...
-        job_file = self.find_job()
-        with open(job_file) as f:
-            job = f.read()
-
-        job = job.replace("name", f"{self.base_name}")
-
-        if "time" in self.meta:
-            job = job.replace("3:00:00", self.meta.time)
-
-        if self.sc in super().SLURM_HOSTS:
-            if "ncpus" in self.meta:
-                job = job.replace("-c 16", f"-c {self.meta.ncpus}")
-            if "mem" in self.meta:
-                mem = self.meta.mem[:-2]
-                job = job.replace("mem=64GB", f"mem={mem}GB")
-
-        if self.sc in super().PBS_HOSTS:
-            if "ncpus" in self.meta:
-                job = job.replace("ncpus=16", f"ncpus={self.meta.ncpus}")
-            if "jobfs" in self.meta:
-                jobfs = self.meta.jobfs[:-2]  # drop units
-                job = job.replace("jobfs=10GB", f"jobfs={jobfs}GB")
-            if "mem" in self.meta:
-                mem = self.meta.mem[:-2]
-                job = job.replace("mem=64GB", f"mem={mem}GB")
-
-        with open(cp_job, "w") as j:
-            j.write(job)
+        self.write_output(join("cp-hf", f"{self.base_name}.inp"), "".join(data))
+        self.write_output(join("cp-hf", f"{self.base_name}.job"), self.job_data)
 
     def create_inp(self, counterpoise=False):
         self.make_header()
@@ -326,51 +286,37 @@ cluster.
         if counterpoise:
             self.make_counterpoise()
 
-    def get_job_template(self):
-        job_file = self.find_job()
-        with open(job_file) as f:
-            job = f.read()
-            return job
-
-    def create_job(self):
-        """Returns the relevant job template as a list, then performs the necessary modifications. After, the job file is printed in the appropriate directory."""
+    @property
+    def job_data(self):
+        """Returns the job template, with the changes needed for the supercomputer filled in"""
         job = self.get_job_template()
-        
-        job = job.replace("name", f"{self.base_name}")
+        changes = {"name": self.base_name}
 
         if "time" in self.meta:
-            job = job.replace("3:00:00", self.meta.time)
+            changes["3:00:00"] = self.meta.time
 
         if self.sc in super().SLURM_HOSTS:
             if "ncpus" in self.meta:
-                job = job.replace("-c 16", f"-c {self.meta.ncpus}")
+                changes["-c 16"] = f"-c {self.meta.ncpus}"
             if "mem" in self.meta:
                 mem = self.meta.mem[:-2]
-                job = job.replace("mem=64GB", f"mem={mem}GB")
-            
+                changes["mem=64GB"] = f"mem={mem}GB"
+
         if self.sc in super().PBS_HOSTS:
             if "ncpus" in self.meta:
-                job = job.replace("ncpus=16", f"ncpus={self.meta.ncpus}")
+                changes["ncpus=16"] = f"ncpus={self.meta.ncpus}"
             if "jobfs" in self.meta:
                 jobfs = self.meta.jobfs[:-2]  # drop units
-                job = job.replace("jobfs=10GB", f"jobfs={jobfs}GB")
+                changes["jobfs=10GB"] = f"jobfs={jobfs}GB"
             if "mem" in self.meta:
                 mem = self.meta.mem[:-2]
-                job = job.replace("mem=64GB", f"mem={mem}GB")
+                changes["mem=64GB"] = f"mem={mem}GB"
 
-        self.write_file(job, filetype="job")
+        return substitute(job, changes)
 
-    def place_files_in_dir(self):
-        """
-        Move input and job files into a directory named `complex`, if self.is_complex
-        is set to True
-        """
-        complex_dir = join(getcwd(), "complex")
-        if self.is_complex:
-            if not exists(complex_dir):
-                mkdir(complex_dir)
-            system("cp *.xyz complex/complex.xyz")
-            system(f"mv {self.base_name}.inp {self.base_name}.job complex/")
+    def create_job(self):
+        """Returns the relevant job template, then performs the necessary modifications. After, the job file is printed in the appropriate directory."""
+        self.write_file(self.job_data, filetype="job")
 
     def create_inputs_for_fragments(self):
         """Very useful to generate files for each fragment automatically, for single point and frequency calculations, generating free energy changes. Called if ``frags_in_subdir`` is set to True, as each fragment is given a subdirectory in an overall subdirectory, creating the following directory structure (here for a 5-molecule system):
@@ -395,58 +341,22 @@ cluster.
         """
         # not necessarily any splitting prior to this
         self.is_complex = False
-
-        self.mol.separate()  # creating frags
         # look over self.mol.fragments, generate inputs- make a settings object with the desired features
-
-        # after separation- create another frag with the ionic cluster!
-
-        # make subdir if not already there
-        subdirectory = join(getcwd(), "frags")
-        if not exists(subdirectory):
-            mkdir(subdirectory)
-
-        parent_dir = getcwd()
-        count = 0  # avoid  overwriting files by iterating with a number
-        for frag, data in self.mol.fragments.items():
-            if data["frag_type"] == "frag":
-                # make a directory inside the subdir for each fragment
-                name = f"{data['name']}_{count}"  # i.e. acetate0, acetate1, choline2, choline3, water4
-                if not exists(join(subdirectory, name)):
-                    mkdir(join(subdirectory, name))  # ./frags/water4/
-                chdir(join(subdirectory, name))
-                Molecule.write_xyz(
-                    self, atoms=data["atoms"], filename=name + str(".xyz")
-                )  # using the method, but with no class
-
-                # use the same settings, so if runtype is freq, generate freq inputs for all fragments too.
-                if hasattr(self, "merged"):
-                    frag_settings = self.merged
-                else:
-                    frag_settings = self.defaults
-                # for job info, use self.frag.meta
-                frag_settings = frag_settings.merge(self.frag)
-                frag_settings.input.molecule.charge = data["charge"]
-                if data["multiplicity"] != 1:
-                    frag_settings.input.molecule.multiplicity = data["multiplicity"]
-                job = PsiJob(using=f"{name}.xyz", settings=frag_settings)
-                chdir(parent_dir)
-                count += 1
-        if hasattr(self.mol, "ionic"):
-            # only 1 ionic network
-            subdir_ionic = join(getcwd(), "ionic")
-            if not exists(subdir_ionic):
-                mkdir(subdir_ionic)
-            chdir(subdir_ionic)
-            write_xyz(atoms=self.mol.ionic["atoms"], filename="ionic.xyz")
-
-            # re-use settings from complex
+        jobs = []
+        for subdir, name, data, mol in self.fragment_molecules():
+            # use the same settings, so if runtype is freq, generate freq inputs for all fragments too.
             if hasattr(self, "merged"):
                 frag_settings = self.merged
             else:
                 frag_settings = self.defaults
-            frag_settings.input.molecule.charge = self.mol.ionic["charge"]
-            if self.mol.ionic["multiplicity"] != 1:
-                frag_settings.input.molecule.multiplicity = self.mol.ionic["multiplicity"]
-            job = PsiJob(using="ionic.xyz", settings=frag_settings)
-            chdir(parent_dir)
+            if data["frag_type"] == "frag":
+                # for job info, use self.frag.meta
+                frag_settings = frag_settings.merge(self.frag)
+            frag_settings.input.molecule.charge = data["charge"]
+            if data["multiplicity"] != 1:
+                frag_settings.input.molecule.multiplicity = data["multiplicity"]
+            job = PsiJob(
+                using=f"{name}.xyz", settings=frag_settings, mol=mol, in_memory=True
+            )
+            jobs.append((subdir, job))
+        self.write_fragment_files(jobs)
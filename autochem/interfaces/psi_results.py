@@ -6,24 +6,48 @@ __all__ = ["PsiResults"]
 
 
 class PsiResults(Results):
-    """Class defining the results of a PSI4 calculation."""
+    """
+    Class defining the results of a PSI4 calculation. Properties printed at
+    the start of the log are found by one pass through the file, which stops
+    once they are found; see |Results|. Energies and orbital energies are
+    read by seeking to the last line containing each marker in `SECTIONS`.
+    """
+
+    SCANNERS = {
+        "runtype": ("('",),
+        "method": ("('",),
+        "multiplicity": ("Geometry (in Angstrom)",),
+        "reduced_homo_lumo": ("Singly Occupied", "Virtual"),
+        "basis": ("basis",),
+    }
+
+    SECTIONS = {
+        "completed": "exiting successfully",
+        "orbital_energies": "Orbital Energies",
+        "total_energy": "Total Energy =",
+        "hf_energy_for_mp2": "Reference Energy          =",
+        "mp2_opp": "Opposite-Spin Energy      =",
+        "mp2_same": "Same-Spin Energy          =",
+    }
 
     def __init__(self, log):
         super().__init__(log)
 
     def completed(self):
-        complete = False
-        for line in self.read():
-            if "exiting successfully" in line:
-                complete = True
-        return complete
+        return "completed" in self.sections
 
     def get_runtype(self):
         """
         Returns runtype. For example, for MP2 single points, the line `energy('mp2')` is used. 
         This method returns the string 'energy'.
         """
-        for line in self.read():
+        return self.get_scanned("runtype")
+
+    def _scan_runtype(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             # need regex for energy('mp2') or optimize('scf', dertype='hess') (any number of k-v pairs)
             if re.search("[A-z]*\('[A-z0-9]*'(.?\s*[A-z]*='[A-z]*')*\)", line):
                 if re.search("[A-z]*\('[A-z0-9]*'\)", line):  # energy('mp2')
@@ -38,7 +62,13 @@ class PsiResults(Results):
         Returns energy type. For example, for MP2 single points, the line `energy('mp2')` is used. 
         This method returns the string 'mp2'.
         """
-        for line in self.read():
+        return self.get_scanned("method")
+
+    def _scan_method(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             # need regex for energy('mp2') or optimize('scf', dertype='hess') (any number of k-v pairs)
             if re.search("[A-z]*\('[A-z0-9]*'(.?\s*[A-z]*='[A-z]*')*\)", line):
                 if re.search("[A-z]*\('[A-z0-9]*'\)", line):  # energy('mp2')
@@ -57,7 +87,13 @@ class PsiResults(Results):
 
     @property
     def multiplicity(self):
-        for line in self.read():
+        return self.get_scanned("multiplicity")
+
+    def _scan_multiplicity(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if "Geometry (in Angstrom)" in line:
                 return int(line.split()[-1].replace(":", ""))
 
@@ -65,32 +101,54 @@ class PsiResults(Results):
         """
         Finds HOMO-LUMO gap for jobs of singlet multiplicity
         """
-        found_region = False
-        energies = []
-        for line in self.read():
-            if "Orbital Energies" in line:
-                found_region = True
-            if "Final Occupation" in line:
-                found_region = False
-            if found_region and line.strip() != "":
-                energies.append(line)
-        for index, line in enumerate(energies):
-            if "Virtual" in line:
-                homo_lumo = energies[index - 1 : index + 2]
-
+        homo_lumo = self._last_virtual()
         homo = float(homo_lumo[0].split()[-1])
         lumo = float(homo_lumo[-1].split()[1])
         return homo, lumo
 
+    def _last_virtual(self):
+        """
+        Finds the last 'Virtual' line of the orbital energies, with the
+        lines either side of it, reading back one 'Orbital Energies' section
+        at a time from the end of the log. Returns None if there is none.
+        """
+        for start in reversed(self.sections.offsets("orbital_energies")):
+            homo_lumo = None
+            previous = None
+            pending = False
+            for line in self.sections.read_from(start):
+                if "Final Occupation" in line:
+                    break
+                if line.strip() != "":
+                    if pending:
+                        homo_lumo.append(line)
+                        pending = False
+                    if "Virtual" in line:
+                        homo_lumo = [previous, line]
+                        pending = True
+                    previous = line
+            if homo_lumo is not None:
+                return homo_lumo
+        return None
+
     def _reduced_homo_lumo(self):
         """
         Finds SOMO-LUMO gap for jobs of doublet multiplicity
         """
+        singly, virtual = self.get_scanned("reduced_homo_lumo")
+        somo = float(singly[-1].split()[-1])
+        lumo = float(virtual[1].split()[1])
+        return somo, lumo
+
+    def _scan_reduced_homo_lumo(self):
         found_singly_occupied = False
         found_virtual = False
         singly = []
         virtual = []
-        for line in self.read():
+        while True:
+            line = yield found_singly_occupied or found_virtual
+            if line is None:
+                return singly, virtual
             if "Singly Occupied" in line:
                 found_singly_occupied = True
             if "Virtual" in line:
@@ -104,10 +162,7 @@ class PsiResults(Results):
                 virtual.append(line)
                 # save time
                 if len(virtual) > 3:
-                    break
-        somo = float(singly[-1].split()[-1])
-        lumo = float(virtual[1].split()[1])
-        return somo, lumo
+                    return singly, virtual
 
     def _homo_lumo_gap(self):
         hartrees_to_eV = 27.21
@@ -159,7 +214,13 @@ class PsiResults(Results):
         """
         Returns basis set.
         """
-        for line in self.read():
+        return self.get_scanned("basis")
+
+    def _scan_basis(self):
+        while True:
+            line = yield
+            if line is None:
+                return None
             if re.search("basis\s\w*(\-?\w*){1,2}$", line):
                 return line.split()[-1]
 
@@ -168,11 +229,10 @@ class PsiResults(Results):
         """
         Returns total energy, printed for scf calculations.
         """
-        total = ""
-        for line in self.read():
-            if "Total Energy =" in line:
-                total = float(line.split("=")[1].strip())
-        return total
+        line = next(self.sections.matching_lines("total_energy"), None)
+        if line is None:
+            return ""
+        return float(line.split("=")[1].strip())
 
     def _scf_data(self):
         """
@@ -195,33 +255,31 @@ class PsiResults(Results):
         """
         Returns 'reference energy' from MP2 calculations.
         """
-        HF = ""
-        for line in self.read():
-            if "Reference Energy          =" in line:
-                HF = float(line.split("=")[1].split()[0].strip())
-        return HF
+        return self._last_energy("hf_energy_for_mp2")
 
     @property
     def mp2_opp(self):
         """
         Returns MP2 opposite spin energy.
         """
-        opp = ""
-        for line in self.read():
-            if "Opposite-Spin Energy      =" in line:
-                opp = float(line.split("=")[1].split()[0].strip())
-        return opp
+        return self._last_energy("mp2_opp")
 
     @property
     def mp2_same(self):
         """
         Returns MP2 same spin energy.
         """
-        same = ""
-        for line in self.read():
-            if "Same-Spin Energy          =" in line:
-                same = float(line.split("=")[1].split()[0].strip())
-        return same
+        return self._last_energy("mp2_same")
+
+    def _last_energy(self, section):
+        """
+        Returns the energy after '=' on the last line containing the marker
+        of `section`, or '' if it was not printed
+        """
+        line = next(self.sections.matching_lines(section), None)
+        if line is None:
+            return ""
+        return float(line.split("=")[1].split()[0].strip())
 
     def _mp2_data(self):
         """
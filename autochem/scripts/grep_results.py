@@ -1,9 +1,16 @@
 from ..core.atom import Atom
+from ..core.parallel import harvest
+from ..core.sections import SectionIndex
 from ..core.molecule import Molecule
-from ..core.thermo import thermo_data, freq_data_gamess, freq_data_gauss
+from ..core.thermo import (
+    Thermochemistry,
+    fortran_thermo_data,
+    thermo_data,
+    freq_data_gamess,
+    freq_data_gauss,
+)
 from ..core.utils import (
     check_user_input,
-    eof,
     get_files,
     list_of_dicts_to_one_level_dict,
     read_file,
@@ -15,6 +22,8 @@ from ..interfaces.gamess_results import GamessResults
 from ..interfaces.orca_results import OrcaResults
 from ..interfaces.psi_results import PsiResults
 from ..interfaces.gaussian_results import GaussianResults
+from functools import lru_cache, partial
+import numpy as np
 import os
 import re
 import sys
@@ -30,6 +39,7 @@ __all__ = [
     "energy_table",
     "search_for_coords",
     "thermochemistry",
+    "thermochemistry_sweep",
 ]
 
 
@@ -63,31 +73,64 @@ def search_for_coords(dir):
                 print()
 
 
+RESULTS_CLASSES = {
+    "gamess": GamessResults,
+    "orca": OrcaResults,
+    "psi": PsiResults,
+    "gaussian": GaussianResults,
+}
+
+# (signature, program), in order of precedence for signatures found on the
+# same line
+SIGNATURES = (
+    (b"GAMESS", "gamess"),
+    (b"Psi4", "psi"),
+    (b"PSI4", "psi"),
+    (b"Gaussian", "gaussian"),
+    (b"O   R   C   A", "orca"),
+)
+
+# every program prints its name in the first few lines of output, so only the
+# start of a file is searched
+HEADER_SIZE = 64 * 1024
+
+# {absolute path: ((size, mtime), program)}
+_log_types = {}
+
+
 def file_as_results_class(log):
-    """Return an instance of the desired class- |GamessResults|, |PsiResults|"""
-    log_type = get_type(log)
-    logs = {
-        "gamess": GamessResults(log),
-        "orca": OrcaResults(log),
-        "psi": PsiResults(log),
-        "gaussian": GaussianResults(log),
-    }
-    return logs.get(log_type, None)
+    """
+    Return an instance of the desired class- |GamessResults|, |PsiResults|,
+    |OrcaResults| or |GaussianResults|- or None if the file is not the output
+    of a calculation
+    """
+    cls = RESULTS_CLASSES.get(get_type(log))
+    if cls is not None:
+        return cls(log)
 
 
 def get_type(filepath):
     """
-    Read in file, determine calculation type
+    Determine calculation type from the name of the program printed at the
+    top of the file. Only the first `HEADER_SIZE` bytes are read, and the
+    result is stored until the file changes.
     """
-    for line in read_file(filepath):
-        if "GAMESS" in line:
-            return "gamess"
-        elif "Psi4" in line or "PSI4" in line:
-            return "psi"
-        elif "Gaussian" in line:
-            return "gaussian"
-        elif "O   R   C   A" in line:
-            return "orca"
+    stat = os.stat(filepath)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    key = os.path.abspath(filepath)
+    if key in _log_types and _log_types[key][0] == stamp:
+        return _log_types[key][1]
+    with open(filepath, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    found = []
+    for precedence, (signature, program) in enumerate(SIGNATURES):
+        position = header.find(signature)
+        if position != -1:
+            line_start = header.rfind(b"\n", 0, position)
+            found.append((line_start, precedence, program))
+    log_type = min(found)[2] if found else None
+    _log_types[key] = (stamp, log_type)
+    return log_type
 
 
 def need_gauss_energy(calc):
@@ -100,39 +143,59 @@ def need_gauss_energy(calc):
         calc, GaussianResults) and calc.is_optimisation() or calc.is_spec()
 
 
-def energies(dir, filepath_includes):
+def energy_data(log):
     """
-    Used internally to parse log files for energies
+    Returns the energies of one log file, or None if there are none
     """
-    output = []
-    for log in get_files(dir, (".out", ".log"),
-                         filepath_includes=filepath_includes):
-        calc = file_as_results_class(log)
-        filetype = get_type(log)
-        try:
-            if (
-                    calc.completed()
-            ):  # add provision for energies of opts only if equilibrium found
-                if not calc.is_hessian() or need_gauss_energy(calc):
-                    print(log)
-                    data = calc.get_data()
-                    output.append({"data": data, "type": filetype})
-        except AttributeError:  # if log/out files are not logs of calculations
-            continue
-    return output
-
-
-def energy_table(dir, file_name, string_to_find=None, autosave=None):
+    calc = file_as_results_class(log)
+    filetype = get_type(log)
+    try:
+        if (
+                calc.completed()
+        ):  # add provision for energies of opts only if equilibrium found
+            if not calc.is_hessian() or need_gauss_energy(calc):
+                data = calc.get_data()
+                return {"data": data, "type": filetype}
+    except AttributeError:  # if log/out files are not logs of calculations
+        return None
+
+
+def energies(dir,
+             filepath_includes,
+             workers=None,
+             chunksize=None,
+             cache=None):
+    """
+    Used internally to parse log files for energies. Files are parsed in
+    parallel; see `harvest` for `workers`, `chunksize` and `cache`.
+    """
+    logs = get_files(dir, (".out", ".log"), filepath_includes=filepath_includes)
+    results, _ = harvest(logs, energy_data, workers, chunksize, cache=cache)
+    return [data for _, data in results]
+
+
+def energy_table(dir,
+                 file_name,
+                 string_to_find=None,
+                 autosave=None,
+                 workers=None,
+                 chunksize=None,
+                 cache=None):
     """
     Prints energies of all log/out files in current and any sub directories to the screen,
-    with the option of saving to csv.
+    with the option of saving to csv. Files are parsed by `workers` processes,
+    and only files not stored in `cache`, a |ResultsCache|, are parsed.
     """
     # lists are faster to fill than dict values
     # order: file, path, method, basis, hf, mp2, mp2_opp, mp2_same
     data = [[], [], [], [], [], [], [], []]
     # at some point, will make this a dictionary, loads clearer that way.
 
-    output = energies(dir, filepath_includes=string_to_find)
+    output = energies(dir,
+                      filepath_includes=string_to_find,
+                      workers=workers,
+                      chunksize=chunksize,
+                      cache=cache)
 
     def add_data(data, vals):
         """
@@ -175,24 +238,39 @@ def energy_table(dir, file_name, string_to_find=None, autosave=None):
     write_csv_from_dict(table_data, filename=file_name, autosave=autosave)
 
 
-def homo_lumo_gaps(dir, output, string_to_find=None, autosave=None):
+def homo_lumo_data(log):
+    """
+    Returns HOMO-LUMO info of a completed single point, otherwise None
+    """
+    calc = file_as_results_class(log)
+    try:
+        if calc.completed() and calc.is_spec():
+            return calc.homo_lumo_info
+    except AttributeError:  # if log/out files are not logs of calculations
+        return None
+
+
+def homo_lumo_gaps(dir,
+                   output,
+                   string_to_find=None,
+                   autosave=None,
+                   workers=None,
+                   chunksize=None,
+                   cache=None):
     """
     Returns HOMO-LUMO or SOMO-LUMO gaps for each single point calculation
     found in any subdirectory. Currently restricted to single points for
     simplicity, but can probably be extended to optimisations if needed- 
-    would have to check the log files first.
+    would have to check the log files first. Files are parsed by `workers`
+    processes, and only files not stored in `cache` are parsed.
     """
-    info = []
-    for log in get_files(dir, (".out", ".log"),
-                         filepath_includes=string_to_find):
-        calc = file_as_results_class(log)
-        filetype = get_type(log)
-        try:
-            if calc.completed() and calc.is_spec():
-                data = calc.homo_lumo_info
-                info.append(data)
-        except AttributeError:  # if log/out files are not logs of calculations
-            continue
+    logs = get_files(dir, (".out", ".log"), filepath_includes=string_to_find)
+    results, _ = harvest(logs,
+                         homo_lumo_data,
+                         workers,
+                         chunksize,
+                         cache=cache)
+    info = [data for _, data in results]
     if len(info) == 0:
         sys.exit("Error: No single points found")
     info = list_of_dicts_to_one_level_dict(info)
@@ -201,10 +279,49 @@ def homo_lumo_gaps(dir, output, string_to_find=None, autosave=None):
     return info
 
 
-def thermochemistry(dir, string_to_find, mult, temp, output, autosave=None):
+def hessian_thermo_data(log, mult, temp, fortran=False, timeout=None):
+    """
+    Returns thermochemical data for a completed hessian calculation,
+    otherwise None. If `fortran` is True, the data comes from thermo.exe,
+    which is stopped after `timeout` seconds.
+    """
+    r = file_as_results_class(log)
+    try:
+        if r.completed() and r.is_hessian():
+            if fortran:
+                res = fortran_thermo_data(r.log, mult, temp, timeout)
+            else:
+                res = thermo_data(r.log, mult, temp)
+            res["File"] = r.log
+            res["Method"] = r.method
+            res["Basis"] = r.basis
+            res["Temperature [K]"] = temp
+            res["Multiplicity given"] = mult
+            return res
+    except AttributeError:
+        return None
+
+
+def thermochemistry(dir,
+                    string_to_find,
+                    mult,
+                    temp,
+                    output,
+                    autosave=None,
+                    workers=None,
+                    chunksize=None,
+                    cache=None,
+                    fortran=False,
+                    timeout=None):
     """
     Returns thermochemical data for all the relevant hessian log files in the given directory and
-    subdirectories. Saves to csv file.
+    subdirectories. Saves to csv file. Files are processed by `workers`
+    processes, and only files not stored in `cache` are processed.
+
+    If `fortran` is True, thermo.exe is run for each file, in a temporary
+    directory of its own so that the workers can run it at the same time.
+    A file where thermo.exe fails or runs for longer than `timeout` seconds
+    is reported and left out.
     """
     collected = {
         "File": [],
@@ -222,26 +339,19 @@ def thermochemistry(dir, string_to_find, mult, temp, output, autosave=None):
         "TC - TS": [],
     }
     print("Print csv for more info")
-    for log in get_files(dir, (".log", ".out"),
-                         filepath_includes=string_to_find):
-        r = file_as_results_class(log)
-        try:
-            if r.completed():
-                if r.is_hessian():
-                    res = thermo_data(r.log, mult, temp)
-                    res["File"] = r.log
-                    res["Method"] = r.method
-                    res["Basis"] = r.basis
-                    res["Temperature [K]"] = temp
-                    res["Multiplicity given"] = mult
-
-                    for k, v in res.items():
-                        collected[k].append(v)
-        except AttributeError:
-            continue
-        except UnicodeDecodeError:
-            print(f"{log}- UnicodeDecodeError")
-            continue
+    logs = get_files(dir, (".log", ".out"), filepath_includes=string_to_find)
+    options = {"fortran": True, "timeout": timeout} if fortran else {}
+    results, _ = harvest(logs,
+                         partial(hessian_thermo_data,
+                                 mult=mult,
+                                 temp=temp,
+                                 **options),
+                         workers,
+                         chunksize,
+                         cache=cache)
+    for _, res in results:
+        for k, v in res.items():
+            collected[k].append(v)
 
     # add units to dict keys
 
@@ -270,23 +380,136 @@ def thermochemistry(dir, string_to_find, mult, temp, output, autosave=None):
     name = write_csv_from_dict(collected, filename=output, autosave=autosave)
 
 
-def print_freqs(dir, output, string_to_find=None, autosave=None):
+def hessian_thermo_inputs(log):
+    """
+    Returns the geometry and frequencies used for the thermochemistry of a
+    completed hessian calculation, otherwise None. These do not depend on
+    temperature or pressure, so are parsed and cached once per file.
+    """
+    r = file_as_results_class(log)
+    try:
+        if r.completed() and r.is_hessian():
+            thermo = Thermochemistry.from_log(r.log)
+            return {
+                "Method": r.method,
+                "Basis": r.basis,
+                "Symbols": thermo.symbols.tolist(),
+                "Coordinates": thermo.coords.tolist(),
+                "Frequencies": thermo.freqs.tolist(),
+            }
+    except AttributeError:
+        return None
+
+
+def thermochemistry_sweep(dir,
+                          string_to_find,
+                          mult,
+                          temps,
+                          pressures=(1.0, ),
+                          output=None,
+                          autosave=None,
+                          workers=None,
+                          chunksize=None,
+                          cache=None):
+    """
+    Returns thermochemical data for all the relevant hessian log files in
+    the given directory and subdirectories, with one row for each file at
+    every combination of `temps`, in K, and `pressures`, in atm. Saves to
+    csv file.
+
+    Geometries and frequencies are parsed once per file by `workers`
+    processes, and stored in `cache` regardless of temperature, so a new
+    grid of temperatures only needs the files that have changed to be
+    parsed. Each file is then evaluated over the whole grid at once by
+    |Thermochemistry|.
+    """
+    logs = get_files(dir, (".log", ".out"), filepath_includes=string_to_find)
+    results, _ = harvest(logs,
+                         hessian_thermo_inputs,
+                         workers,
+                         chunksize,
+                         cache=cache)
+    columns = {}
+    for file, res in results:
+        thermo = Thermochemistry(res["Symbols"], res["Coordinates"],
+                                 res["Frequencies"], mult)
+        table = thermo.table(temps, pressures)
+        rows = len(table["Temperature [K]"])
+        data = {
+            "File": [file] * rows,
+            "Method": [res["Method"]] * rows,
+            "Basis": [res["Basis"]] * rows,
+            "Multiplicity given": [mult] * rows,
+        }
+        data.update(table)
+        for k, v in data.items():
+            columns.setdefault(k, []).append(v)
+    if not columns:
+        sys.exit("Error: No hessian calculations found")
+
+    # add units to dict keys
+    kj = ("ZPVE", "TC", "TC - TS", "G corr")
+    jmol = ("S tot", "S elec", "S trans", "S rot", "S vib")
+    collected = {}
+    for k, v in columns.items():
+        v = np.concatenate(v).tolist()
+        if k in kj:
+            collected[k + " [kJ/mol]"] = v
+        elif k in jmol:
+            collected[k + " [J/(mol K)]"] = v
+        else:
+            collected[k] = v
+
+    responsive_table(
+        {
+            k: v
+            for k, v in collected.items()
+            if k in ("File", "Temperature [K]", "Pressure [atm]",
+                     "G corr [kJ/mol]")
+        },
+        strings=[1],
+        min_width=10,
+    )
+    write_csv_from_dict(collected, filename=output, autosave=autosave)
+    return collected
+
+
+def freq_data(file):
+    """
+    Returns the frequencies and intensities of a frequency calculation,
+    otherwise None
+    """
+    if "slurm" not in file:
+        calc = file_as_results_class(file)
+        if calc.is_hessian():
+            return {
+                "Frequencies": calc.frequencies,
+                "Intensities": calc.intensities
+            }
+
+
+def print_freqs(dir,
+                output,
+                string_to_find=None,
+                autosave=None,
+                workers=None,
+                chunksize=None,
+                cache=None):
     """
     Writes frequencies and intensities of GAMESS/Gaussian frequency calculations
-    to a csv. Works recursively through the file system.
+    to a csv. Works recursively through the file system. Files are parsed by
+    `workers` processes, and only files not stored in `cache` are parsed.
     """
     data = {}
     data["File"] = []
     data["Frequencies"] = []
     data["Intensities"] = []
-    for file in get_files(dir, ["log", "out"],
-                          filepath_includes=string_to_find):
-        if "slurm" not in file:
-            calc = file_as_results_class(file)
-            if calc.is_hessian():
-                data["Frequencies"] += calc.frequencies
-                data["Intensities"] += calc.intensities
-                data["File"] += [calc.log] * len(calc.frequencies)
+    files = get_files(dir, ["log", "out"], filepath_includes=string_to_find)
+    results, _ = harvest(files, freq_data, workers, chunksize, cache=cache)
+    for file, res in results:
+        data["Frequencies"] += res["Frequencies"]
+        data["Intensities"] += res["Intensities"]
+        data["File"] += [file] * len(res["Frequencies"])
     responsive_table(data, strings=[1])
     write_csv_from_dict(data, filename=output, autosave=autosave)
 
@@ -399,129 +622,139 @@ def file_is_gaussian(file):
     return False
 
 
-def charges(dir, output, string_to_find=None, autosave=None):
+CHARGE_COLUMNS = ("Path", "Index", "Element", "Charge", "Rx", "Ry", "Rz",
+                  "Fragment")
+
+GAUSSIAN_ATOM = re.compile(r"^\s?[A-z]{1,2}(\s+-?[0-9]+\.[0-9]+){3}")
+#     1  C   -0.122119
+GAUSSIAN_CHARGE = re.compile(r"^\s+[0-9]+\s+[A-z]{1,2}\s+-?[0-9]+\.[0-9]+")
+GAMESS_ATOM = re.compile(
+    r"^\s[A-Za-z]{1,2}\s*[0-9]*.[0-9]*(\s*-?[0-9]*.[0-9]*){3}$")
+GAMESS_CHARGE = re.compile(r"^\s[A-Za-z]{1,2}(\s*-?[0-9]*.[0-9]*){2}$")
+
+# sections of the log holding the input geometry and the charges
+CHARGE_SECTIONS = {
+    "gaussian_geometry": "Symbolic Z-matrix",
+    "gaussian_charges": "Mulliken charges:",
+    "gamess_charges": "NET CHARGES:",
+}
+
+@lru_cache(maxsize=32)
+def _separate(geometry):
+    """
+    Topology of a geometry given as a tuple of (symbol, x, y, z) of each
+    atom. Many logs can share the same geometry, i.e. calculations with
+    different methods or basis sets, so the last few are kept.
+    """
+    mol = Molecule(atoms=[Atom(sym, coords=xyz) for sym, *xyz in geometry])
+    mol.separate()
+    topology = []
+    for atom in mol.coords:
+        try:
+            fragment = f"{mol.fragments[atom.mol]['name']}_{atom.mol}"
+        except KeyError:
+            fragment = "NA"
+        topology.append(
+            (atom.index, atom.symbol, atom.x, atom.y, atom.z, fragment))
+    return tuple(topology)
+
+
+def charge_topology(atoms):
+    """
+    Separates a list of |Atom| objects into fragments, returning the index,
+    symbol, coordinates and fragment of each atom in the order found by
+    |Molecule|. Recently seen geometries are not separated again.
+    """
+    return _separate(
+        tuple((atom.symbol, atom.x, atom.y, atom.z) for atom in atoms))
+
+
+def charge_columns(path, atoms, charges):
+    """
+    Returns a dictionary with a list of values for each of `CHARGE_COLUMNS`,
+    one value per atom
+    """
+    if len(charges) != len(atoms):
+        raise ValueError(
+            f"{path}: found {len(charges)} charges for {len(atoms)} atoms")
+    topology = charge_topology(atoms)
+    columns = {
+        key: list(values)
+        for key, values in zip(CHARGE_COLUMNS[1:3] + CHARGE_COLUMNS[4:],
+                               zip(*topology))
+    }
+    columns["Path"] = [path] * len(topology)
+    columns["Charge"] = charges
+    return {key: columns.get(key, []) for key in CHARGE_COLUMNS}
+
+
+def _section_lines(index, name, occurrence=0):
+    """Lines of the section `name` of a |SectionIndex|, after the marker"""
+    lines = index.lines(name, occurrence)
+    next(lines, None)
+    return lines
+
+
+def charge_data(logfile):
+    """
+    Returns columns of charge data for every atom of a GAMESS or Gaussian
+    log file, or None for other files. Only the input geometry and the
+    section of charges are read, seeking to them directly.
+    """
+    if file_is_gaussian(logfile):
+        index = SectionIndex(logfile, CHARGE_SECTIONS)
+        atoms = []
+        for line in _section_lines(index, "gaussian_geometry"):
+            if line.strip() == "" and atoms:
+                break
+            if GAUSSIAN_ATOM.search(line):
+                sym, x, y, z = line.split()
+                x, y, z = map(float, (x, y, z))
+                atoms.append(Atom(sym, coords=(x, y, z)))
+        charges = []
+        # charges of the final geometry
+        for line in _section_lines(index, "gaussian_charges", -1):
+            if "Sum of Mulliken charges" in line:
+                break
+            if GAUSSIAN_CHARGE.search(line):
+                charges.append(float(line.split()[-1]))
+        return charge_columns(logfile, atoms, charges)
+
+    if file_is_gamess(logfile):
+        inpfile = logfile[:-3] + "inp"
+        atoms = []
+        for line in read_file(inpfile):
+            if GAMESS_ATOM.search(line):
+                sym, atnum, x, y, z = line.split()
+                x, y, z = map(float, (x, y, z))
+                atoms.append(Atom(sym, coords=(x, y, z)))
+        charges = []
+        index = SectionIndex(logfile, CHARGE_SECTIONS)
+        for line in _section_lines(index, "gamess_charges"):
+            if "RMS DEVIATION" in line:
+                break
+            if GAMESS_CHARGE.search(line):
+                charges.append(float(line.split()[1]))
+        return charge_columns(logfile, atoms, charges)
+
+
+def charges(dir,
+            output,
+            string_to_find=None,
+            autosave=None,
+            workers=None,
+            chunksize=None):
     """
     Recursively pulls geodesic charges from GAMESS calculations.
     Pulls mulliken charges from Gaussian calculations.
-    Writes to `charges.csv` if desired
+    Writes to `charges.csv` if desired. Files are parsed by `workers`
+    processes.
     """
-    results = []
-
     files = get_files(dir, ["log"], filepath_includes=string_to_find)
-    for logfile in files:
-        if file_is_gaussian(logfile):
-            res = []
-            assigned = []
-            print(logfile)
-            atom_regex = "^\s?[A-z]{1,2}(\s+-?[0-9]+\.[0-9]+){3}"
-            charge_regex = "^\s+[0-9]+\s+[A-z]{1,2}\s+-?[0-9]+\.[0-9]+"
-            #     1  C   -0.122119
-            for line in read_file(logfile):
-                if re.search(atom_regex, line):
-                    sym, x, y, z = line.split()
-                    x, y, z = map(float, (x, y, z))
-                    res.append([logfile, Atom(sym, coords=(x, y, z))
-                                ])  # new key for each coord
-            found = False
-            counter = 0
-            for line in eof(logfile, 0.20):
-                if "Mulliken charges:" in line:
-                    found = True
-                if "Sum of Mulliken charges" in line:
-                    break
-                if found:
-                    if re.search(charge_regex, line):
-                        res[counter].append(float(line.split()[-1]))
-                        counter += 1
-            coordinates = [atom[1] for atom in res]
-            mol = Molecule(atoms=coordinates)
-            mol.separate()
-            for atom, r in zip(mol.coords, res):
-                path, _, charge = r
-                try:
-                    results.append([
-                        path,
-                        atom.index,
-                        atom.symbol,
-                        charge,
-                        atom.x,
-                        atom.y,
-                        atom.z,
-                        f"{mol.fragments[atom.mol]['name']}_{atom.mol}",
-                    ])
-                except KeyError:
-                    results.append([
-                        path,
-                        atom.index,
-                        atom.symbol,
-                        geodesic_charge,
-                        atom.x,
-                        atom.y,
-                        atom.z,
-                        "NA",
-                    ])
-
-        if file_is_gamess(logfile):
-            atom_regex = "^\s[A-Za-z]{1,2}\s*[0-9]*.[0-9]*(\s*-?[0-9]*.[0-9]*){3}$"
-            charge_regex = "^\s[A-Za-z]{1,2}(\s*-?[0-9]*.[0-9]*){2}$"
-            print(logfile)
-            inpfile = logfile[:-3] + "inp"
-
-            res = []
-
-            for line in read_file(inpfile):
-                if re.search(atom_regex, line):
-                    sym, atnum, x, y, z = line.split()
-                    x, y, z = map(float, (x, y, z))
-                    res.append([logfile, Atom(sym, coords=(x, y, z))
-                                ])  # new key for each coord
-            found = False
-            counter = 0
-            for line in read_file(logfile):
-                if "NET CHARGES:" in line:
-                    found = True
-                if "RMS DEVIATION" in line:
-                    break
-                if found:
-                    if re.search(charge_regex, line):
-                        res[counter].append(float(line.split()[1]))
-                        counter += 1
-            coordinates = [atom[1] for atom in res]
-            mol = Molecule(atoms=coordinates)
-            mol.separate()
-            for atom, r in zip(mol.coords, res):
-                path, _, geodesic_charge = r
-                try:
-                    results.append([
-                        path,
-                        atom.index,
-                        atom.symbol,
-                        geodesic_charge,
-                        atom.x,
-                        atom.y,
-                        atom.z,
-                        f"{mol.fragments[atom.mol]['name']}_{atom.mol}",
-                    ])
-                except KeyError:
-                    results.append([
-                        path,
-                        atom.index,
-                        atom.symbol,
-                        geodesic_charge,
-                        atom.x,
-                        atom.y,
-                        atom.z,
-                        "NA",
-                    ])
-
-    # nested list (one level) to dict
-    data = {}
-    keys = ("Path", "Index", "Element", "Charge", "Rx", "Ry", "Rz", "Fragment")
-    for index, value in enumerate(keys):
-        data[value] = [val[index] for val in results]
+    harvested, _ = harvest(files, charge_data, workers, chunksize)
+    data = {key: [] for key in CHARGE_COLUMNS}
+    for _, columns in harvested:
+        for key in CHARGE_COLUMNS:
+            data[key] += columns[key]
     responsive_table(data, strings=[1, 3, 8], min_width=10)
-
-    write_csv_from_nested(results,
-                          col_names=keys,
-                          filename=output,
-                          autosave=autosave)
+    write_csv_from_dict(data, filename=output, autosave=autosave)
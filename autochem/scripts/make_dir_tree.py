@@ -2,16 +2,18 @@ from ..interfaces.gamess import GamessJob
 from ..interfaces.gaussian import GaussJob
 from ..interfaces.orca import OrcaJob
 from ..interfaces.psi import PsiJob
+from ..core.parallel import harvest
 
+from functools import partial
 import os
 import glob
-from shutil import copyfile
+from shutil import copyfile, move
 
 __all__ = ["xyz_to_tree"]
 
 
-def get_xyz():
-    return [file for file in os.listdir(".") if file.endswith(".xyz")]
+def get_xyz(directory="."):
+    return [file for file in os.listdir(directory) if file.endswith(".xyz")]
 
 
 def ask_package():
@@ -73,7 +75,7 @@ def ask_package():
     return options[choice]
 
 
-def job_type(package, xyz, s):
+def job_type(package, xyz, s, directory=None):
     # jobs = {
     #     "gamess": GamessJob(using = xyz, frags_in_subdir = True, settings = s),
     #     "gamess_fmo": GamessJob(using = xyz, fmo = True, frags_in_subdir = True, settings = s),
@@ -84,25 +86,56 @@ def job_type(package, xyz, s):
     # ABOVE CODE RAN GAMESS FMO AND PSI4 REGARDLESS OF CHOICE-- WHY???
 
     if package == "gamess":
-        return GamessJob(using=xyz, frags_in_subdir=True, settings=s, is_complex=True)
+        return GamessJob(
+            using=xyz,
+            frags_in_subdir=True,
+            settings=s,
+            is_complex=True,
+            directory=directory,
+        )
     elif package == "gamess_fmo":
         return GamessJob(
-            using=xyz, fmo=True, frags_in_subdir=True, settings=s, is_complex=True
+            using=xyz,
+            fmo=True,
+            frags_in_subdir=True,
+            settings=s,
+            is_complex=True,
+            directory=directory,
         )
     elif package == "psi4":
-        return PsiJob(using=xyz, frags_in_subdir=True, settings=s, is_complex=True)
+        return PsiJob(
+            using=xyz,
+            frags_in_subdir=True,
+            settings=s,
+            is_complex=True,
+            directory=directory,
+        )
     elif package == "gauss":
-        return GaussJob(using=xyz, settings=s)
+        return GaussJob(using=xyz, settings=s, directory=directory)
     elif package == "orca":
-        return OrcaJob(using=xyz, settings=s, frags_in_subdir=True)
+        return OrcaJob(
+            using=xyz, settings=s, frags_in_subdir=True, directory=directory
+        )
     elif package == "gamess_no_frags":
-        return GamessJob(using=xyz, frags_in_subdir=False, settings=s)
+        return GamessJob(
+            using=xyz, frags_in_subdir=False, settings=s, directory=directory
+        )
     elif package == "psi4_no_frags":
-        return PsiJob(using=xyz, frags_in_subdir=False, settings=s)
+        return PsiJob(
+            using=xyz, frags_in_subdir=False, settings=s, directory=directory
+        )
     elif package == "gamess_fmo_no_frags":
-        return GamessJob(using=xyz, fmo=True, frags_in_subdir=False, settings=s)
+        return GamessJob(
+            using=xyz,
+            fmo=True,
+            frags_in_subdir=False,
+            settings=s,
+            directory=directory,
+        )
     elif package == "orca_no_frags":
-        return OrcaJob(using=xyz, settings=s, frags_in_subdir=False)
+        return OrcaJob(
+            using=xyz, settings=s, frags_in_subdir=False, directory=directory
+        )
 
 
 def make_dir_list(file):
@@ -113,22 +146,18 @@ def make_dir_list(file):
     return new_dirs
 
 
-def change_to_subdir(subdirectory):
-    new_dir = os.path.join(os.getcwd(), subdirectory)
-    if os.path.isdir(new_dir):
-        os.chdir(new_dir)
-    elif not os.path.isdir(new_dir):
-        os.mkdir(new_dir)
-        os.chdir(new_dir)
+def tree_path(base_dir, file):
+    """Returns the directory made for an xyz file, i.e. base_dir/c1mim/nh3 for c1mim_nh3.xyz"""
+    return os.path.join(base_dir, *make_dir_list(os.path.basename(file)))
 
 
-def copy_xyz(xyz_dir, file):
+def copy_xyz(xyz_dir, file, dest_dir):
     xyz = os.path.join(xyz_dir, file)
-    dest = os.path.join(os.getcwd(), file)
+    dest = os.path.join(dest_dir, os.path.basename(file))
     copyfile(xyz, dest)
 
 
-def make_tree_and_copy(xyz_dir, files):
+def make_tree_and_copy(xyz_dir, files, base_dir=None):
     """Makes a sibling directory to 'files' (named 'calcs'), creates subdirectories with names based on the xyz files in 'files', and then copies the xyz files from 'files' to the deepest sub directory of the path created.
 
     The end result is this:
@@ -186,17 +215,14 @@ def make_tree_and_copy(xyz_dir, files):
         └── water.xyz"""
 
     # calc_dir = make_parent_dir()
-    cwd = os.getcwd()
+    if base_dir is None:
+        base_dir = xyz_dir
     for file in files:
-        orig_dir = os.path.dirname(file)
+        orig_dir = os.path.join(xyz_dir, os.path.dirname(file))
         if not logfile_in_dir(orig_dir):
-            new_dirs = make_dir_list(file)
-            for idx, d in enumerate(new_dirs):
-                # if dir is rerun, no need to move to lower dir
-                change_to_subdir(d)
-                if idx + 1 == len(new_dirs):  # when at maximum depth
-                    copy_xyz(xyz_dir, file)
-            os.chdir(cwd)
+            subdir = tree_path(base_dir, file)
+            os.makedirs(subdir, exist_ok=True)
+            copy_xyz(xyz_dir, file, subdir)
 
 
 def xyz_is_rerun(file):
@@ -209,23 +235,28 @@ def logfile_in_dir(path):
     return any("log" in f for f in os.listdir(path))
 
 
-def make_job_files(base_dir, chem_package, settings):
+def create_job(file, package, settings):
+    """Creates the inputs for one xyz file, in the directory containing it"""
+    job_type(package, file, settings, directory=os.path.dirname(file))
+
+
+def make_job_files(base_dir, chem_package, settings, workers=None):
+    """
+    Creates inputs for every xyz file in a subdirectory of `base_dir`, using a pool of
+    `workers` processes; each system is read, separated into fragments and has its files
+    written in one of the processes. Returns (file, error message) for every xyz file that
+    inputs could not be made for.
+    """
     # find all xyz files in subdir to work on
-    files = glob.glob("**/*xyz", recursive=True)
-    for file in files:
-        path, f = os.path.split(file)
-        if path != "":  # or xyz_is_rerun(f):
-            subdir = base_dir + "/" + path
-            os.chdir(subdir)
-            try:
-                # print(f"Creating inputs for {file}...")
-                # job = job_type(chem_package, f, settings)
-                # job.create()
-                job_type(chem_package, f, settings)
-            except AttributeError as e:
-                print(f">>> Error <<<")
-                print(e)
-            os.chdir(base_dir)
+    files = [
+        file
+        for file in glob.glob(os.path.join(base_dir, "**", "*xyz"), recursive=True)
+        if os.path.dirname(os.path.relpath(file, base_dir)) != ""
+    ]
+    _, failures = harvest(
+        files, partial(create_job, package=chem_package, settings=settings), workers
+    )
+    return failures
 
 
 def make_job_subdirs(base_dir):
@@ -233,18 +264,15 @@ def make_job_subdirs(base_dir):
     Look for input files in any subdirectory of ``calcs``, then creates a directory of that type
     (i.e. opt, spec, freq), then moves the inp and job into that folder.
     """
-    parent = os.getcwd()
     for path, dirs, files in os.walk(base_dir):
         for file in files:
             if file.endswith(".inp") or file.endswith(".job"):
-                os.chdir(path)
                 file_type = file[:-4]  # opt, spec, freq...
-                os.mkdir(file_type)
-                os.system(f"mv {file_type}.inp {file_type}.job {file_type}/")
-                os.chdir(parent)
+                os.makedirs(os.path.join(path, file_type), exist_ok=True)
+                move(os.path.join(path, file), os.path.join(path, file_type, file))
 
 
-def xyz_to_tree(settings):
+def xyz_to_tree(settings, workers=None):
     """
     Takes a directory containing xyz files and creates a directory tree based on the filenames of
     the xyz files present. Uses underscores as delimiters for new subdirectories i.e. every time an
@@ -262,6 +290,8 @@ def xyz_to_tree(settings):
     >>> s.input.basis.gbasis = 'ccd' # gamess input (this is actually the default setting)
     >>> xyz_to_tree(s)
 
+    Inputs for the xyz files are created by `workers` processes, by default one per CPU.
+
     Gives the following directory structure:
     .
     ├── calcs
@@ -302,9 +332,13 @@ def xyz_to_tree(settings):
     package = ask_package()
     # xyz_directory = check_dir()
     xyz_directory = os.getcwd()
-    files = get_xyz()
+    files = get_xyz(xyz_directory)
     # rm dir if log present
-    files = [f for f in files if not logfile_in_dir(os.path.dirname(f))]
+    files = [
+        f
+        for f in files
+        if not logfile_in_dir(os.path.join(xyz_directory, os.path.dirname(f)))
+    ]
     make_tree_and_copy(xyz_directory, files)
-    make_job_files(xyz_directory, package, settings)  # xyz directory is base dir
-    os.chdir(xyz_directory)
+    # xyz directory is base dir
+    return make_job_files(xyz_directory, package, settings, workers=workers)